@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark History and Regression Detection
+Stores every run's samples in SQLite, keyed by git commit, host and config,
+and compares a run against a stored baseline
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+
+from benchmark_stats import bootstrap_ratio_ci, mann_whitney_u
+
+MIN_SAMPLES = 5  # per side, for intervals worth gating on
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    host_fingerprint TEXT NOT NULL,
+    host TEXT NOT NULL,
+    config_key TEXT NOT NULL,
+    config TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file_size_mb INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_key ON runs (host_fingerprint, config_key, created_at);
+CREATE INDEX IF NOT EXISTS samples_by_run ON samples (run_id);
+"""
+
+def git_commit():
+    """(commit hash, whether the working tree has changes), or (None, None) outside git"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                capture_output=True, text=True, check=True).stdout
+    except (subprocess.CalledProcessError, OSError):
+        return None, None
+    return commit, bool(status.strip())
+
+def host_info():
+    """What makes results from this machine comparable only with each other"""
+    info = {
+        'hostname': platform.node(),
+        'system': platform.system(),
+        'release': platform.release(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version()
+    }
+    try:
+        with open("/proc/cpuinfo") as f:
+            info['cpu_model'] = next((line.split(':', 1)[1].strip() for line in f
+                                      if line.startswith('model name')), None)
+        with open("/proc/meminfo") as f:
+            info['mem_total_kb'] = int(f.readline().split()[1])
+    except OSError:
+        pass
+    return info
+
+def fingerprint(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:12]
+
+class ResultHistory:
+    """SQLite database of benchmark runs and their raw timing samples
+
+    A run is keyed by git commit, a host fingerprint (hostname, kernel, CPU
+    model and count, memory, Python version) and a config key (hash of
+    the settings that change what is measured). Only runs with the same
+    host fingerprint and config key are compared.
+    """
+
+    def __init__(self, path="history/benchmark_history.sqlite"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def record(self, config, samples):
+        """Store one run; samples maps (size_mb, language, operation) to seconds"""
+        commit, dirty = git_commit()
+        host = host_info()
+        with self.db:
+            run_id = self.db.execute(
+                "INSERT INTO runs (created_at, git_commit, git_dirty, host_fingerprint, host, config_key, config) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), commit, dirty, fingerprint(host), json.dumps(host),
+                 fingerprint(config), json.dumps(config, sort_keys=True))).lastrowid
+            self.db.executemany(
+                "INSERT INTO samples (run_id, file_size_mb, language, operation, seconds) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, size_mb, lang, operation, value)
+                 for (size_mb, lang, operation), values in samples.items() for value in values])
+        return run_id
+
+    def run(self, run_id):
+        return self.db.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+
+    def runs(self, limit=20):
+        return self.db.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+
+    def latest(self):
+        return self.db.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+
+    def find_baseline(self, current, ref=None):
+        """The run to compare current against
+
+        ref is a run id or a (prefix of a) commit hash, the latest run of
+        that commit; without it, the run recorded just before current.
+        Either way the baseline must share current's host fingerprint and
+        config key.
+        """
+        query = "SELECT * FROM runs WHERE host_fingerprint = ? AND config_key = ? AND id != ?"
+        params = [current['host_fingerprint'], current['config_key'], current['id']]
+        if ref is not None and ref.isdigit():
+            query += " AND id = ?"
+            params.append(int(ref))
+        elif ref is not None:
+            query += " AND git_commit LIKE ?"
+            params.append(ref + '%')
+        else:
+            query += " AND id < ?"
+            params.append(current['id'])
+        return self.db.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+
+    def samples(self, run_id):
+        """(size_mb, language, operation) -> list of seconds"""
+        samples = {}
+        for row in self.db.execute("SELECT file_size_mb, language, operation, seconds FROM samples "
+                                   "WHERE run_id = ?", (run_id,)):
+            samples.setdefault((row[0], row[1], row[2]), []).append(row[3])
+        return samples
+
+    def close(self):
+        self.db.close()
+
+def compare_samples(baseline, current, alpha=0.05, threshold=0.05):
+    """Compare two runs' samples, one row per (size, language, operation)
+
+    throughput_ratio is current over baseline throughput (mean baseline
+    time / mean current time; below 1.0 is slower), with a bootstrap
+    1 - alpha interval. A row is a regression when the whole interval is
+    below 1.0 and the ratio is below 1 - threshold, so tiny but consistent
+    differences do not fail the gate.
+
+    The Mann-Whitney p-value is reported too, but does not decide: with
+    the runner's default three iterations per run it cannot go below 0.1,
+    even for an exact test, while the bootstrap interval still separates a
+    clear slowdown.
+    """
+    rows = []
+    for key in sorted(set(baseline) & set(current)):
+        interval = bootstrap_ratio_ci(baseline[key], current[key], confidence=1 - alpha)
+        test = mann_whitney_u(baseline[key], current[key])
+        if interval is None or test is None:
+            continue
+        ratio, low, high = interval
+        size_mb, lang, operation = key
+        rows.append({
+            'file_size_mb': size_mb,
+            'language': lang,
+            'operation': operation,
+            'baseline_samples': len(baseline[key]),
+            'current_samples': len(current[key]),
+            'throughput_ratio': ratio,
+            'ci_low': low,
+            'ci_high': high,
+            'p_value': test[1],
+            'regression': high < 1 and ratio < 1 - threshold,
+            'improvement': low > 1 and ratio > 1 + threshold
+        })
+    return rows
+
+def describe(run):
+    commit = (run['git_commit'] or 'no commit')[:10] + ('+dirty' if run['git_dirty'] else '')
+    created = time.strftime('%Y-%m-%d %H:%M', time.localtime(run['created_at']))
+    return f"run {run['id']} ({commit}, {created})"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark history and regression gate")
+    parser.add_argument("--db", default="history/benchmark_history.sqlite",
+                        help="history database (default: history/benchmark_history.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list recorded runs")
+    compare = commands.add_parser("compare", help="compare a run against a baseline; exit 1 on regression")
+    compare.add_argument("--baseline",
+                         help="baseline run id or commit (default: the previous comparable run)")
+    compare.add_argument("--current", type=int, help="run id to check (default: the latest run)")
+    compare.add_argument("--alpha", type=float, default=0.05,
+                         help="significance level; the gate uses the 1 - alpha interval (default: 0.05)")
+    compare.add_argument("--threshold", type=float, default=0.05,
+                         help="smallest throughput loss that counts as a regression (default: 0.05)")
+    args = parser.parse_args()
+
+    history = ResultHistory(args.db)
+    try:
+        if args.command == "list":
+            for run in history.runs():
+                print(f"{describe(run)}  host={run['host_fingerprint']}  config={run['config_key']}")
+            return 0
+
+        current = history.run(args.current) if args.current else history.latest()
+        if current is None:
+            print("No runs recorded yet")
+            return 2
+        baseline = history.find_baseline(current, args.baseline)
+        if baseline is None:
+            print(f"No comparable baseline for {describe(current)} "
+                  f"(same host {current['host_fingerprint']} and config {current['config_key']})")
+            return 2
+
+        print(f"Comparing {describe(current)} against {describe(baseline)}")
+        rows = compare_samples(history.samples(baseline['id']), history.samples(current['id']),
+                               args.alpha, args.threshold)
+        interval = f"{1 - args.alpha:.0%} CI"
+        print(f"{'Size':>6} {'Language':<8} {'Operation':<9} {'Throughput':>10} {interval:>17} {'p':>7}")
+        for row in rows:
+            verdict = " REGRESSION" if row['regression'] else " improved" if row['improvement'] else ""
+            print(f"{row['file_size_mb']:>4}MB {row['language']:<8} {row['operation']:<9} "
+                  f"{row['throughput_ratio']:>9.3f}x [{row['ci_low']:.3f}, {row['ci_high']:.3f}] "
+                  f"{row['p_value']:>7.4f}{verdict}")
+        fewest = min((min(row['baseline_samples'], row['current_samples']) for row in rows), default=0)
+        if 0 < fewest < MIN_SAMPLES:
+            print(f"\nWarning: only {fewest} samples per side; intervals this small are rough, "
+                  f"run with --iterations {MIN_SAMPLES} or --adaptive for gating")
+        regressions = [row for row in rows if row['regression']]
+        if regressions:
+            print(f"\n{len(regressions)} significant throughput regression(s)")
+            return 1
+        print("\nNo significant throughput regressions")
+        return 0
+    finally:
+        history.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Append-only JSON-lines log of benchmark results
+Each finished iteration is written as it completes, so a crashed run can be resumed
+"""
+
+import json
+import os
+
+class ResultLog:
+    """Append-only JSON-lines file of benchmark records
+
+    Every record is flushed as soon as it is written. A partially written
+    last line (from a crash) is skipped when the log is read back.
+    """
+
+    def __init__(self, path="results/benchmark_log.jsonl"):
+        self.path = path
+        self.file = None
+
+    def open(self, resume=False):
+        """Open for appending; without resume any previous log is replaced"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.file = open(self.path, "a" if resume else "w")
+
+    def append(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def records(self):
+        """Yield every complete record in the log"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
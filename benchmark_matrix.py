@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark Matrix
+Expands a declarative config (JSON, TOML or YAML) into a list of benchmark jobs
+that can be filtered and resumed
+"""
+
+import fnmatch
+import itertools
+import json
+import os
+
+from benchmark_history import fingerprint
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+LANGUAGES = ['python', 'golang', 'kotlin']
+
+# Every key a matrix config may set; lists are crossed with each other
+DEFAULT_MATRIX = {
+    'languages': LANGUAGES,
+    'sizes_mb': [1, 10, 50, 100],
+    'iterations': 3,
+    'block_sizes': [None],    # None: each implementation's default
+    'strategies': [None],     # Python copy strategies; other languages ignore them
+    'concurrency': [None],    # Python concurrent streams; other languages ignore them
+    'workload': 'random',
+    'seed': 0,
+    'options': {}             # passed to every run, e.g. {"durability": "fsync"}
+}
+
+def load_config(path):
+    """Read a matrix config; the format follows the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path) as f:
+            config = json.load(f)
+    elif extension == '.toml':
+        if tomllib is None:
+            raise ImportError("TOML configs need Python 3.11+ or the tomli package")
+        with open(path, 'rb') as f:
+            config = tomllib.load(f)
+    elif extension in ('.yaml', '.yml'):
+        if yaml is None:
+            raise ImportError("YAML configs need the PyYAML package")
+        with open(path) as f:
+            config = yaml.safe_load(f) or {}
+    else:
+        raise ValueError(f"Unknown config format {extension!r} (use .json, .toml or .yaml)")
+
+    unknown = set(config) - set(DEFAULT_MATRIX)
+    if unknown:
+        raise ValueError(f"Unknown matrix keys in {path}: {', '.join(sorted(unknown))}")
+    return config
+
+def resolve(config=None, **overrides):
+    """Defaults, then the config file, then non-None overrides (e.g. from the CLI)"""
+    matrix = {**DEFAULT_MATRIX, **(config or {})}
+    matrix.update({key: value for key, value in overrides.items() if value is not None})
+    unknown = set(matrix['languages']) - set(LANGUAGES)
+    if unknown:
+        raise ValueError(f"Unknown languages: {', '.join(sorted(unknown))}")
+    return matrix
+
+def config_key(matrix):
+    """Fingerprint of the matrix settings shared by every job (workload, seed, run options)"""
+    return fingerprint({'workload': matrix['workload'], 'seed': matrix['seed'],
+                        'options': {key: value for key, value in matrix['options'].items()
+                                    if value is not None}})
+
+class MatrixJob:
+    """One cell of the matrix at one iteration
+
+    config is the config_key() of the matrix the job came from; it is part
+    of the key, so resuming never mistakes a run on other data or with
+    other options for this one.
+    """
+
+    __slots__ = ('language', 'size_mb', 'block_size', 'strategy', 'concurrency', 'iteration', 'config')
+
+    def __init__(self, language, size_mb, block_size=None, strategy=None, concurrency=None, iteration=0,
+                 config=None):
+        self.language = language
+        self.size_mb = size_mb
+        self.block_size = block_size
+        self.strategy = strategy
+        self.concurrency = concurrency
+        self.iteration = iteration
+        self.config = config
+
+    @property
+    def case(self):
+        """Stable name of the cell, shared by all its iterations, e.g. python/10mb/bs=65536"""
+        parts = [self.language, f"{self.size_mb}mb"]
+        if self.block_size is not None:
+            parts.append(f"bs={self.block_size}")
+        if self.strategy is not None:
+            parts.append(f"strategy={self.strategy}")
+        if self.concurrency is not None:
+            parts.append(f"streams={self.concurrency}")
+        return "/".join(parts)
+
+    @property
+    def key(self):
+        """case@config#iteration, e.g. python/10mb/bs=65536@1a2b3c4d5e6f#2"""
+        config = f"@{self.config}" if self.config is not None else ""
+        return f"{self.case}{config}#{self.iteration}"
+
+    def options(self):
+        """Run options for IOBenchmark.run_*_benchmark()"""
+        options = {}
+        if self.strategy is not None:
+            options['strategy'] = self.strategy
+        if self.concurrency is not None:
+            options['concurrency'] = self.concurrency
+        return options
+
+def expand(matrix):
+    """Cross the matrix into jobs, ordered by size, case and then iteration
+
+    Strategies and concurrency only exist in the Python implementation, so
+    the other languages get one case per block size instead of repeating
+    the same run for every strategy.
+    """
+    config = config_key(matrix)
+    jobs = []
+    for size_mb, language, block_size in itertools.product(
+            matrix['sizes_mb'], matrix['languages'], matrix['block_sizes']):
+        if language == 'python':
+            variants = itertools.product(matrix['strategies'], matrix['concurrency'])
+        else:
+            variants = [(None, None)]
+        for strategy, concurrency in variants:
+            jobs += [MatrixJob(language, size_mb, block_size, strategy, concurrency, iteration, config)
+                     for iteration in range(matrix['iterations'])]
+    return jobs
+
+def filter_jobs(jobs, patterns):
+    """Jobs whose case matches any of the shell-style patterns (all jobs if none)"""
+    if not patterns:
+        return list(jobs)
+    return [job for job in jobs if any(fnmatch.fnmatchcase(job.case, pattern) for pattern in patterns)]
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Resource profiling for benchmark processes
+CPU time, peak RSS, context switches and block I/O from wait4() rusage and
+/proc/<pid>, plus optional per-syscall counts from strace -c
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PROC_IO_FIELDS = ['rchar', 'wchar', 'syscr', 'syscw', 'read_bytes', 'write_bytes']
+
+def total_memory_bytes():
+    """Physical memory of this machine, or None where it cannot be read"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def read_proc_io(pid):
+    """Counters from /proc/<pid>/io, or None where unavailable"""
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            counters = dict(line.split(':') for line in f if ':' in line)
+    except OSError:
+        return None
+    return {name: int(counters[name]) for name in PROC_IO_FIELDS if name in counters}
+
+def read_peak_rss_kb(pid):
+    """VmHWM (peak resident set) from /proc/<pid>/status, or None"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def read_proc_counters(pid):
+    """Rusage-equivalent counters of a live process, read from /proc
+
+    Used for persistent workers, which are never reaped between jobs.
+    Block operations are derived the way the kernel derives ru_inblock and
+    ru_oublock: storage bytes in 512-byte units.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the parenthesised command name; utime and stime are 14 and 15
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open(f"/proc/{pid}/status") as f:
+            status = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return None
+    io = read_proc_io(pid) or {}
+    return {
+        'user_time': int(fields[11]) / CLOCK_TICKS,
+        'system_time': int(fields[12]) / CLOCK_TICKS,
+        'max_rss_kb': int(status['VmHWM'].split()[0]) if 'VmHWM' in status else None,
+        'voluntary_ctx_switches': int(status.get('voluntary_ctxt_switches', 0)),
+        'involuntary_ctx_switches': int(status.get('nonvoluntary_ctxt_switches', 0)),
+        'block_input_ops': io.get('read_bytes', 0) // 512,
+        'block_output_ops': io.get('write_bytes', 0) // 512,
+        'io': io or None
+    }
+
+def counter_delta(before, after):
+    """Per-job profile from two read_proc_counters() snapshots
+
+    Peak RSS is a high-water mark over the process lifetime, so it is
+    reported as is rather than as a difference.
+    """
+    if before is None or after is None:
+        return None
+    profile = {name: after[name] - before[name] for name in after
+               if name not in ('max_rss_kb', 'io')}
+    profile['max_rss_kb'] = after['max_rss_kb']
+    if before['io'] and after['io']:
+        profile['io'] = {name: after['io'][name] - before['io'][name] for name in after['io']}
+    else:
+        profile['io'] = None
+    return profile
+
+def rusage_profile(rusage, max_rss_kb=None, io=None):
+    """Profile from a reaped child's rusage
+
+    ru_maxrss is not used: Linux carries the parent's RSS into the child
+    across fork and exec, so it reports at least the runner's own size.
+    Peak RSS comes from /proc samples taken while the child ran instead.
+    """
+    return {
+        'user_time': rusage.ru_utime,
+        'system_time': rusage.ru_stime,
+        'max_rss_kb': max_rss_kb,
+        'voluntary_ctx_switches': rusage.ru_nvcsw,
+        'involuntary_ctx_switches': rusage.ru_nivcsw,
+        'block_input_ops': rusage.ru_inblock,
+        'block_output_ops': rusage.ru_oublock,
+        'io': io
+    }
+
+def flatten_profile(profile):
+    """One number per metric: I/O counters become io_<name>, syscalls the total count"""
+    metrics = {name: value for name, value in profile.items()
+               if name not in ('io', 'syscalls') and value is not None}
+    for name, value in (profile.get('io') or {}).items():
+        metrics[f'io_{name}'] = value
+    if profile.get('syscalls'):
+        metrics['syscalls'] = profile['syscalls']['total']
+    return metrics
+
+STRACE_ROW = re.compile(r"^\s*[\d.]+\s+[\d.]+\s+\d+\s+(\d+)\s+(?:(\d+)\s+)?(\w+)\s*$")
+
+def parse_strace_summary(text):
+    """Call counts per syscall from an `strace -c` table"""
+    calls = {}
+    for line in text.splitlines():
+        match = STRACE_ROW.match(line)
+        if match and match.group(3) != 'total':
+            calls[match.group(3)] = int(match.group(1))
+    return {'total': sum(calls.values()), 'by_name': calls}
+
+class ProfiledProcess:
+    """Run a command to completion, capturing its output and resource usage
+
+    The child is reaped with os.wait4() for its rusage; /proc/<pid>/io and
+    VmHWM are sampled every sample_interval seconds while it runs, since
+    they vanish on exit (a child that exits before the first sample has no
+    peak RSS or I/O counters). With strace, the command runs under
+    `strace -c -f` and the syscall table is parsed into profile['syscalls']
+    (the other counters then include strace's own overhead).
+    """
+
+    def __init__(self, cmd, cwd=None, strace=False, sample_interval=0.01):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.strace = strace
+        self.sample_interval = sample_interval
+        self.returncode = None
+        self.stdout = ""
+        self.stderr = ""
+        self.profile = None
+
+    def run(self):
+        cmd = self.cmd
+        strace_output = None
+        if self.strace:
+            if shutil.which('strace') is None:
+                raise OSError("strace is not installed")
+            fd, strace_output = tempfile.mkstemp(prefix="strace-", suffix=".txt")
+            os.close(fd)
+            cmd = ['strace', '-c', '-f', '-o', strace_output] + cmd
+
+        process = subprocess.Popen(cmd, cwd=self.cwd, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, text=True)
+        # Drain both pipes while polling, so a chatty child never blocks on a full pipe
+        output = {}
+        def drain(name, stream):
+            output[name] = stream.read()
+        readers = [threading.Thread(target=drain, args=('stdout', process.stdout)),
+                   threading.Thread(target=drain, args=('stderr', process.stderr))]
+        for reader in readers:
+            reader.start()
+
+        io = max_rss_kb = None
+        while True:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                break
+            io = read_proc_io(process.pid) or io
+            max_rss_kb = read_peak_rss_kb(process.pid) or max_rss_kb
+            time.sleep(self.sample_interval)
+        # Reaped by wait4, so Popen must not wait for it again
+        process.returncode = os.waitstatus_to_exitcode(status)
+        for reader in readers:
+            reader.join()
+
+        self.returncode = process.returncode
+        self.stdout, self.stderr = output.get('stdout', ""), output.get('stderr', "")
+        # Under strace the sampled process is strace itself
+        if self.strace:
+            self.profile = rusage_profile(rusage)
+        else:
+            self.profile = rusage_profile(rusage, max_rss_kb, io)
+        if strace_output:
+            with open(strace_output) as f:
+                self.profile['syscalls'] = parse_strace_summary(f.read())
+            os.remove(strace_output)
+        return self
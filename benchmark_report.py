@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Benchmark Reporting
+Charts, CSV tables and HTML/markdown reports for benchmark results
+matplotlib is imported on first use, with the headless Agg backend
+"""
+
+import base64
+import csv
+import html
+import os
+import statistics
+import time
+
+DPI = 150
+
+def pyplot():
+    """matplotlib.pyplot on the Agg backend, imported on first use
+
+    Agg renders straight to files, so plotting works on machines without a
+    display and never blocks.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def save_figure(plt, fig, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    plt.tight_layout()
+    plt.savefig(path, dpi=DPI, bbox_inches='tight')
+    plt.close(fig)
+
+def write_csv(rows, path):
+    """Write a list of dicts as CSV (columns are the union of their keys, in first-seen order)"""
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def summary_rows(stats, sizes, languages):
+    """One CSV row per size, language and operation from IOBenchmark.calculate_stats()"""
+    rows = []
+    for size_mb in sizes:
+        for lang in languages:
+            for operation, summary in stats[size_mb].get(lang, {}).items():
+                if not summary:
+                    continue
+                rows.append({
+                    'file_size_mb': size_mb,
+                    'language': lang,
+                    'operation': operation,
+                    'mean_time': summary['mean'],
+                    'median_time': summary['median'],
+                    'min_time': summary['min'],
+                    'max_time': summary['max'],
+                    'std_dev': summary['std'],
+                    'p95_time': summary['p95'],
+                    'p99_time': summary['p99'],
+                    'ci95_low': summary['ci95_low'],
+                    'ci95_high': summary['ci95_high'],
+                    'samples': summary['count'],
+                    'outliers_rejected': summary['outliers_rejected'],
+                    'throughput_mbs': size_mb / summary['mean']
+                })
+    return rows
+
+def profile_rows(profile_stats):
+    """One CSV row per size and language, one column per resource metric (means)"""
+    return [{'file_size_mb': size_mb, 'language': lang,
+             **{metric: summary['mean'] for metric, summary in metrics.items()}}
+            for size_mb, by_lang in profile_stats.items()
+            for lang, metrics in by_lang.items()]
+
+def plot_comparison(stats, sizes, languages, baseline_lang, path='results/io_performance_comparison.png'):
+    """The main 2x2 chart: read and write times, throughput and ratios to the baseline"""
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle('I/O Performance Comparison: Python vs Go vs Kotlin', fontsize=16)
+
+    # Read and write performance by file size
+    for ax, operation, marker in [(axes[0, 0], 'read', 'o'), (axes[0, 1], 'write', 's')]:
+        for lang in languages:
+            times = [stats[size][lang][operation]['mean'] for size in sizes
+                     if lang in stats[size] and operation in stats[size][lang]]
+            ax.plot(sizes[:len(times)], times, marker=marker, label=lang.capitalize(), linewidth=2)
+        ax.set_xlabel('File Size (MB)')
+        ax.set_ylabel('Time (seconds)')
+        ax.set_title(f'{operation.capitalize()} Performance')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    # Throughput comparison (MB/s) for largest file
+    ax3 = axes[1, 0]
+    largest_file = max(sizes)
+    read_throughput = []
+    write_throughput = []
+    lang_labels = []
+    for lang in languages:
+        lang_stats = stats[largest_file].get(lang, {})
+        if lang_stats.get('read') and lang_stats.get('write'):
+            read_throughput.append(largest_file / lang_stats['read']['mean'])
+            write_throughput.append(largest_file / lang_stats['write']['mean'])
+            lang_labels.append(lang.capitalize())
+
+    width = 0.35
+    ax3.set_title(f'Throughput Comparison ({largest_file}MB file)')
+    if lang_labels:
+        x = range(len(lang_labels))
+        ax3.bar([i - width/2 for i in x], read_throughput, width, label='Read', alpha=0.8)
+        ax3.bar([i + width/2 for i in x], write_throughput, width, label='Write', alpha=0.8)
+        ax3.set_xlabel('Language')
+        ax3.set_ylabel('Throughput (MB/s)')
+        ax3.set_xticks(x)
+        ax3.set_xticklabels(lang_labels)
+        ax3.legend()
+        ax3.grid(True, alpha=0.3)
+    else:
+        ax3.text(0.5, 0.5, 'No throughput data available',
+                 horizontalalignment='center', verticalalignment='center',
+                 transform=ax3.transAxes, fontsize=12)
+
+    # Performance ratio to the baseline (= 1.0), with bootstrap 95% intervals
+    ax4 = axes[1, 1]
+    ratio_key = f'ratio_vs_{baseline_lang}'
+    ratios_data = {'Read': [], 'Write': []}
+    ratio_errors = {'Read': [[], []], 'Write': [[], []]}
+    ratio_labels = []
+    for lang in languages:
+        lang_stats = stats[largest_file].get(lang, {})
+        if not all(ratio_key in lang_stats.get(operation, {}) for operation in ['read', 'write']):
+            continue
+        for label, operation in [('Read', 'read'), ('Write', 'write')]:
+            ratio = lang_stats[operation][ratio_key]
+            ratios_data[label].append(ratio['ratio'])
+            ratio_errors[label][0].append(ratio['ratio'] - ratio['ci95_low'])
+            ratio_errors[label][1].append(ratio['ci95_high'] - ratio['ratio'])
+        ratio_labels.append(lang.capitalize())
+
+    baseline_label = 'Go' if baseline_lang == 'golang' else baseline_lang.capitalize()
+    ax4.set_title(f'Relative Performance ({baseline_label} = 1.0)')
+    if ratio_labels:
+        x = range(len(ratio_labels))
+        ax4.bar([i - width/2 for i in x], ratios_data['Read'], width, label='Read', alpha=0.8,
+                yerr=ratio_errors['Read'], capsize=4)
+        ax4.bar([i + width/2 for i in x], ratios_data['Write'], width, label='Write', alpha=0.8,
+                yerr=ratio_errors['Write'], capsize=4)
+        ax4.set_xlabel('Language')
+        ax4.set_ylabel(f'Performance Ratio (vs {baseline_label})')
+        ax4.set_xticks(x)
+        ax4.set_xticklabels(ratio_labels)
+        ax4.legend()
+        ax4.grid(True, alpha=0.3)
+        ax4.axhline(y=1.0, color='red', linestyle='--', alpha=0.7)
+    else:
+        ax4.text(0.5, 0.5, 'No ratio data available',
+                 horizontalalignment='center', verticalalignment='center',
+                 transform=ax4.transAxes, fontsize=12)
+
+    save_figure(plt, fig, path)
+
+def plot_buffer_sweep(knees, path='results/buffer_sweep.png'):
+    """Measured and fitted throughput per block size, with the knee marked"""
+    plt = pyplot()
+    fig, axes = plt.subplots(len(knees), 2, figsize=(15, 5 * len(knees)), squeeze=False)
+    fig.suptitle('Throughput vs Block Size', fontsize=16)
+    for row, (size_mb, by_lang) in enumerate(knees.items()):
+        for col, operation in enumerate(['read', 'write']):
+            ax = axes[row, col]
+            for lang, by_op in by_lang.items():
+                if operation not in by_op:
+                    continue
+                knee = by_op[operation]
+                line, = ax.plot(knee['block_sizes'], knee['mean_throughput_mbs'],
+                                marker='o', linestyle='', label=lang.capitalize())
+                ax.plot(knee['block_sizes'], knee['fit'], color=line.get_color(), alpha=0.7)
+                ax.axvline(knee['knee_block_size'], color=line.get_color(), linestyle='--', alpha=0.5)
+            ax.set_xscale('log', base=2)
+            ax.set_xlabel('Block Size (bytes)')
+            ax.set_ylabel('Throughput (MB/s)')
+            ax.set_title(f'{operation.capitalize()} ({size_mb}MB file)')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+    save_figure(plt, fig, path)
+
+def plot_concurrency(concurrency_results, path='results/concurrency_scaling.png'):
+    """Aggregate throughput against the number of concurrent streams, per executor"""
+    plt = pyplot()
+    sizes = list(concurrency_results)
+    fig, axes = plt.subplots(len(sizes), 2, figsize=(15, 5 * len(sizes)), squeeze=False)
+    fig.suptitle('Python Throughput Scaling with Concurrent Streams', fontsize=16)
+    for row, size_mb in enumerate(sizes):
+        for col, operation in enumerate(['read', 'write']):
+            ax = axes[row, col]
+            for executor, by_level in concurrency_results[size_mb].items():
+                levels = [n for n in by_level if by_level[n][operation]]
+                means = [statistics.mean(by_level[n][operation]) for n in levels]
+                ax.plot(levels, means, marker='o', label=executor, linewidth=2)
+            ax.set_xlabel('Concurrent streams (N)')
+            ax.set_ylabel('Aggregate throughput (MB/s)')
+            ax.set_title(f'{operation.capitalize()} ({size_mb}MB file)')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+    save_figure(plt, fig, path)
+
+def plot_latency(latency_results, path='results/latency_percentiles.png'):
+    """p50/p99/p99.9/max per-call latency per language"""
+    plt = pyplot()
+    percentiles = [('p50', 'p50_us'), ('p99', 'p99_us'), ('p99.9', 'p999_us'), ('max', 'max_us')]
+    sizes = list(latency_results)
+    fig, axes = plt.subplots(len(sizes), 2, figsize=(15, 5 * len(sizes)), squeeze=False)
+    fig.suptitle('Per-call I/O Latency Percentiles', fontsize=16)
+    width = 0.8 / len(percentiles)
+    for row, size_mb in enumerate(sizes):
+        langs = list(latency_results[size_mb])
+        for col, operation in enumerate(['read', 'write']):
+            ax = axes[row, col]
+            for i, (label, key) in enumerate(percentiles):
+                values = [latency_results[size_mb][lang][operation][key] for lang in langs]
+                ax.bar([x + (i - (len(percentiles) - 1) / 2) * width for x in range(len(langs))],
+                       values, width, label=label, alpha=0.8)
+            ax.set_xticks(range(len(langs)))
+            ax.set_xticklabels([lang.capitalize() for lang in langs])
+            ax.set_yscale('log')
+            ax.set_ylabel('Latency per call (µs)')
+            ax.set_title(f'{operation.capitalize()} ({size_mb}MB file)')
+            ax.legend()
+            ax.grid(True, alpha=0.3, axis='y')
+    save_figure(plt, fig, path)
+
+def plot_random_access(random_results, path='results/random_access.png'):
+    """IOPS against queue depth per access pattern and language"""
+    plt = pyplot()
+    rows = [(size_mb, pattern) for size_mb in random_results for pattern in random_results[size_mb]]
+    fig, axes = plt.subplots(len(rows), 2, figsize=(15, 5 * len(rows)), squeeze=False)
+    fig.suptitle('Random-access IOPS by Queue Depth', fontsize=16)
+    for row, (size_mb, pattern) in enumerate(rows):
+        for col, operation in enumerate(['read', 'write']):
+            ax = axes[row, col]
+            for lang, by_depth in random_results[size_mb][pattern].items():
+                depths = list(by_depth)
+                iops = [statistics.mean(by_depth[d][f'{operation}_iops']) for d in depths]
+                ax.plot(depths, iops, marker='o', label=lang.capitalize(), linewidth=2)
+            ax.set_xscale('log', base=2)
+            ax.set_xlabel('Queue depth')
+            ax.set_ylabel('IOPS')
+            ax.set_title(f'{operation.capitalize()}, {pattern} ({size_mb}MB file)')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+    save_figure(plt, fig, path)
+
+def plot_large_files(large_results, path='results/large_files.png'):
+    """Windowed write and read throughput over the run, per file size and language"""
+    plt = pyplot()
+    sizes = list(large_results)
+    fig, axes = plt.subplots(len(sizes), 2, figsize=(15, 5 * len(sizes)), squeeze=False)
+    fig.suptitle('Large Files: Throughput over Time', fontsize=16)
+    for row, size_mb in enumerate(sizes):
+        for col, operation in enumerate(['write', 'read']):
+            ax = axes[row, col]
+            ratio = None
+            for lang, runs in large_results[size_mb].items():
+                windows = (runs[0].get('windows') or {}).get(operation) or []
+                ratio = runs[0]['ram_ratio']
+                ax.plot([w['end_s'] for w in windows], [w['throughput_mbs'] for w in windows],
+                        label=lang.capitalize(), linewidth=1.5)
+            ax.set_xlabel('Time since start (s)')
+            ax.set_ylabel('Throughput (MB/s)')
+            ram = f', {ratio:.2f}x RAM' if ratio else ''
+            ax.set_title(f'{"Copy" if operation == "write" else "Read"}, {int(size_mb) / 1024:g}GB file{ram}')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+    save_figure(plt, fig, path)
+
+def plot_metadata(metadata_results, path='results/metadata_ops.png'):
+    """Operations per second per metadata operation and language, one row per thread count"""
+    plt = pyplot()
+    rows = [(size_mb, threads) for size_mb in metadata_results for threads in metadata_results[size_mb]]
+    fig, axes = plt.subplots(len(rows), 1, figsize=(15, 5 * len(rows)), squeeze=False)
+    fig.suptitle('File-system Metadata Operations', fontsize=16)
+    for row, (size_mb, threads) in enumerate(rows):
+        ax = axes[row, 0]
+        by_lang = metadata_results[size_mb][threads]
+        operations = list(next(iter(by_lang.values()))['operations']) if by_lang else []
+        width = 0.8 / max(len(by_lang), 1)
+        for index, (lang, samples) in enumerate(by_lang.items()):
+            ax.bar([i + (index - (len(by_lang) - 1) / 2) * width for i in range(len(operations))],
+                   [statistics.mean(samples['operations'].get(op, [0])) for op in operations],
+                   width, label=lang.capitalize(), alpha=0.8)
+        ax.set_xticks(range(len(operations)))
+        ax.set_xticklabels(operations)
+        ax.set_yscale('log')
+        ax.set_ylabel('Operations per second')
+        thread_label = '1 thread' if int(threads) == 1 else f'{threads} threads'
+        ax.set_title(f'{thread_label} (tree copy from the {size_mb}MB small-files workload)')
+        ax.legend()
+        ax.grid(True, alpha=0.3, axis='y')
+    save_figure(plt, fig, path)
+
+def plot_pipeline(pipeline_results, path='results/pipeline_depth.png'):
+    """asyncio pipeline throughput against queue depth, with the synchronous loop as a line"""
+    plt = pyplot()
+    rows = [(size_mb, cache) for size_mb in pipeline_results for cache in pipeline_results[size_mb]]
+    fig, axes = plt.subplots(len(rows), 2, figsize=(15, 5 * len(rows)), squeeze=False)
+    fig.suptitle('Python Pipelined I/O: Throughput vs Queue Depth', fontsize=16)
+    for row, (size_mb, cache) in enumerate(rows):
+        by_engine = pipeline_results[size_mb][cache]
+        for col, operation in enumerate(['write', 'read']):
+            ax = axes[row, col]
+            key = f'{operation}_throughput_mbs'
+            by_depth = by_engine.get('asyncio', {})
+            depths = list(by_depth)
+            ax.plot(depths, [statistics.mean(by_depth[d][key]) for d in depths],
+                    marker='o', label='asyncio', linewidth=2)
+            if 'sync' in by_engine:
+                ax.axhline(statistics.mean(by_engine['sync'][key]), color='gray',
+                           linestyle='--', label='synchronous loop')
+            ax.set_xscale('log', base=2)
+            ax.set_xlabel('Queue depth (operations in flight)')
+            ax.set_ylabel('Throughput (MB/s)')
+            ax.set_title(f'{"Copy" if operation == "write" else "Read"}, {cache} cache ({size_mb}MB file)')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+    save_figure(plt, fig, path)
+
+def plot_parsing(parse_results, parsers, path='results/parsing_throughput.png'):
+    """Records per second and MB/s per parser and file size"""
+    plt = pyplot()
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+    fig.suptitle('Python Read-and-Parse Throughput', fontsize=16)
+    sizes = list(parse_results)
+    width = 0.8 / max(len(sizes), 1)
+    for ax, (metric, label) in zip(axes, [('records_per_sec', 'Records per second'),
+                                          ('read_throughput_mbs', 'Throughput (MB/s)')]):
+        for i, size_mb in enumerate(sizes):
+            present = [p for p in parsers if p in parse_results[size_mb]]
+            x = [list(parsers).index(p) + (i - (len(sizes) - 1) / 2) * width for p in present]
+            values = [statistics.mean(parse_results[size_mb][p][metric]) for p in present]
+            ax.bar(x, values, width, label=f'{size_mb}MB', alpha=0.8)
+        ax.set_xticks(range(len(parsers)))
+        ax.set_xticklabels(list(parsers), rotation=20)
+        ax.set_yscale('log')
+        ax.set_ylabel(label)
+        ax.legend()
+        ax.grid(True, alpha=0.3, axis='y')
+    save_figure(plt, fig, path)
+
+def plot_compression(compression_results, codecs, path='results/compression_tradeoff.png'):
+    """Logical throughput against compression ratio per codec, next to a plain copy"""
+    plt = pyplot()
+    sizes = list(compression_results)
+    fig, axes = plt.subplots(len(sizes), 2, figsize=(15, 5 * len(sizes)), squeeze=False)
+    fig.suptitle('Compression Pipeline: Logical Throughput vs Ratio', fontsize=16)
+    for row, size_mb in enumerate(sizes):
+        by_codec = compression_results[size_mb]
+        for col, operation in enumerate(['write', 'read']):
+            ax = axes[row, col]
+            key = f'{operation}_throughput_mbs'
+            for codec in codecs:
+                points = [by_codec[name] for name in by_codec
+                          if name != 'baseline' and by_codec[name]['codec'] == codec]
+                if not points:
+                    continue
+                ax.plot([p['compression_ratio'] for p in points],
+                        [statistics.mean(p[key]) for p in points], marker='o', label=codec)
+                for p in points:
+                    ax.annotate(str(p['level']), (p['compression_ratio'], statistics.mean(p[key])),
+                                textcoords='offset points', xytext=(4, 4), fontsize=8)
+            if 'baseline' in by_codec:
+                ax.axhline(statistics.mean(by_codec['baseline'][key]), color='gray',
+                           linestyle='--', label='plain copy')
+            ax.set_yscale('log')
+            ax.set_xlabel('Compression ratio')
+            ax.set_ylabel('Logical throughput (MB/s)')
+            ax.set_title(f'{"Compress + write" if operation == "write" else "Read + decompress"} '
+                         f'({size_mb}MB file)')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+    save_figure(plt, fig, path)
+
+def report_tables(stats, sizes, languages, baseline_lang, profile_stats):
+    """Report content as (title, header, rows) tables of formatted cells"""
+    ratio_key = f'ratio_vs_{baseline_lang}'
+    results = []
+    for size_mb in sizes:
+        for lang in languages:
+            for operation, summary in stats[size_mb].get(lang, {}).items():
+                ratio = summary.get(ratio_key)
+                results.append([f"{size_mb}MB", lang, operation, f"{summary['mean']:.4f}",
+                                f"[{summary['ci95_low']:.4f}, {summary['ci95_high']:.4f}]",
+                                f"{size_mb / summary['mean']:.1f}",
+                                f"{ratio['ratio']:.2f} [{ratio['ci95_low']:.2f}, {ratio['ci95_high']:.2f}]"
+                                if ratio else "", str(summary['count'])])
+    tables = [("Results",
+               ["Size", "Language", "Operation", "Mean (s)", "95% CI (s)", "MB/s",
+                f"Speed vs {baseline_lang}", "Samples"], results)]
+
+    resources = []
+    for size_mb, by_lang in profile_stats.items():
+        for lang, metrics in by_lang.items():
+            def mean(metric, scale=1, fmt="{:.3f}"):
+                return fmt.format(metrics[metric]['mean'] / scale) if metric in metrics else ""
+            resources.append([f"{size_mb}MB", lang, mean('user_time'), mean('system_time'),
+                              mean('max_rss_kb', 1024, "{:.0f}"),
+                              mean('voluntary_ctx_switches', fmt="{:.0f}"),
+                              mean('involuntary_ctx_switches', fmt="{:.0f}"),
+                              mean('io_syscr', fmt="{:.0f}"), mean('io_syscw', fmt="{:.0f}")])
+    if resources:
+        tables.append(("Resource usage (means per run)",
+                       ["Size", "Language", "User CPU (s)", "System CPU (s)", "Peak RSS (MB)",
+                        "Voluntary switches", "Involuntary switches", "Read syscalls", "Write syscalls"],
+                       resources))
+    return tables
+
+def write_report(path, fmt, stats, sizes, languages, baseline_lang, profile_stats=None,
+                 config=None, images=()):
+    """Write a markdown ('md') or HTML ('html') report
+
+    HTML reports embed the images as data URIs, so the file stands alone;
+    markdown reports link them relative to the report.
+    """
+    tables = report_tables(stats, sizes, languages, baseline_lang, profile_stats or {})
+    title = "I/O Performance Comparison"
+    generated = time.strftime('%Y-%m-%d %H:%M:%S')
+    images = [image for image in images if os.path.exists(image)]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    if fmt == 'md':
+        lines = [f"# {title}", "", f"Generated {generated}", ""]
+        if config:
+            lines += ["```", *(f"{key}: {value}" for key, value in config.items()), "```", ""]
+        for heading, header, rows in tables:
+            lines += [f"## {heading}", "", "| " + " | ".join(header) + " |",
+                      "|" + "---|" * len(header)]
+            lines += ["| " + " | ".join(row) + " |" for row in rows]
+            lines.append("")
+        for image in images:
+            lines += [f"![{os.path.basename(image)}]({os.path.relpath(image, os.path.dirname(path) or '.')})", ""]
+        content = "\n".join(lines)
+    elif fmt == 'html':
+        parts = [f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title>",
+                 "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:2em}"
+                 "td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}th{background:#f4f4f4}"
+                 "img{max-width:100%}</style></head><body>",
+                 f"<h1>{title}</h1><p>Generated {generated}</p>"]
+        if config:
+            parts.append("<pre>" + html.escape("\n".join(f"{k}: {v}" for k, v in config.items())) + "</pre>")
+        for heading, header, rows in tables:
+            parts.append(f"<h2>{html.escape(heading)}</h2><table><tr>"
+                         + "".join(f"<th>{html.escape(cell)}</th>" for cell in header) + "</tr>")
+            parts += ["<tr>" + "".join(f"<td>{html.escape(cell)}</td>" for cell in row) + "</tr>"
+                      for row in rows]
+            parts.append("</table>")
+        for image in images:
+            with open(image, 'rb') as f:
+                data = base64.b64encode(f.read()).decode('ascii')
+            alt = html.escape(os.path.basename(image))
+            parts.append(f'<img src="data:image/png;base64,{data}" alt="{alt}">')
+        parts.append("</body></html>")
+        content = "\n".join(parts)
+    else:
+        raise ValueError(f"Unknown report format {fmt!r}")
+
+    with open(path, 'w') as f:
+        f.write(content + "\n")
+    return path
@@ -4,344 +4,1632 @@ I/O Performance Benchmark Runner
 Compares file I/O performance across Python, Go, and Kotlin
 """
 
+import argparse
+import hashlib
 import os
+import shutil
 import subprocess
 import json
 import time
-import matplotlib.pyplot as plt
-import pandas as pd
 from pathlib import Path
 import statistics
 
+from benchmark_history import ResultHistory
+from benchmark_log import ResultLog
+from benchmark_matrix import LANGUAGES, expand, filter_jobs, load_config, resolve
+from benchmark_report import (
+    plot_buffer_sweep,
+    plot_comparison,
+    plot_compression,
+    plot_concurrency,
+    plot_large_files,
+    plot_latency,
+    plot_metadata,
+    plot_parsing,
+    plot_pipeline,
+    plot_random_access,
+    profile_rows,
+    summary_rows,
+    write_csv,
+    write_report,
+)
+from benchmark_profile import (ProfiledProcess, counter_delta, flatten_profile, read_proc_counters,
+                               total_memory_bytes)
+from benchmark_scheduler import Job, Scheduler
+from benchmark_stats import SampleStats, bootstrap_ratio_ci
+from workloads import MB, WorkloadGenerator, WorkloadSpec, check_free_space
+
+class BuildCache:
+    """Build-once cache for the compiled Go binary and Kotlin fat jar
+    
+    Artifacts live in .build_cache/<language>-<hash>/, keyed by a hash of the
+    implementation's sources and build files, so they are built at most once
+    per run and reused across runs until the sources change.
+    """
+    
+    SOURCES = {
+        'golang': ['golang/*.go', 'golang/go.mod', 'golang/go.sum'],
+        'kotlin': ['kotlin/app/src/main/**/*.kt', 'kotlin/app/build.gradle.kts',
+                   'kotlin/settings.gradle.kts', 'kotlin/gradle/libs.versions.toml']
+    }
+    ARTIFACTS = {'golang': 'io_benchmark', 'kotlin': 'io_benchmark.jar'}
+    
+    def __init__(self, cache_dir=".build_cache"):
+        self.cache_dir = Path(cache_dir)
+        self.artifacts = {}
+    
+    def source_hash(self, lang):
+        """Hash the contents and relative paths of an implementation's sources"""
+        digest = hashlib.sha256()
+        paths = sorted({p for pattern in self.SOURCES[lang] for p in Path('.').glob(pattern)})
+        for path in paths:
+            digest.update(str(path).encode())
+            digest.update(path.read_bytes())
+        return digest.hexdigest()[:16]
+    
+    def artifact(self, lang):
+        """Return the absolute artifact path for lang, building it if needed
+        
+        Returns None if the build fails; the failure is remembered for the
+        rest of the run instead of retrying on every iteration.
+        """
+        if lang in self.artifacts:
+            return self.artifacts[lang]
+        
+        build_dir = self.cache_dir / f"{lang}-{self.source_hash(lang)}"
+        path = (build_dir / self.ARTIFACTS[lang]).resolve()
+        if not path.exists():
+            print(f"Building {lang} artifact {path}...")
+            build_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                getattr(self, f"build_{lang}")(path)
+            except (subprocess.CalledProcessError, OSError) as e:
+                print(f"{lang} build failed: {e}")
+                shutil.rmtree(build_dir, ignore_errors=True)
+                path = None
+            else:
+                self.prune(lang, build_dir)
+        
+        self.artifacts[lang] = path
+        return path
+    
+    def prune(self, lang, keep):
+        """Remove stale artifacts of lang built from older sources"""
+        for stale in self.cache_dir.glob(f"{lang}-*"):
+            if stale != keep:
+                shutil.rmtree(stale, ignore_errors=True)
+    
+    def build_golang(self, path):
+        subprocess.run(["go", "build", "-o", str(path), "."], cwd="golang", check=True)
+    
+    def build_kotlin(self, path):
+        subprocess.run(["./gradlew", "fatJar", "--quiet"], cwd="kotlin", check=True)
+        shutil.copy2("kotlin/app/build/libs/app-all.jar", path)
+
+class BenchmarkWorker:
+    """Long-lived benchmark process speaking the JSON-lines worker protocol
+    
+    Each job is written as one JSON object on the worker's stdin; the worker
+    answers with one JSON object on stdout, either a result or {'error': ...}.
+    Results get a 'profile' from the worker's /proc counters around the job.
+    """
+    
+    def __init__(self, name, cmd, cwd=None):
+        self.name = name
+        self.cmd = cmd
+        self.cwd = cwd
+        self.process = None
+    
+    def start(self):
+        self.process = subprocess.Popen(self.cmd, cwd=self.cwd, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, text=True, bufsize=1)
+    
+    def request(self, job):
+        """Send one job and wait for its result, returning None on failure"""
+        if self.process is None or self.process.poll() is not None:
+            print(f"{self.name} worker is not running")
+            return None
+        before = read_proc_counters(self.process.pid)
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            print(f"{self.name} worker exited unexpectedly")
+            return None
+        
+        # Skip anything that is not a JSON object (e.g. Gradle chatter)
+        for line in iter(self.process.stdout.readline, ""):
+            line = line.strip()
+            if not (line.startswith('{') and line.endswith('}')):
+                continue
+            response = json.loads(line)
+            if 'error' in response:
+                print(f"{self.name} worker job failed: {response['error']}")
+                return None
+            response['profile'] = counter_delta(before, read_proc_counters(self.process.pid))
+            return response
+        print(f"{self.name} worker exited unexpectedly")
+        return None
+    
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
 class IOBenchmark:
     def __init__(self):
-        self.results = {}
+        self.results = {}  # size -> language -> operation -> SampleStats
+        self.languages = list(LANGUAGES)  # the languages to run, in order
+        self.result_log = ResultLog()
         self.test_file_sizes = [1, 10, 50, 100]  # MB
+        self.workload = WorkloadSpec('random')
+        self.workload_generator = WorkloadGenerator()
+        self.data_dir = None  # absolute path of the generated test files
         self.iterations = 3
+        self.run_options = {}  # extra options for every run, e.g. durability
+        self.warmup_runs = 1
+        self.adaptive = False
+        self.target_ci = 0.05  # adaptive: 95% CI half-width as a fraction of the mean
+        self.min_iterations = 5
+        self.max_iterations = 100
+        self.time_budget = 300.0  # adaptive: seconds per file size
+        self.reject_outliers = False
+        self.baseline_lang = 'golang'
+        self.strategy_results = {}
+        self.sweep_block_sizes = [4096 * 2 ** i for i in range(13)]  # 4KB .. 16MB
+        self.knee_tolerance = 0.05  # knee = smallest block within 5% of peak
+        self.sweep_results = {}
+        self.workers = {}
+        self.worker_warmup_runs = 2
+        self.build_cache = BuildCache()
+        self.concurrency_levels = list(range(1, (os.cpu_count() or 1) + 1))
+        self.executors = ['thread', 'process', 'asyncio']
+        self.concurrency_results = {}
+        self.read_modes = ['stream', 'mmap', 'direct']
+        self.cache_states = ['hot', 'cold']
+        self.read_mode_results = {}
+        self.latency_results = {}  # size -> language -> operation -> per-run percentile summaries
+        self.random_patterns = ['uniform', 'zipf', 'strided']
+        self.random_queue_depths = [1, 4, 16]
+        self.random_block_size = 4096
+        self.random_results = {}  # size -> pattern -> language -> queue depth -> samples
+        # Python parsers and the workload each one reads
+        self.parsers = {'lines': 'text', 'csv': 'csv', 'jsonl': 'jsonl',
+                        'numpy_frombuffer': 'records', 'numpy_fromfile': 'records'}
+        self.parse_results = {}  # size -> parser -> samples
+        self.compression_levels = {'gzip': [1, 6, 9], 'zlib': [1, 6, 9], 'lzma': [0, 6],
+                                   'bz2': [1, 9], 'gzip_threaded': [1, 6, 9]}
+        self.compression_workload = 'text'  # compressed logs
+        self.compression_results = {}  # size -> 'codec/level' -> samples, plus 'baseline'
+        self.matrix_log = ResultLog("results/matrix_log.jsonl")
+        self.matrix_results = {}  # case -> job fields and throughput samples
+        self.large_sizes_gb = [1, 4, 16, 64]
+        self.large_reserve_mb = 1024  # left free on the disk after generating and copying
+        self.window_ms = 500
+        self.large_results = {}  # size -> language -> runs with throughputs, windows and RAM ratio
+        self.metadata_files = 10000
+        self.metadata_files_per_dir = 1000
+        self.metadata_threads = sorted({1, max(4, os.cpu_count() or 1)})
+        self.metadata_results = {}  # size -> threads -> language -> operation -> ops/s samples
+        self.pipeline_queue_depths = [1, 2, 4, 8, 16, 32]
+        self.pipeline_block_size = 128 * 1024
+        self.pipeline_results = {}  # size -> cache -> 'sync' samples, or 'asyncio' -> queue depth -> samples
+        self.strace = False  # also count syscalls with strace -c (subprocess runs only)
+        self.profiles = {}  # size -> language -> resource metric -> SampleStats
+        self.scheduler = None  # run_scheduled(): a benchmark_scheduler.Scheduler
+        self.history_path = "history/benchmark_history.sqlite"  # None: do not record
+        self.plots = True  # False skips matplotlib entirely
         
     def create_test_files(self):
-        """Create test files of different sizes"""
+        """Generate the selected workload's test files, reusing cached ones
+        
+        Every implementation is pointed at the workload directory with
+        --data-dir, so all three read exactly the same bytes.
+        """
+        if self.workload.is_tree:
+            raise ValueError(f"{self.workload.kind} is a tree workload, not a single-file one")
         print("Creating test files...")
-        os.makedirs("data", exist_ok=True)
+        directory = self.workload_generator.generate(self.workload, self.test_file_sizes)
+        self.data_dir = str(directory.resolve())
+    
+    def benchmark_args(self, file_size_mb, block_size=None, **options):
+        """Build implementation command-line arguments; options become --flags"""
+        options.setdefault('data_dir', self.data_dir)
+        args = []
+        if block_size is not None:
+            args += ["--block-size", str(block_size)]
+        for name, value in options.items():
+            flag = f"--{name.replace('_', '-')}"
+            if value is True:
+                args.append(flag)
+            elif value is not None and value is not False:
+                args += [flag, str(value)]
+        return args + [str(file_size_mb)]
+    
+    def worker_job(self, file_size_mb, block_size=None, **options):
+        """Build a worker-protocol job matching benchmark_args()"""
+        options.setdefault('data_dir', self.data_dir)
+        job = {'file_size_mb': file_size_mb}
+        if block_size is not None:
+            job['block_size'] = block_size
+        job.update({name: value for name, value in options.items() if value is not None})
+        return job
+    
+    def start_workers(self):
+        """Start and warm up one persistent worker per language
         
-        for size_mb in self.test_file_sizes:
-            file_path = f"data/test_{size_mb}mb.txt"
-            if not os.path.exists(file_path):
-                print(f"Creating {size_mb}MB test file...")
-                with open(file_path, 'wb') as f:
-                    # Write 1MB chunks
-                    chunk = b'A' * (1024 * 1024)
-                    for _ in range(size_mb):
-                        f.write(chunk)
-    
-    def run_python_benchmark(self, file_size_mb):
+        While workers are running, run_*_benchmark() streams jobs through
+        them instead of paying process, build and JVM startup per iteration.
+        """
+        self.create_test_files()
+        self.workers = {
+            'python': BenchmarkWorker('Python', ["python3", "python/io_benchmark.py", "--worker"])
+        }
+        go_binary = self.build_cache.artifact('golang')
+        if go_binary:
+            self.workers['golang'] = BenchmarkWorker('Go', [str(go_binary), "--worker"], cwd="golang")
+        kotlin_jar = self.build_cache.artifact('kotlin')
+        if kotlin_jar:
+            self.workers['kotlin'] = BenchmarkWorker('Kotlin', ["java", "-jar", str(kotlin_jar), "--worker"],
+                                                     cwd="kotlin/app")
+        warmup_job = self.worker_job(min(self.test_file_sizes))
+        for lang, worker in self.workers.items():
+            print(f"Starting {worker.name} worker...")
+            worker.start()
+            for _ in range(self.worker_warmup_runs):
+                worker.request(warmup_job)
+    
+    def stop_workers(self):
+        for worker in self.workers.values():
+            worker.stop()
+        self.workers = {}
+    
+    def run_profiled(self, label, cmd, cwd=None):
+        """Run one benchmark process, returning its ProfiledProcess or None on failure"""
+        try:
+            process = ProfiledProcess(cmd, cwd=cwd, strace=self.strace).run()
+        except OSError as e:
+            print(f"{label} benchmark failed: {e}")
+            return None
+        if process.returncode != 0:
+            print(f"{label} benchmark failed: {process.stderr}")
+            return None
+        return process
+    
+    def run_python_benchmark(self, file_size_mb, block_size=None, **options):
         """Run Python I/O benchmark"""
-        cmd = ["python3", "python/io_benchmark.py", str(file_size_mb)]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"Python benchmark failed: {result.stderr}")
+        if 'python' in self.workers:
+            return self.workers['python'].request(self.worker_job(file_size_mb, block_size, **options))
+        cmd = (["python3", "python/io_benchmark.py"] +
+               self.benchmark_args(file_size_mb, block_size, **options))
+        process = self.run_profiled("Python", cmd)
+        if process is None:
             return None
-        return json.loads(result.stdout.strip())
+        return {**json.loads(process.stdout.strip()), 'profile': process.profile}
     
-    def run_golang_benchmark(self, file_size_mb):
+    def run_golang_benchmark(self, file_size_mb, block_size=None, **options):
         """Run Go I/O benchmark"""
-        # Build Go binary first
-        subprocess.run(["go", "build", "-o", "golang/io_benchmark", "golang/main.go"], 
-                      cwd=".", check=True)
+        if 'golang' in self.workers:
+            return self.workers['golang'].request(self.worker_job(file_size_mb, block_size, **options))
+        binary = self.build_cache.artifact('golang')
+        if binary is None:
+            return None
         
-        cmd = ["./golang/io_benchmark", str(file_size_mb)]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"Go benchmark failed: {result.stderr}")
+        # The Go benchmark resolves its default ../data relative to golang/
+        cmd = [str(binary)] + self.benchmark_args(file_size_mb, block_size, **options)
+        process = self.run_profiled("Go", cmd, cwd="golang")
+        if process is None:
             return None
-        return json.loads(result.stdout.strip())
+        return {**json.loads(process.stdout.strip()), 'profile': process.profile}
     
-    def run_kotlin_benchmark(self, file_size_mb):
+    def run_kotlin_benchmark(self, file_size_mb, block_size=None, **options):
         """Run Kotlin I/O benchmark"""
-        cmd = ["./gradlew", "run", f"--args={file_size_mb}", "--quiet"]
-        result = subprocess.run(cmd, cwd="kotlin", capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"Kotlin benchmark failed: {result.stderr}")
+        if 'kotlin' in self.workers:
+            return self.workers['kotlin'].request(self.worker_job(file_size_mb, block_size, **options))
+        jar = self.build_cache.artifact('kotlin')
+        if jar is None:
+            return None
+        
+        # Run the cached fat jar directly; it resolves its default ../../data relative to kotlin/app/
+        cmd = ["java", "-jar", str(jar)] + self.benchmark_args(file_size_mb, block_size, **options)
+        process = self.run_profiled("Kotlin", cmd, cwd="kotlin/app")
+        if process is None:
             return None
         
-        # Extract JSON from gradle output
-        lines = result.stdout.split('\n')
+        # Extract the JSON result line from the output
+        lines = process.stdout.split('\n')
         for line in lines:
             line = line.strip()
             if line.startswith('{') and line.endswith('}'):
                 try:
-                    return json.loads(line)
+                    return {**json.loads(line), 'profile': process.profile}
                 except json.JSONDecodeError:
                     continue
         return None
     
-    def run_benchmarks(self):
-        """Run all benchmarks"""
+    def run_python_strategies(self, file_size_mb):
+        """Run every Python copy strategy once, returning one result per strategy"""
+        cmd = (["python3", "python/io_benchmark.py"] +
+               self.benchmark_args(file_size_mb, strategy='all'))
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"Python strategy benchmark failed: {result.stderr}")
+            return []
+        return [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    
+    def rank_python_strategies(self):
+        """Benchmark all Python copy strategies and rank them by write throughput
+        
+        Returns None, without writing a ranking, if every run failed.
+        """
         self.create_test_files()
         
         for size_mb in self.test_file_sizes:
-            print(f"\nBenchmarking {size_mb}MB file...")
+            print(f"\nRanking Python copy strategies on {size_mb}MB file...")
+            self.strategy_results[size_mb] = {}
             
-            # Initialize results for this file size
-            self.results[size_mb] = {
-                'python': {'read': [], 'write': []},
-                'golang': {'read': [], 'write': []},
-                'kotlin': {'read': [], 'write': []}
-            }
-            
-            # Run multiple iterations
             for iteration in range(self.iterations):
                 print(f"  Iteration {iteration + 1}/{self.iterations}")
+                for result in self.run_python_strategies(size_mb):
+                    samples = self.strategy_results[size_mb].setdefault(
+                        result['strategy'], {'read': [], 'write': []})
+                    samples['read'].append(result['read_throughput_mbs'])
+                    samples['write'].append(result['write_throughput_mbs'])
+        
+        if not any(self.strategy_results.values()):
+            print("\nEvery Python strategy run failed; no ranking written")
+            return None
+        
+        ranking = {}
+        for size_mb, strategies in self.strategy_results.items():
+            ranking[size_mb] = sorted(
+                ({'strategy': name,
+                  'write_throughput_mbs': statistics.mean(samples['write']),
+                  'read_throughput_mbs': statistics.mean(samples['read'])}
+                 for name, samples in strategies.items()),
+                key=lambda row: row['write_throughput_mbs'], reverse=True)
+            
+            print(f"\nPython copy strategies ({size_mb}MB):")
+            for rank, row in enumerate(ranking[size_mb], start=1):
+                print(f"  {rank}. {row['strategy']:<16} {row['write_throughput_mbs']:10.1f} MB/s")
+        
+        os.makedirs("results", exist_ok=True)
+        with open('results/python_strategy_ranking.json', 'w') as f:
+            json.dump({'raw_results': self.strategy_results, 'ranking': ranking}, f, indent=2)
+        print("\nStrategy ranking saved to results/python_strategy_ranking.json")
+        return ranking
+    
+    def find_knee(self, block_sizes, throughputs):
+        """Fit throughput against log2(block size) and locate the knee
+        
+        The knee is the smallest measured block size whose fitted throughput
+        is within knee_tolerance of the fitted peak: past it, larger buffers
+        only cost memory.
+        """
+        import numpy as np
+        x = np.log2(block_sizes)
+        y = np.asarray(throughputs, dtype=float)
+        degree = min(3, len(x) - 1)
+        if degree < 1:
+            return {'knee_block_size': block_sizes[0], 'fit': [], 'peak_throughput_mbs': y[0]}
+        
+        coeffs = np.polyfit(x, y, degree)
+        fitted = np.polyval(coeffs, x)
+        peak = fitted.max()
+        knee_index = int(np.argmax(fitted >= (1 - self.knee_tolerance) * peak))
+        return {
+            'knee_block_size': block_sizes[knee_index],
+            'fit': fitted.tolist(),
+            'peak_throughput_mbs': float(peak)
+        }
+    
+    def run_buffer_sweep(self):
+        """Sweep block sizes for every language and report the knee per file size"""
+        self.create_test_files()
+        runners = self.language_runners()
+        knees = {}
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nSweeping block sizes on {size_mb}MB file...")
+            self.sweep_results[size_mb] = {}
+            knees[size_mb] = {}
+            
+            for lang, (label, run) in runners.items():
+                samples = {'read': {}, 'write': {}}
+                for block_size in self.sweep_block_sizes:
+                    for iteration in range(self.iterations):
+                        result = run(size_mb, block_size)
+                        if not result:
+                            print(f"    ✗ {label} failed at {block_size} bytes")
+                            continue
+                        samples['read'].setdefault(block_size, []).append(result['read_throughput_mbs'])
+                        samples['write'].setdefault(block_size, []).append(result['write_throughput_mbs'])
+                self.sweep_results[size_mb][lang] = samples
                 
-                # Python
-                print("    Running Python benchmark...")
-                py_result = self.run_python_benchmark(size_mb)
-                if py_result:
-                    self.results[size_mb]['python']['read'].append(py_result['read_time'])
-                    self.results[size_mb]['python']['write'].append(py_result['write_time'])
-                    print(f"    ✓ Python: read={py_result['read_time']:.3f}s, write={py_result['write_time']:.3f}s")
+                knees[size_mb][lang] = {}
+                for operation, by_block in samples.items():
+                    if not by_block:
+                        continue
+                    block_sizes = sorted(by_block)
+                    means = [statistics.mean(by_block[bs]) for bs in block_sizes]
+                    knee = self.find_knee(block_sizes, means)
+                    knee.update({'block_sizes': block_sizes, 'mean_throughput_mbs': means})
+                    knees[size_mb][lang][operation] = knee
+                    print(f"  {lang:<7} {operation:<5} knee at {knee['knee_block_size'] // 1024}KB "
+                          f"(peak {knee['peak_throughput_mbs']:.1f} MB/s)")
+        
+        self.save_sweep_results(knees)
+        return knees
+    
+    def save_sweep_results(self, knees):
+        """Save buffer sweep samples, fitted curves and knees, and plot them"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/buffer_sweep.json', 'w') as f:
+            json.dump({
+                'raw_results': self.sweep_results,
+                'knees': knees,
+                'test_config': {
+                    'file_sizes_mb': self.test_file_sizes,
+                    'block_sizes': self.sweep_block_sizes,
+                    'iterations': self.iterations,
+                    'knee_tolerance': self.knee_tolerance
+                }
+            }, f, indent=2)
+        
+        if self.plots:
+            plot_buffer_sweep(knees)
+            print("\nSweep results saved to results/buffer_sweep.json and results/buffer_sweep.png")
+        else:
+            print("\nSweep results saved to results/buffer_sweep.json")
+    
+    def run_concurrency_scaling(self):
+        """Measure aggregate Python throughput for N concurrent copies per executor"""
+        self.create_test_files()
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nScaling concurrent copies of {size_mb}MB file...")
+            self.concurrency_results[size_mb] = {}
+            
+            for executor in self.executors:
+                by_level = self.concurrency_results[size_mb][executor] = {}
+                for level in self.concurrency_levels:
+                    samples = by_level[level] = {'read': [], 'write': [],
+                                                 'read_latency': [], 'write_latency': []}
+                    for iteration in range(self.iterations):
+                        result = self.run_python_benchmark(size_mb, concurrency=level, executor=executor)
+                        if not result:
+                            continue
+                        for operation in ['read', 'write']:
+                            samples[operation].append(result[f'{operation}_throughput_mbs'])
+                            samples[f'{operation}_latency'].append(result[f'{operation}_latency']['p50'])
+                    if samples['write']:
+                        print(f"  {executor:<8} N={level:<3} write={statistics.mean(samples['write']):8.1f} MB/s "
+                              f"read={statistics.mean(samples['read']):8.1f} MB/s")
+        
+        self.save_concurrency_results()
+        return self.concurrency_results
+    
+    def save_concurrency_results(self):
+        """Save concurrency samples and plot aggregate throughput against N"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/concurrency_scaling.json', 'w') as f:
+            json.dump({
+                'raw_results': self.concurrency_results,
+                'test_config': {
+                    'file_sizes_mb': self.test_file_sizes,
+                    'concurrency_levels': self.concurrency_levels,
+                    'executors': self.executors,
+                    'iterations': self.iterations
+                }
+            }, f, indent=2)
+        
+        if self.plots:
+            plot_concurrency(self.concurrency_results)
+            print("\nConcurrency results saved to results/concurrency_scaling.json and results/concurrency_scaling.png")
+        else:
+            print("\nConcurrency results saved to results/concurrency_scaling.json")
+    
+    def run_read_modes(self):
+        """Compare Python read paths with a hot and a cold page cache
+        
+        O_DIRECT always bypasses the page cache, so it is only run cold.
+        """
+        self.create_test_files()
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nComparing Python read modes on {size_mb}MB file...")
+            self.read_mode_results[size_mb] = {}
+            
+            for read_mode in self.read_modes:
+                for cache in self.cache_states:
+                    if read_mode == 'direct' and cache == 'hot':
+                        continue
+                    samples = []
+                    for iteration in range(self.iterations):
+                        result = self.run_python_benchmark(size_mb, read_mode=read_mode, cache=cache)
+                        if result:
+                            samples.append(result['read_throughput_mbs'])
+                    if not samples:
+                        print(f"  ✗ {read_mode} ({cache}) failed")
+                        continue
+                    self.read_mode_results[size_mb][f"{read_mode}/{cache}"] = {
+                        'read_mode': read_mode,
+                        'cache': cache,
+                        'read_throughput_mbs': samples,
+                        'mean_read_throughput_mbs': statistics.mean(samples)
+                    }
+                    print(f"  {read_mode:<7} {cache:<5} {statistics.mean(samples):10.1f} MB/s")
+        
+        os.makedirs("results", exist_ok=True)
+        with open('results/python_read_modes.json', 'w') as f:
+            json.dump(self.read_mode_results, f, indent=2)
+        print("\nRead mode results saved to results/python_read_modes.json")
+        return self.read_mode_results
+    
+    def run_latency(self):
+        """Time every read()/write() call in each language and report tail latencies
+        
+        Each run returns its own p50/p99/p99.9/max; across iterations the
+        percentiles are summarised by their median and max by its maximum.
+        """
+        self.create_test_files()
+        runners = self.language_runners()
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nMeasuring per-call latency on {size_mb}MB file...")
+            self.latency_results[size_mb] = {}
+            
+            for lang, (label, run) in runners.items():
+                runs = {'read': [], 'write': []}
+                for iteration in range(self.iterations):
+                    result = run(size_mb, latency=True)
+                    if result and result.get('latency'):
+                        for operation in runs:
+                            runs[operation].append(result['latency'][operation])
+                if not runs['read']:
+                    print(f"  ✗ {label} failed")
+                    continue
+                self.latency_results[size_mb][lang] = {
+                    operation: {
+                        'runs': summaries,
+                        'p50_us': statistics.median(r['p50_us'] for r in summaries),
+                        'p99_us': statistics.median(r['p99_us'] for r in summaries),
+                        'p999_us': statistics.median(r['p999_us'] for r in summaries),
+                        'max_us': max(r['max_us'] for r in summaries)
+                    }
+                    for operation, summaries in runs.items()
+                }
+                for operation, summary in self.latency_results[size_mb][lang].items():
+                    print(f"  {label:<7} {operation:<5} p50={summary['p50_us']:8.1f}us "
+                          f"p99={summary['p99_us']:8.1f}us p99.9={summary['p999_us']:8.1f}us "
+                          f"max={summary['max_us']:9.1f}us")
+        
+        self.save_latency_results()
+        return self.latency_results
+    
+    def save_latency_results(self):
+        """Save latency percentiles and plot them for each file size"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/latency_results.json', 'w') as f:
+            json.dump({
+                'raw_results': self.latency_results,
+                'test_config': {
+                    'file_sizes_mb': self.test_file_sizes,
+                    'iterations': self.iterations
+                }
+            }, f, indent=2)
+        
+        if self.plots:
+            plot_latency(self.latency_results)
+            print("\nLatency results saved to results/latency_results.json and results/latency_percentiles.png")
+        else:
+            print("\nLatency results saved to results/latency_results.json")
+    
+    def run_random_access(self):
+        """Measure random-access IOPS per language, access pattern and queue depth"""
+        self.create_test_files()
+        runners = self.language_runners()
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nRandom access on {size_mb}MB file ({self.random_block_size}B blocks)...")
+            self.random_results[size_mb] = {}
+            
+            for pattern in self.random_patterns:
+                by_lang = self.random_results[size_mb][pattern] = {}
+                for lang, (label, run) in runners.items():
+                    by_depth = {}
+                    for depth in self.random_queue_depths:
+                        samples = {'read_iops': [], 'write_iops': []}
+                        for iteration in range(self.iterations):
+                            result = run(size_mb, self.random_block_size, pattern=pattern, queue_depth=depth)
+                            if result:
+                                samples['read_iops'].append(result['read_iops'])
+                                samples['write_iops'].append(result['write_iops'])
+                        if samples['read_iops']:
+                            by_depth[depth] = samples
+                            print(f"  {pattern:<8} {label:<7} QD={depth:<3} "
+                                  f"read={statistics.mean(samples['read_iops']):10.0f} IOPS "
+                                  f"write={statistics.mean(samples['write_iops']):10.0f} IOPS")
+                    if by_depth:
+                        by_lang[lang] = by_depth
+                    else:
+                        print(f"  ✗ {label} failed")
+        
+        self.save_random_results()
+        return self.random_results
+    
+    def save_random_results(self):
+        """Save random-access samples and plot IOPS against queue depth"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/random_access.json', 'w') as f:
+            json.dump({
+                'raw_results': self.random_results,
+                'test_config': {
+                    'file_sizes_mb': self.test_file_sizes,
+                    'patterns': self.random_patterns,
+                    'queue_depths': self.random_queue_depths,
+                    'block_size': self.random_block_size,
+                    'iterations': self.iterations
+                }
+            }, f, indent=2)
+        
+        if self.plots:
+            plot_random_access(self.random_results)
+            print("\nRandom-access results saved to results/random_access.json and results/random_access.png")
+        else:
+            print("\nRandom-access results saved to results/random_access.json")
+    
+    def large_sizes_that_fit(self, directory):
+        """The large sizes (in MB) whose files and one copy fit on the disk
+        
+        Sizes are taken smallest first, counting the files still to be
+        generated, the largest copy written at any one time and
+        large_reserve_mb; the first size that does not fit, and every
+        larger one, is skipped.
+        """
+        sizes_mb, to_generate = [], 0
+        for size_gb in sorted(self.large_sizes_gb):
+            size_mb = size_gb * 1024
+            exists = (directory / f"test_{size_mb}mb.txt").exists()
+            needed = to_generate + (0 if exists else size_mb) + size_mb
+            try:
+                check_free_space(directory, needed * MB, self.large_reserve_mb * MB)
+            except OSError as e:
+                print(f"Skipping {size_gb}GB and larger: {e.strerror}")
+                break
+            sizes_mb.append(size_mb)
+            to_generate += 0 if exists else size_mb
+        return sizes_mb
+    
+    def run_large_files(self):
+        """Copy and read 1-64GB files per language, with throughput per time window
+        
+        Files this large outgrow the page cache, so windowed throughput
+        shows when writeback or cache exhaustion sets in. Each run records
+        the file size as a ratio of RAM.
+        """
+        directory = self.workload_generator.directory(self.workload)
+        directory.mkdir(parents=True, exist_ok=True)
+        sizes_mb = self.large_sizes_that_fit(directory)
+        if not sizes_mb:
+            print("No large file size fits on the disk")
+            return self.large_results
+        print("Creating test files...")
+        self.data_dir = str(self.workload_generator.generate(self.workload, sizes_mb).resolve())
+        ram = total_memory_bytes()
+        runners = self.language_runners()
+        
+        for size_mb in sizes_mb:
+            ram_ratio = size_mb * MB / ram if ram else None
+            ram_label = f", {ram_ratio:.2f}x RAM" if ram_ratio else ""
+            print(f"\nLarge file {size_mb // 1024}GB{ram_label}, {self.window_ms}ms windows...")
+            self.large_results[size_mb] = {}
+            for lang, (label, run) in runners.items():
+                runs = []
+                for iteration in range(self.iterations):
+                    result = run(size_mb, window_ms=self.window_ms)
+                    if not result:
+                        continue
+                    runs.append({
+                        'write_throughput_mbs': result['write_throughput_mbs'],
+                        'read_throughput_mbs': result['read_throughput_mbs'],
+                        'ram_ratio': ram_ratio,
+                        'windows': result.get('windows'),
+                        'profile': result.get('profile')
+                    })
+                    lowest = {operation: min((w['throughput_mbs'] for w in windows), default=0)
+                              for operation, windows in (result.get('windows') or {}).items()}
+                    print(f"  {label:<7} write={result['write_throughput_mbs']:8.1f} MB/s "
+                          f"(lowest window {lowest.get('write', 0):8.1f}) "
+                          f"read={result['read_throughput_mbs']:8.1f} MB/s "
+                          f"(lowest window {lowest.get('read', 0):8.1f})")
+                if runs:
+                    self.large_results[size_mb][lang] = runs
                 else:
-                    print("    ✗ Python benchmark failed")
+                    print(f"  ✗ {label} failed")
+        
+        self.save_large_results(ram)
+        return self.large_results
+    
+    def save_large_results(self, ram):
+        """Save large-file runs and plot their windowed throughput"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/large_files.json', 'w') as f:
+            json.dump({
+                'raw_results': self.large_results,
+                'test_config': {
+                    'file_sizes_mb': list(self.large_results),
+                    'window_ms': self.window_ms,
+                    'total_memory_bytes': ram,
+                    'data_dir': self.data_dir,
+                    'iterations': self.iterations
+                }
+            }, f, indent=2)
+        
+        if self.plots and any(self.large_results.values()):
+            plot_large_files(self.large_results)
+            print("\nLarge-file results saved to results/large_files.json and results/large_files.png")
+        else:
+            print("\nLarge-file results saved to results/large_files.json")
+    
+    def run_metadata(self):
+        """Measure metadata operations per second per language, serially and on a thread pool
+        
+        Each run creates, stats, opens, traverses and unlinks
+        metadata_files empty files, metadata_files_per_dir to a directory,
+        then copies and deletes the tree of the small_files workload at
+        each size.
+        """
+        spec = WorkloadSpec('small_files', self.workload.seed)
+        data_dir = str(self.workload_generator.generate(spec, self.test_file_sizes).resolve())
+        runners = self.language_runners()
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nMetadata operations on {self.metadata_files} files, {size_mb}MB tree...")
+            self.metadata_results[size_mb] = {}
+            for threads in self.metadata_threads:
+                by_lang = self.metadata_results[size_mb][threads] = {}
+                for lang, (label, run) in runners.items():
+                    samples = {'operations': {}, 'copy_tree_throughput_mbs': []}
+                    for iteration in range(self.iterations):
+                        result = run(size_mb, metadata=True, files=self.metadata_files,
+                                     files_per_dir=self.metadata_files_per_dir, threads=threads,
+                                     data_dir=data_dir)
+                        if result:
+                            for operation, measured in result['operations'].items():
+                                samples['operations'].setdefault(operation, []).append(measured['ops_per_sec'])
+                            samples['copy_tree_throughput_mbs'].append(result['copy_tree_throughput_mbs'])
+                    if not samples['copy_tree_throughput_mbs']:
+                        print(f"  ✗ {label} failed")
+                        continue
+                    by_lang[lang] = samples
+                    summary = " ".join(f"{operation}={statistics.mean(values):,.0f}"
+                                       for operation, values in samples['operations'].items())
+                    print(f"  {label:<7} threads={threads:<3} {summary} ops/s")
+        
+        self.save_metadata_results()
+        return self.metadata_results
+    
+    def save_metadata_results(self):
+        """Save metadata samples and plot operations per second"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/metadata_results.json', 'w') as f:
+            json.dump({
+                'raw_results': self.metadata_results,
+                'test_config': {
+                    'file_sizes_mb': self.test_file_sizes,
+                    'files': self.metadata_files,
+                    'files_per_dir': self.metadata_files_per_dir,
+                    'threads': self.metadata_threads,
+                    'iterations': self.iterations
+                }
+            }, f, indent=2)
+        
+        if self.plots:
+            plot_metadata(self.metadata_results)
+            print("\nMetadata results saved to results/metadata_results.json and results/metadata_ops.png")
+        else:
+            print("\nMetadata results saved to results/metadata_results.json")
+    
+    def run_pipeline(self):
+        """Compare the asyncio pipeline engine at each queue depth against the synchronous loop
+        
+        Both engines copy and read with the same pread/pwrite calls, with a
+        hot and a cold page cache; the cold runs show what overlap buys on
+        the device the data directory lives on.
+        """
+        self.create_test_files()
+        
+        def measure(size_mb, **options):
+            samples = {'read_throughput_mbs': [], 'write_throughput_mbs': []}
+            for iteration in range(self.iterations):
+                result = self.run_python_benchmark(size_mb, self.pipeline_block_size, **options)
+                if result:
+                    for key in samples:
+                        samples[key].append(result[key])
+            return samples if samples['read_throughput_mbs'] else None
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nPipelined copy of {size_mb}MB file ({self.pipeline_block_size // 1024}KB blocks)...")
+            self.pipeline_results[size_mb] = {}
+            for cache in self.cache_states:
+                by_engine = self.pipeline_results[size_mb][cache] = {}
+                runs = [('sync', None)] + [('asyncio', depth) for depth in self.pipeline_queue_depths]
+                for engine, depth in runs:
+                    samples = measure(size_mb, pipeline=engine, queue_depth=depth, cache=cache)
+                    label = f"{engine} QD={depth}" if depth else engine
+                    if samples is None:
+                        print(f"  ✗ {label} ({cache}) failed")
+                        continue
+                    if depth:
+                        by_engine.setdefault('asyncio', {})[depth] = samples
+                    else:
+                        by_engine['sync'] = samples
+                    print(f"  {cache:<4} {label:<14} write={statistics.mean(samples['write_throughput_mbs']):8.1f} MB/s "
+                          f"read={statistics.mean(samples['read_throughput_mbs']):8.1f} MB/s")
+        
+        self.save_pipeline_results()
+        return self.pipeline_results
+    
+    def save_pipeline_results(self):
+        """Save pipeline samples and plot throughput against queue depth"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/pipeline_results.json', 'w') as f:
+            json.dump({
+                'raw_results': self.pipeline_results,
+                'test_config': {
+                    'file_sizes_mb': self.test_file_sizes,
+                    'queue_depths': self.pipeline_queue_depths,
+                    'block_size': self.pipeline_block_size,
+                    'data_dir': self.data_dir,
+                    'iterations': self.iterations
+                }
+            }, f, indent=2)
+        
+        if self.plots:
+            plot_pipeline(self.pipeline_results)
+            print("\nPipeline results saved to results/pipeline_results.json and results/pipeline_depth.png")
+        else:
+            print("\nPipeline results saved to results/pipeline_results.json")
+    
+    def run_parsing(self):
+        """Measure Python read-and-parse throughput in records per second
+        
+        Each parser reads the workload it understands (text, CSV, JSON lines
+        or binary records), generated with the selected workload's seed.
+        """
+        data_dirs = {}
+        for workload in sorted(set(self.parsers.values())):
+            spec = WorkloadSpec(workload, self.workload.seed)
+            data_dirs[workload] = str(self.workload_generator.generate(spec, self.test_file_sizes).resolve())
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nParsing {size_mb}MB files...")
+            self.parse_results[size_mb] = {}
+            
+            for parser, workload in self.parsers.items():
+                samples = {'records_per_sec': [], 'read_throughput_mbs': []}
+                for iteration in range(self.iterations):
+                    result = self.run_python_benchmark(size_mb, parser=parser, data_dir=data_dirs[workload])
+                    if result:
+                        samples['records_per_sec'].append(result['records_per_sec'])
+                        samples['read_throughput_mbs'].append(result['read_throughput_mbs'])
+                if not samples['records_per_sec']:
+                    print(f"  ✗ {parser} failed")
+                    continue
+                self.parse_results[size_mb][parser] = {'workload': workload, **samples}
+                print(f"  {parser:<17} {statistics.mean(samples['records_per_sec']):14,.0f} records/s "
+                      f"{statistics.mean(samples['read_throughput_mbs']):9.1f} MB/s")
+        
+        self.save_parse_results()
+        return self.parse_results
+    
+    def save_parse_results(self):
+        """Save parsing samples and plot records per second per parser"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/parsing_results.json', 'w') as f:
+            json.dump({
+                'raw_results': self.parse_results,
+                'test_config': {
+                    'file_sizes_mb': self.test_file_sizes,
+                    'parsers': self.parsers,
+                    'seed': self.workload.seed,
+                    'iterations': self.iterations
+                }
+            }, f, indent=2)
+        
+        if self.plots:
+            plot_parsing(self.parse_results, self.parsers)
+            print("\nParsing results saved to results/parsing_results.json and results/parsing_throughput.png")
+        else:
+            print("\nParsing results saved to results/parsing_results.json")
+    
+    def run_compression(self):
+        """Measure Python compress-on-write / decompress-on-read against a plain copy
+        
+        Throughputs are logical MB/s, so a codec whose write throughput falls
+        below the plain copy's is where compression becomes the bottleneck.
+        """
+        spec = WorkloadSpec(self.compression_workload, self.workload.seed)
+        data_dir = str(self.workload_generator.generate(spec, self.test_file_sizes).resolve())
+        
+        for size_mb in self.test_file_sizes:
+            print(f"\nCompressing {size_mb}MB {self.compression_workload} file...")
+            by_codec = self.compression_results[size_mb] = {}
+            
+            baseline = [self.run_python_benchmark(size_mb, data_dir=data_dir) for _ in range(self.iterations)]
+            baseline = [result for result in baseline if result]
+            if baseline:
+                by_codec['baseline'] = {
+                    'read_throughput_mbs': [r['read_throughput_mbs'] for r in baseline],
+                    'write_throughput_mbs': [r['write_throughput_mbs'] for r in baseline]
+                }
+                print(f"  {'plain copy':<18} write={statistics.mean(by_codec['baseline']['write_throughput_mbs']):8.1f} MB/s "
+                      f"read={statistics.mean(by_codec['baseline']['read_throughput_mbs']):8.1f} MB/s")
+            
+            for codec, levels in self.compression_levels.items():
+                for level in levels:
+                    samples = {'codec': codec, 'level': level, 'compression_ratio': None,
+                               'read_throughput_mbs': [], 'write_throughput_mbs': [],
+                               'read_cpu_time': [], 'write_cpu_time': []}
+                    for iteration in range(self.iterations):
+                        result = self.run_python_benchmark(size_mb, codec=codec, level=level, data_dir=data_dir)
+                        if not result:
+                            continue
+                        samples['compression_ratio'] = result['compression_ratio']
+                        for key in ['read_throughput_mbs', 'write_throughput_mbs', 'read_cpu_time', 'write_cpu_time']:
+                            samples[key].append(result[key])
+                    if not samples['write_throughput_mbs']:
+                        print(f"  ✗ {codec} level {level} failed")
+                        continue
+                    by_codec[f"{codec}/{level}"] = samples
+                    print(f"  {codec + ' -' + str(level):<18} write={statistics.mean(samples['write_throughput_mbs']):8.1f} MB/s "
+                          f"read={statistics.mean(samples['read_throughput_mbs']):8.1f} MB/s "
+                          f"ratio={samples['compression_ratio']:5.2f} "
+                          f"cpu={statistics.mean(samples['write_cpu_time']):.2f}s")
+        
+        self.save_compression_results()
+        return self.compression_results
+    
+    def save_compression_results(self):
+        """Save compression samples and plot logical throughput against ratio"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/compression_results.json', 'w') as f:
+            json.dump({
+                'raw_results': self.compression_results,
+                'test_config': {
+                    'file_sizes_mb': self.test_file_sizes,
+                    'workload': self.compression_workload,
+                    'levels': self.compression_levels,
+                    'iterations': self.iterations
+                }
+            }, f, indent=2)
+        
+        if self.plots:
+            plot_compression(self.compression_results, list(self.compression_levels))
+            print("\nCompression results saved to results/compression_results.json and results/compression_tradeoff.png")
+        else:
+            print("\nCompression results saved to results/compression_results.json")
+    
+    def run_matrix(self, jobs, resume=False):
+        """Run expanded matrix jobs (benchmark_matrix.expand), logging each as it finishes
+        
+        With resume, jobs whose key is already in results/matrix_log.jsonl are
+        loaded instead of run, so a partially completed matrix picks up
+        where it stopped; a filtered run can resume into the same log. Keys
+        include the workload, seed and run options, so logged runs of
+        another configuration are neither skipped nor loaded.
+        """
+        self.create_test_files()
+        runners = self.language_runners()
+        done = set()
+        if resume:
+            keys = {job.key for job in jobs}
+            for record in self.matrix_log.records():
+                if record.get('type') == 'matrix' and record['key'] in keys:
+                    self.add_matrix_sample(record['case'], record['job'], record['result'])
+                    done.add(record['key'])
+            print(f"Resuming: {len(done)} completed matrix jobs loaded from {self.matrix_log.path}")
+        
+        pending = [job for job in jobs if job.key not in done]
+        print(f"Running {len(pending)} of {len(jobs)} matrix jobs")
+        self.matrix_log.open(resume=resume)
+        try:
+            for index, job in enumerate(pending, 1):
+                label, run = runners[job.language]
+                result = run(job.size_mb, job.block_size, **{**self.run_options, **job.options()})
+                if not result:
+                    print(f"  [{index}/{len(pending)}] ✗ {job.key} failed")
+                    continue
+                fields = {'language': job.language, 'size_mb': job.size_mb, 'block_size': job.block_size,
+                          'strategy': job.strategy, 'concurrency': job.concurrency}
+                self.add_matrix_sample(job.case, fields, result)
+                self.matrix_log.append({'type': 'matrix', 'key': job.key, 'case': job.case,
+                                        'job': fields, 'result': result})
+                print(f"  [{index}/{len(pending)}] ✓ {job.key}: read={result['read_throughput_mbs']:.1f} MB/s, "
+                      f"write={result['write_throughput_mbs']:.1f} MB/s")
+        finally:
+            self.matrix_log.close()
+        
+        self.save_matrix_results()
+        return self.matrix_results
+    
+    def add_matrix_sample(self, case, fields, result):
+        samples = self.matrix_results.setdefault(
+            case, {**fields, 'read_throughput_mbs': [], 'write_throughput_mbs': []})
+        for key in ['read_throughput_mbs', 'write_throughput_mbs']:
+            samples[key].append(result[key])
+    
+    def save_matrix_results(self):
+        """Save matrix samples and a per-case summary table"""
+        os.makedirs("results", exist_ok=True)
+        with open('results/matrix_results.json', 'w') as f:
+            json.dump({'raw_results': self.matrix_results, 'log': self.matrix_log.path}, f, indent=2)
+        
+        rows = []
+        for case, samples in self.matrix_results.items():
+            row = {'case': case, **{key: value for key, value in samples.items()
+                                    if not key.endswith('_throughput_mbs')},
+                   'samples': len(samples['read_throughput_mbs'])}
+            for operation in ['read', 'write']:
+                values = samples[f'{operation}_throughput_mbs']
+                row[f'{operation}_mean_mbs'] = statistics.mean(values)
+                row[f'{operation}_median_mbs'] = statistics.median(values)
+            rows.append(row)
+        write_csv(rows, 'results/matrix_summary.csv')
+        print("\nMatrix results saved to results/matrix_results.json and results/matrix_summary.csv")
+    
+    def new_samples(self):
+        """Accumulators for one language at one file size"""
+        return {'read': SampleStats(), 'write': SampleStats()}
+    
+    def add_samples(self, size_mb, lang, result, outliers=None):
+        """Fold one result's timings into the accumulators
+        
+        With reject_outliers, a timing that is a MAD outlier against the
+        samples so far is counted but not accumulated. Returns the rejected
+        operations; pass outliers to replay a logged decision instead.
+        """
+        samples = self.results[size_mb][lang]
+        timings = {'read': result['read_time'], 'write': result['write_time']}
+        if result.get('durable_time') is not None:
+            timings['durable'] = result['durable_time']
+        if outliers is None:
+            outliers = [operation for operation, value in timings.items()
+                        if self.reject_outliers and operation in samples
+                        and samples[operation].is_outlier(value)]
+        
+        for operation, value in timings.items():
+            accumulator = samples.setdefault(operation, SampleStats())
+            if operation in outliers:
+                accumulator.reject()
+            else:
+                accumulator.add(value)
+        
+        if result.get('profile'):
+            profile = self.profiles.setdefault(size_mb, {}).setdefault(lang, {})
+            for metric, value in flatten_profile(result['profile']).items():
+                profile.setdefault(metric, SampleStats()).add(value)
+        return outliers
+    
+    def record_result(self, size_mb, lang, iteration, result):
+        """Fold one result into the accumulators and append it to the log"""
+        outliers = self.add_samples(size_mb, lang, result)
+        if self.result_log.file is not None:
+            self.result_log.append({'type': 'sample', 'file_size_mb': size_mb, 'language': lang,
+                                    'iteration': iteration, 'outliers': outliers, 'result': result})
+        return outliers
+    
+    def converged(self, size_mb, lang):
+        """Whether the read and write means are known to within target_ci"""
+        samples = self.results[size_mb][lang]
+        return all(samples[operation].relative_ci_width() <= self.target_ci
+                   for operation in ['read', 'write'])
+    
+    def resume_from_log(self):
+        """Replay a previous run's log, returning the (size, language, iteration) already done"""
+        completed = set()
+        for record in self.result_log.records():
+            if record.get('type') != 'sample':
+                continue
+            size_mb, lang = record['file_size_mb'], record['language']
+            if size_mb not in self.results:
+                self.results[size_mb] = {name: self.new_samples() for name in self.languages}
+            self.results[size_mb].setdefault(lang, self.new_samples())
+            self.add_samples(size_mb, lang, record['result'], record.get('outliers', []))
+            completed.add((size_mb, lang, record['iteration']))
+        print(f"Resuming: {len(completed)} completed runs loaded from {self.result_log.path}")
+        return completed
+    
+    def language_runners(self):
+        """Display name and run_*_benchmark method for each selected language"""
+        runners = {
+            'python': ('Python', self.run_python_benchmark),
+            'golang': ('Go', self.run_golang_benchmark),
+            'kotlin': ('Kotlin', self.run_kotlin_benchmark)
+        }
+        return {lang: runners[lang] for lang in self.languages}
+    
+    def log_config(self):
+        self.result_log.append({'type': 'config', 'file_sizes_mb': self.test_file_sizes,
+                                'workload': self.workload.to_dict(),
+                                'iterations': self.iterations, 'options': self.run_options,
+                                'warmup_runs': self.warmup_runs, 'adaptive': self.adaptive,
+                                'target_ci': self.target_ci, 'time_budget': self.time_budget,
+                                'reject_outliers': self.reject_outliers})
+    
+    def run_scheduled(self, resume=False):
+        """Run every (size, language, iteration) as an independent job through self.scheduler
+        
+        Jobs run concurrently on disjoint CPU sets (or one at a time in
+        exclusive mode), in a shuffled order so that no language or size
+        always runs first, with the machine coldest. Warmup runs are
+        scheduled the same way before the measured ones. Results are logged
+        as they complete, tagged with the CPUs the job was pinned to; resume
+        skips iterations already in the log. Adaptive iteration is not
+        supported here.
+        """
+        self.create_test_files()
+        completed = self.resume_from_log() if resume else set()
+        self.result_log.open(resume=resume)
+        if not resume:
+            self.log_config()
+        runners = self.language_runners()
+        # Build once up front rather than from several jobs at the same time
+        for lang in ['golang', 'kotlin']:
+            self.build_cache.artifact(lang)
+        
+        def job(size_mb, lang, iteration):
+            run = runners[lang][1]
+            return Job((size_mb, lang, iteration),
+                       lambda data_dir: run(size_mb, data_dir=data_dir, **self.run_options),
+                       [os.path.join(self.data_dir, f"test_{size_mb}mb.txt")])
+        
+        for size_mb in self.test_file_sizes:
+            if size_mb not in self.results:
+                self.results[size_mb] = {lang: self.new_samples() for lang in self.languages}
+        warmups = [job(size_mb, lang, None) for size_mb in self.test_file_sizes
+                   for lang in runners for _ in range(self.warmup_runs)]
+        measured = [job(size_mb, lang, iteration) for size_mb in self.test_file_sizes
+                    for lang in runners for iteration in range(self.iterations)
+                    if (size_mb, lang, iteration) not in completed]
+        cpu_sets = self.scheduler.cpu_sets()
+        print(f"Scheduling {len(measured)} runs ({len(warmups)} warmups), "
+              f"{len(cpu_sets)} at a time on CPU sets {cpu_sets}")
+        
+        try:
+            for _ in self.scheduler.run(warmups):
+                pass
+            for done, cpus, result in self.scheduler.run(measured):
+                size_mb, lang, iteration = done.key
+                label = runners[lang][0]
+                if not result:
+                    print(f"  ✗ {label} {size_mb}MB #{iteration + 1} failed")
+                    continue
+                result['cpus'] = cpus
+                outliers = self.record_result(size_mb, lang, iteration, result)
+                flag = f" (outlier: {', '.join(outliers)})" if outliers else ""
+                print(f"  ✓ {label} {size_mb}MB #{iteration + 1} on CPUs {cpus}: "
+                      f"read={result['read_time']:.3f}s, write={result['write_time']:.3f}s{flag}")
+        finally:
+            self.result_log.close()
+    
+    def run_benchmarks(self, resume=False):
+        """Run all benchmarks, streaming every result to the result log
+        
+        Each language first gets warmup_runs unrecorded runs per file size.
+        In adaptive mode, languages keep iterating until the 95% confidence
+        intervals on their read and write means are within target_ci of the
+        mean, max_iterations is reached, or time_budget (seconds per file
+        size) runs out; otherwise exactly `iterations` runs are made.
+        
+        With resume, results already in the log are loaded into the
+        accumulators and those iterations are skipped.
+        """
+        self.create_test_files()
+        completed = self.resume_from_log() if resume else set()
+        self.result_log.open(resume=resume)
+        if not resume:
+            self.log_config()
+        runners = self.language_runners()
+        
+        try:
+            for size_mb in self.test_file_sizes:
+                print(f"\nBenchmarking {size_mb}MB file...")
                 
-                # Go
-                print("    Running Go benchmark...")
-                go_result = self.run_golang_benchmark(size_mb)
-                if go_result:
-                    self.results[size_mb]['golang']['read'].append(go_result['read_time'])
-                    self.results[size_mb]['golang']['write'].append(go_result['write_time'])
-                    print(f"    ✓ Go: read={go_result['read_time']:.3f}s, write={go_result['write_time']:.3f}s")
-                else:
-                    print("    ✗ Go benchmark failed")
+                # Initialize accumulators for this file size
+                if size_mb not in self.results:
+                    self.results[size_mb] = {lang: self.new_samples() for lang in self.languages}
                 
-                # Kotlin
-                print("    Running Kotlin benchmark...")
-                kt_result = self.run_kotlin_benchmark(size_mb)
-                if kt_result:
-                    self.results[size_mb]['kotlin']['read'].append(kt_result['read_time'])
-                    self.results[size_mb]['kotlin']['write'].append(kt_result['write_time'])
-                    print(f"    ✓ Kotlin: read={kt_result['read_time']:.3f}s, write={kt_result['write_time']:.3f}s")
-                else:
-                    print("    ✗ Kotlin benchmark failed")
+                # Warm up caches, allocators and JITs without recording
+                for lang, (label, run) in runners.items():
+                    for _ in range(self.warmup_runs):
+                        print(f"    Warming up {label}...")
+                        run(size_mb, **self.run_options)
+                
+                active = list(runners)
+                deadline = time.monotonic() + self.time_budget
+                iteration = 0
+                while active:
+                    if self.adaptive:
+                        if iteration >= self.max_iterations or time.monotonic() > deadline:
+                            break
+                        print(f"  Iteration {iteration + 1} ({len(active)} languages not converged)")
+                    else:
+                        if iteration >= self.iterations:
+                            break
+                        print(f"  Iteration {iteration + 1}/{self.iterations}")
+                    
+                    for lang in active:
+                        label, run = runners[lang]
+                        if (size_mb, lang, iteration) in completed:
+                            print(f"    - {label}: already in log")
+                            continue
+                        print(f"    Running {label} benchmark...")
+                        result = run(size_mb, **self.run_options)
+                        if result:
+                            outliers = self.record_result(size_mb, lang, iteration, result)
+                            flag = f" (outlier: {', '.join(outliers)})" if outliers else ""
+                            profile = result.get('profile') or {}
+                            usage = (f", cpu={profile['user_time'] + profile['system_time']:.3f}s, "
+                                     f"rss={profile['max_rss_kb'] / 1024:.0f}MB"
+                                     if profile.get('max_rss_kb') is not None else "")
+                            print(f"    ✓ {label}: read={result['read_time']:.3f}s, "
+                                  f"write={result['write_time']:.3f}s{usage}{flag}")
+                        else:
+                            print(f"    ✗ {label} benchmark failed")
+                    iteration += 1
+                    
+                    # Stop languages that converged, or that never produce results
+                    if self.adaptive and iteration >= self.min_iterations:
+                        active = [lang for lang in active
+                                  if self.results[size_mb][lang]['read'].count
+                                  and not self.converged(size_mb, lang)]
+                
+                if self.adaptive:
+                    for lang in runners:
+                        samples = self.results[size_mb][lang]
+                        if samples['read'].count:
+                            print(f"  {lang}: {samples['read'].count} samples, 95% CI "
+                                  f"±{samples['read'].relative_ci_width():.1%} read, "
+                                  f"±{samples['write'].relative_ci_width():.1%} write")
+        finally:
+            self.result_log.close()
     
     def calculate_stats(self):
-        """Calculate statistics from benchmark results"""
+        """Calculate statistics from the streaming accumulators"""
         stats = {}
         
         for size_mb in self.test_file_sizes:
             stats[size_mb] = {}
             
-            for lang in ['python', 'golang', 'kotlin']:
+            for lang in self.languages:
                 stats[size_mb][lang] = {}
                 
-                for operation in ['read', 'write']:
-                    times = self.results[size_mb][lang][operation]
-                    if times:
-                        stats[size_mb][lang][operation] = {
-                            'mean': statistics.mean(times),
-                            'median': statistics.median(times),
-                            'min': min(times),
-                            'max': max(times),
-                            'std': statistics.stdev(times) if len(times) > 1 else 0
-                        }
-                        print(f"Stats for {lang} {operation} ({size_mb}MB): {len(times)} samples, mean={statistics.mean(times):.3f}s")
+                for operation, samples in self.results[size_mb][lang].items():
+                    if samples.count:
+                        stats[size_mb][lang][operation] = samples.summary()
+                        print(f"Stats for {lang} {operation} ({size_mb}MB): {samples.count} samples, "
+                              f"mean={samples.running.mean:.3f}s")
                     else:
                         print(f"No data for {lang} {operation} ({size_mb}MB)")
+            
+            self.add_ratio_intervals(size_mb, stats[size_mb])
         
         return stats
     
+    def add_ratio_intervals(self, size_mb, size_stats):
+        """Attach bootstrap 95% intervals on each language's speed ratio to the baseline
+        
+        The ratio is baseline mean time / language mean time, as plotted in
+        create_visualizations (above 1.0 means faster than the baseline).
+        """
+        if self.baseline_lang not in self.results[size_mb]:
+            return
+        baseline = self.results[size_mb][self.baseline_lang]
+        for lang in self.languages:
+            for operation, summary in size_stats[lang].items():
+                if operation not in baseline:
+                    continue
+                interval = bootstrap_ratio_ci(baseline[operation].samples,
+                                              self.results[size_mb][lang][operation].samples)
+                if interval:
+                    ratio, low, high = interval
+                    summary[f'ratio_vs_{self.baseline_lang}'] = {
+                        'ratio': ratio, 'ci95_low': low, 'ci95_high': high}
+    
+    def profile_stats(self):
+        """Mean, median and spread of every resource metric per size and language"""
+        return {size_mb: {lang: {metric: samples.summary() for metric, samples in metrics.items()}
+                          for lang, metrics in by_lang.items()}
+                for size_mb, by_lang in self.profiles.items()}
+    
     def create_visualizations(self, stats):
         """Create performance comparison charts"""
-        # Create results directory
-        os.makedirs("results", exist_ok=True)
-        
-        # Prepare data for plotting
-        languages = ['python', 'golang', 'kotlin']
-        operations = ['read', 'write']
-        
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        fig.suptitle('I/O Performance Comparison: Python vs Go vs Kotlin', fontsize=16)
-        
-        # Read performance by file size
-        ax1 = axes[0, 0]
-        for lang in languages:
-            read_times = [stats[size][lang]['read']['mean'] for size in self.test_file_sizes 
-                         if lang in stats[size] and 'read' in stats[size][lang]]
-            ax1.plot(self.test_file_sizes[:len(read_times)], read_times, 
-                    marker='o', label=lang.capitalize(), linewidth=2)
-        
-        ax1.set_xlabel('File Size (MB)')
-        ax1.set_ylabel('Time (seconds)')
-        ax1.set_title('Read Performance')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        
-        # Write performance by file size
-        ax2 = axes[0, 1]
-        for lang in languages:
-            write_times = [stats[size][lang]['write']['mean'] for size in self.test_file_sizes 
-                          if lang in stats[size] and 'write' in stats[size][lang]]
-            ax2.plot(self.test_file_sizes[:len(write_times)], write_times, 
-                    marker='s', label=lang.capitalize(), linewidth=2)
-        
-        ax2.set_xlabel('File Size (MB)')
-        ax2.set_ylabel('Time (seconds)')
-        ax2.set_title('Write Performance')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        # Throughput comparison (MB/s) for largest file
-        ax3 = axes[1, 0]
-        largest_file = max(self.test_file_sizes)
-        read_throughput = []
-        write_throughput = []
-        lang_labels = []
-        
-        for lang in languages:
-            if (lang in stats[largest_file] and 
-                'read' in stats[largest_file][lang] and 
-                'write' in stats[largest_file][lang] and
-                stats[largest_file][lang]['read'] and
-                stats[largest_file][lang]['write']):
-                
-                read_time = stats[largest_file][lang]['read']['mean']
-                write_time = stats[largest_file][lang]['write']['mean']
-                
-                read_throughput.append(largest_file / read_time)
-                write_throughput.append(largest_file / write_time)
-                lang_labels.append(lang.capitalize())
-        
-        if lang_labels:  # Only create chart if we have data
-            x = range(len(lang_labels))
-            width = 0.35
-            
-            ax3.bar([i - width/2 for i in x], read_throughput, width, label='Read', alpha=0.8)
-            ax3.bar([i + width/2 for i in x], write_throughput, width, label='Write', alpha=0.8)
-            
-            ax3.set_xlabel('Language')
-            ax3.set_ylabel('Throughput (MB/s)')
-            ax3.set_title(f'Throughput Comparison ({largest_file}MB file)')
-            ax3.set_xticks(x)
-            ax3.set_xticklabels(lang_labels)
-            ax3.legend()
-            ax3.grid(True, alpha=0.3)
-        else:
-            ax3.text(0.5, 0.5, 'No throughput data available', 
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=ax3.transAxes, fontsize=12)
-            ax3.set_title(f'Throughput Comparison ({largest_file}MB file)')
-        
-        # Performance ratio comparison
-        ax4 = axes[1, 1]
-        
-        # Use Go as baseline (ratio = 1.0)
-        baseline_lang = 'golang'
-        ratios_data = {'Read': [], 'Write': []}
-        ratio_labels = []
-        
-        for lang in languages:
-            if (lang == baseline_lang and 
-                lang in stats[largest_file] and
-                'read' in stats[largest_file][lang] and
-                'write' in stats[largest_file][lang] and
-                stats[largest_file][lang]['read'] and
-                stats[largest_file][lang]['write']):
-                ratios_data['Read'].append(1.0)
-                ratios_data['Write'].append(1.0)
-                ratio_labels.append(lang.capitalize())
-            elif (lang in stats[largest_file] and 
-                  baseline_lang in stats[largest_file] and
-                  'read' in stats[largest_file][lang] and
-                  'write' in stats[largest_file][lang] and
-                  'read' in stats[largest_file][baseline_lang] and
-                  'write' in stats[largest_file][baseline_lang] and
-                  stats[largest_file][lang]['read'] and
-                  stats[largest_file][lang]['write'] and
-                  stats[largest_file][baseline_lang]['read'] and
-                  stats[largest_file][baseline_lang]['write']):
-                
-                read_ratio = (stats[largest_file][baseline_lang]['read']['mean'] / 
-                             stats[largest_file][lang]['read']['mean'])
-                write_ratio = (stats[largest_file][baseline_lang]['write']['mean'] / 
-                              stats[largest_file][lang]['write']['mean'])
-                
-                ratios_data['Read'].append(read_ratio)
-                ratios_data['Write'].append(write_ratio)
-                ratio_labels.append(lang.capitalize())
-        
-        if ratio_labels:  # Only create chart if we have data
-            x = range(len(ratio_labels))
-            ax4.bar([i - width/2 for i in x], ratios_data['Read'], width, label='Read', alpha=0.8)
-            ax4.bar([i + width/2 for i in x], ratios_data['Write'], width, label='Write', alpha=0.8)
-            
-            ax4.set_xlabel('Language')
-            ax4.set_ylabel('Performance Ratio (vs Go)')
-            ax4.set_title('Relative Performance (Go = 1.0)')
-            ax4.set_xticks(x)
-            ax4.set_xticklabels(ratio_labels)
-            ax4.legend()
-            ax4.grid(True, alpha=0.3)
-            ax4.axhline(y=1.0, color='red', linestyle='--', alpha=0.7)
-        else:
-            ax4.text(0.5, 0.5, 'No ratio data available', 
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=ax4.transAxes, fontsize=12)
-            ax4.set_title('Relative Performance (Go = 1.0)')
-        
-        plt.tight_layout()
-        plt.savefig('results/io_performance_comparison.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plot_comparison(stats, self.test_file_sizes, self.languages, self.baseline_lang)
+    
+    def write_report(self, stats, fmt):
+        """Write results/benchmark_report.md or .html from the statistics"""
+        path = write_report(f"results/benchmark_report.{fmt}", fmt, stats, self.test_file_sizes,
+                            self.languages, self.baseline_lang, self.profile_stats(),
+                            config={'workload': self.workload.to_dict(), 'options': self.run_options,
+                                    'iterations': self.iterations, 'adaptive': self.adaptive},
+                            images=['results/io_performance_comparison.png'] if self.plots else [])
+        print(f"  - {path}")
+    
+    def history_config(self):
+        """Settings that change what is measured; runs are only compared within one config"""
+        schedule = 'sequential'
+        if self.scheduler:
+            schedule = 'exclusive' if self.scheduler.exclusive else 'parallel'
+        return {'workload': self.workload.to_dict(), 'options': self.run_options,
+                'reject_outliers': self.reject_outliers, 'strace': self.strace, 'schedule': schedule}
+    
+    def record_history(self):
+        """Store this run's samples in the history database, returning the run id"""
+        samples = {(size_mb, lang, operation): accumulator.samples
+                   for size_mb, by_lang in self.results.items()
+                   for lang, operations in by_lang.items()
+                   for operation, accumulator in operations.items() if accumulator.count}
+        history = ResultHistory(self.history_path)
+        try:
+            run_id = history.record(self.history_config(), samples)
+        finally:
+            history.close()
+        print(f"  - {self.history_path} (run {run_id}; compare with `python3 benchmark_history.py compare`)")
+        return run_id
     
     def save_results(self, stats):
         """Save detailed results to files"""
-        # Save raw results
+        # Save statistics; raw samples are in the streaming result log
         with open('results/benchmark_results.json', 'w') as f:
             json.dump({
-                'raw_results': self.results,
+                'raw_results_log': self.result_log.path,
                 'statistics': stats,
+                'resource_profiles': self.profile_stats(),
                 'test_config': {
                     'file_sizes_mb': self.test_file_sizes,
-                    'iterations': self.iterations
+                    'workload': self.workload.to_dict(),
+                    'iterations': self.iterations,
+                    'options': self.run_options,
+                    'warmup_runs': self.warmup_runs,
+                    'adaptive': self.adaptive,
+                    'target_ci': self.target_ci,
+                    'reject_outliers': self.reject_outliers,
+                    'strace': self.strace
                 }
             }, f, indent=2)
         
-        # Create CSV summary
-        summary_data = []
-        for size_mb in self.test_file_sizes:
-            for lang in ['python', 'golang', 'kotlin']:
-                if lang in stats[size_mb]:
-                    for operation in ['read', 'write']:
-                        if operation in stats[size_mb][lang]:
-                            row = {
-                                'file_size_mb': size_mb,
-                                'language': lang,
-                                'operation': operation,
-                                'mean_time': stats[size_mb][lang][operation]['mean'],
-                                'median_time': stats[size_mb][lang][operation]['median'],
-                                'min_time': stats[size_mb][lang][operation]['min'],
-                                'max_time': stats[size_mb][lang][operation]['max'],
-                                'std_dev': stats[size_mb][lang][operation]['std'],
-                                'throughput_mbs': size_mb / stats[size_mb][lang][operation]['mean']
-                            }
-                            summary_data.append(row)
-        
-        df = pd.DataFrame(summary_data)
-        df.to_csv('results/benchmark_summary.csv', index=False)
+        # Create CSV summaries
+        write_csv(summary_rows(stats, self.test_file_sizes, self.languages), 'results/benchmark_summary.csv')
+        write_csv(profile_rows(self.profile_stats()), 'results/resource_profile.csv')
         
         print(f"\nResults saved to:")
+        print(f"  - {self.result_log.path}")
         print(f"  - results/benchmark_results.json")
         print(f"  - results/benchmark_summary.csv")
-        print(f"  - results/io_performance_comparison.png")
+        print(f"  - results/resource_profile.csv")
+        if self.plots:
+            print(f"  - results/io_performance_comparison.png")
 
 def main():
+    parser = argparse.ArgumentParser(description="I/O Performance Benchmark Suite")
+    parser.add_argument("--strategies", action="store_true",
+                        help="rank the Python copy strategies instead of comparing languages")
+    parser.add_argument("--sweep", action="store_true",
+                        help="sweep block sizes for every language and report the knee")
+    parser.add_argument("--concurrency", action="store_true",
+                        help="measure Python throughput scaling with N concurrent copies")
+    parser.add_argument("--read-modes", action="store_true",
+                        help="compare Python stream/mmap/O_DIRECT reads with hot and cold page cache")
+    parser.add_argument("--workload",
+                        choices=[kind for kind in WorkloadSpec.KINDS if kind != 'small_files'],
+                        help="test data to generate (default: random; 'repeated' is the old all-'A' data)")
+    parser.add_argument("--seed", type=int,
+                        help="workload seed; generated data is cached per workload and seed")
+    parser.add_argument("--sizes", type=int, nargs='+',
+                        help="file sizes in MB (default: 1 10 50 100)")
+    parser.add_argument("--languages", nargs='+', choices=LANGUAGES,
+                        help="languages to run (default: all)")
+    parser.add_argument("--iterations", type=int,
+                        help="recorded runs per case (default: 3)")
+    parser.add_argument("--config",
+                        help="run the benchmark matrix in this JSON, TOML or YAML file")
+    parser.add_argument("--matrix", action="store_true",
+                        help="run the benchmark matrix given by --config and the options below")
+    parser.add_argument("--block-sizes", type=int, nargs='+',
+                        help="matrix: block sizes in bytes")
+    parser.add_argument("--strategy", nargs='+', dest="copy_strategies",
+                        help="matrix: Python copy strategies")
+    parser.add_argument("--streams", type=int, nargs='+',
+                        help="matrix: Python concurrent stream counts")
+    parser.add_argument("--filter", nargs='+',
+                        help="matrix: only run cases matching these patterns, e.g. 'python/*' '*/bs=65536*'")
+    parser.add_argument("--list-jobs", action="store_true",
+                        help="matrix: print the expanded job list and exit")
+    parser.add_argument("--random", action="store_true",
+                        help="measure random-access IOPS per access pattern and queue depth")
+    parser.add_argument("--large", type=int, nargs='*', metavar="GB",
+                        help="copy and read large files (default: 1 4 16 64 GB, as far as the disk allows) "
+                             "and report throughput per time window")
+    parser.add_argument("--window-ms", type=int, default=500,
+                        help="throughput window length for --large (default: 500)")
+    parser.add_argument("--metadata", action="store_true",
+                        help="measure create/stat/open/unlink, directory traversal and tree copy/delete "
+                             "operations per second, serially and on a thread pool")
+    parser.add_argument("--metadata-files", type=int, default=10000,
+                        help="files created per metadata run (default: 10000)")
+    parser.add_argument("--metadata-files-per-dir", type=int, default=1000,
+                        help="files per directory in metadata runs; set it to --metadata-files "
+                             "for one large directory (default: 1000)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="compare the Python asyncio pipeline engine per queue depth against a synchronous loop")
+    parser.add_argument("--workload-root", default="data/workloads",
+                        help="where test data is generated, e.g. on the disk under test (default: data/workloads)")
+    parser.add_argument("--compression", action="store_true",
+                        help="measure Python compress-on-write/decompress-on-read throughput per codec and level")
+    parser.add_argument("--parsing", action="store_true",
+                        help="measure Python read-and-parse throughput in records per second")
+    parser.add_argument("--latency", action="store_true",
+                        help="time every read()/write() call and report p50/p99/p99.9/max per language")
+    parser.add_argument("--durability", choices=['none', 'flush', 'fsync', 'fdatasync'],
+                        help="make every copy durable at this level and record time-to-durable")
+    parser.add_argument("--sync-every-mb", type=int,
+                        help="also apply --durability every N MB during the copy")
+    parser.add_argument("--resume", action="store_true",
+                        help="resume an interrupted run from results/benchmark_log.jsonl (matrix: results/matrix_log.jsonl)")
+    parser.add_argument("--persistent", action="store_true",
+                        help="stream all iterations through one warmed-up worker per language")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="unrecorded warmup runs per language and file size (default: 1)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="iterate until each mean's 95%% CI is within --target-ci")
+    parser.add_argument("--target-ci", type=float, default=0.05,
+                        help="adaptive: CI half-width as a fraction of the mean (default: 0.05)")
+    parser.add_argument("--time-budget", type=float, default=300.0,
+                        help="adaptive: seconds to spend per file size (default: 300)")
+    parser.add_argument("--reject-outliers", action="store_true",
+                        help="drop runs whose MAD z-score exceeds 3.5 from the statistics")
+    parser.add_argument("--parallel", type=int, metavar="N", nargs='?', const=0,
+                        help="run independent runs concurrently, N at a time (default: one per CPU set)")
+    parser.add_argument("--cpus-per-job", type=int, default=1,
+                        help="parallel: CPUs each run is pinned to (default: 1)")
+    parser.add_argument("--exclusive", action="store_true",
+                        help="schedule runs in random order but one at a time, for clean numbers")
+    parser.add_argument("--order-seed", type=int,
+                        help="parallel/exclusive: seed for the shuffled run order (default: random)")
+    parser.add_argument("--history-db", default="history/benchmark_history.sqlite",
+                        help="record every run here for regression checks (default: history/benchmark_history.sqlite)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="do not record this run in the history database")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="skip the charts (and the matplotlib import); write JSON/CSV only")
+    parser.add_argument("--report", choices=['md', 'html'],
+                        help="also write results/benchmark_report.md or .html")
+    parser.add_argument("--strace", action="store_true",
+                        help="also count syscalls per run with strace -c (adds tracing overhead)")
+    args = parser.parse_args()
+    
     print("I/O Performance Benchmark Suite")
     print("=" * 40)
     
     benchmark = IOBenchmark()
-    benchmark.run_benchmarks()
+    benchmark.run_options = {'durability': args.durability, 'sync_every_mb': args.sync_every_mb}
+    matrix = None
+    if args.config or args.matrix:
+        try:
+            config = load_config(args.config) if args.config else {}
+            matrix = resolve(config, languages=args.languages, sizes_mb=args.sizes, iterations=args.iterations,
+                             block_sizes=args.block_sizes, strategies=args.copy_strategies,
+                             concurrency=args.streams, workload=args.workload, seed=args.seed)
+        except (OSError, ValueError, ImportError) as e:
+            parser.error(str(e))
+        benchmark.run_options = {**matrix['options'],
+                                 **{key: value for key, value in benchmark.run_options.items() if value is not None}}
+        matrix['options'] = benchmark.run_options
+        args.languages, args.sizes, args.iterations = matrix['languages'], matrix['sizes_mb'], matrix['iterations']
+        args.workload, args.seed = matrix['workload'], matrix['seed']
+    benchmark.workload = WorkloadSpec(args.workload or 'random', args.seed or 0)
+    benchmark.workload_generator = WorkloadGenerator(args.workload_root)
+    if args.sizes:
+        benchmark.test_file_sizes = args.sizes
+    if args.languages:
+        benchmark.languages = args.languages
+    if args.iterations:
+        benchmark.iterations = args.iterations
+    benchmark.metadata_files = args.metadata_files
+    benchmark.metadata_files_per_dir = args.metadata_files_per_dir
+    benchmark.window_ms = args.window_ms
+    if args.large:
+        benchmark.large_sizes_gb = args.large
+    benchmark.warmup_runs = args.warmup
+    benchmark.adaptive = args.adaptive
+    benchmark.target_ci = args.target_ci
+    benchmark.time_budget = args.time_budget
+    benchmark.reject_outliers = args.reject_outliers
+    benchmark.strace = args.strace
+    benchmark.history_path = None if args.no_history else args.history_db
+    benchmark.plots = not args.no_plots
+    if args.strategies:
+        if not benchmark.rank_python_strategies():
+            parser.exit(1)
+        return
+    if matrix:
+        jobs = filter_jobs(expand(matrix), args.filter)
+        if args.list_jobs:
+            for job in jobs:
+                print(job.key)
+            return
+        if args.persistent:
+            benchmark.start_workers()
+        try:
+            benchmark.run_matrix(jobs, resume=args.resume)
+        finally:
+            benchmark.stop_workers()
+        return
+    if args.parallel is not None or args.exclusive:
+        if args.persistent or args.adaptive:
+            parser.error("--parallel and --exclusive cannot be combined with --persistent or --adaptive")
+        benchmark.scheduler = Scheduler(cpus_per_job=args.cpus_per_job, max_parallel=args.parallel or None,
+                                        exclusive=args.exclusive, seed=args.order_seed)
+    if args.persistent:
+        benchmark.start_workers()
+    try:
+        if args.sweep:
+            benchmark.run_buffer_sweep()
+            return
+        if args.concurrency:
+            benchmark.run_concurrency_scaling()
+            return
+        if args.read_modes:
+            benchmark.run_read_modes()
+            return
+        if args.latency:
+            benchmark.run_latency()
+            return
+        if args.random:
+            benchmark.run_random_access()
+            return
+        if args.parsing:
+            benchmark.run_parsing()
+            return
+        if args.compression:
+            benchmark.run_compression()
+            return
+        if args.pipeline:
+            benchmark.run_pipeline()
+            return
+        if args.metadata:
+            benchmark.run_metadata()
+            return
+        if args.large is not None:
+            benchmark.run_large_files()
+            return
+        if benchmark.scheduler:
+            benchmark.run_scheduled(resume=args.resume)
+        else:
+            benchmark.run_benchmarks(resume=args.resume)
+    finally:
+        benchmark.stop_workers()
     
     stats = benchmark.calculate_stats()
-    benchmark.create_visualizations(stats)
+    os.makedirs("results", exist_ok=True)
+    if benchmark.plots:
+        benchmark.create_visualizations(stats)
     benchmark.save_results(stats)
+    if args.report:
+        benchmark.write_report(stats, args.report)
+    if benchmark.history_path:
+        benchmark.record_history()
     
     print("\nBenchmark completed successfully!")
 
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark Job Scheduler
+Runs independent benchmark jobs concurrently, each pinned to its own CPU set
+with its own data directory, in a randomized order
+"""
+
+import os
+import queue
+import random
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+def available_cpus():
+    """CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+class Job:
+    """One independent benchmark run
+
+    run is called with the job's private data directory, which holds links
+    to the input files, and returns the job's result.
+    """
+
+    def __init__(self, key, run, inputs=()):
+        self.key = key
+        self.run = run
+        self.inputs = list(inputs)
+
+class Scheduler:
+    """Runs jobs in a seeded random order, several at a time on disjoint CPU sets
+
+    The available CPUs are split into sets of cpus_per_job, and up to
+    max_parallel jobs run at once, one per set. Each job's thread pins
+    itself with os.sched_setaffinity(0, ...), which on Linux applies to the
+    calling thread only; benchmark processes it starts inherit the pinning.
+    Exclusive mode runs one job at a time on all CPUs, for clean numbers.
+
+    Every job gets a fresh directory under scratch_root with hard links (or
+    copies, across filesystems) of its inputs, so concurrent jobs never
+    write to the same output file. The directory is removed afterwards.
+    """
+
+    def __init__(self, cpus_per_job=1, max_parallel=None, exclusive=False, seed=None,
+                 scratch_root="data/jobs"):
+        if cpus_per_job < 1:
+            raise ValueError(f"cpus_per_job must be at least 1, got {cpus_per_job}")
+        self.cpus_per_job = cpus_per_job
+        self.max_parallel = max_parallel
+        self.exclusive = exclusive
+        self.seed = seed
+        self.scratch_root = Path(scratch_root)
+
+    def cpu_sets(self):
+        """Disjoint CPU sets, one per concurrently running job"""
+        cpus = available_cpus()
+        if self.exclusive or len(cpus) <= self.cpus_per_job:
+            return [cpus]
+        sets = [cpus[i:i + self.cpus_per_job]
+                for i in range(0, len(cpus) - self.cpus_per_job + 1, self.cpus_per_job)]
+        return sets[:self.max_parallel] if self.max_parallel else sets
+
+    def order(self, jobs):
+        """The jobs in execution order: shuffled, reproducibly when seeded"""
+        ordered = list(jobs)
+        random.Random(self.seed).shuffle(ordered)
+        return ordered
+
+    def prepare(self, index, job):
+        directory = self.scratch_root / f"job-{index:05d}"
+        shutil.rmtree(directory, ignore_errors=True)
+        directory.mkdir(parents=True)
+        for source in job.inputs:
+            target = directory / Path(source).name
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copyfile(source, target)
+        return directory
+
+    def run(self, jobs):
+        """Run every job; yields (job, cpus, result) in completion order
+
+        A job that raises is re-raised here when its turn comes to be
+        yielded, after which the remaining jobs are cancelled.
+        """
+        cpu_sets = self.cpu_sets()
+        slots = queue.SimpleQueue()
+        for cpus in cpu_sets:
+            slots.put(cpus)
+
+        def execute(index, job):
+            cpus = slots.get()
+            try:
+                if hasattr(os, 'sched_setaffinity'):
+                    os.sched_setaffinity(0, cpus)
+                directory = self.prepare(index, job)
+                try:
+                    return cpus, job.run(str(directory.resolve()))
+                finally:
+                    shutil.rmtree(directory, ignore_errors=True)
+            finally:
+                slots.put(cpus)
+
+        with ThreadPoolExecutor(max_workers=len(cpu_sets)) as pool:
+            futures = {pool.submit(execute, index, job): job for index, job in enumerate(self.order(jobs))}
+            try:
+                for future in as_completed(futures):
+                    cpus, result = future.result()
+                    yield futures[future], cpus, result
+            finally:
+                for future in futures:
+                    future.cancel()
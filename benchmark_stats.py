@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Online statistics for benchmark samples
+Constant-memory accumulators: Welford mean/variance, P² quantile sketches and a
+bounded reservoir for robust statistics (MAD outliers, bootstrap intervals)
+"""
+
+import math
+import random
+
+# Two-sided 95% Student t critical values for 1..30 degrees of freedom
+T_CRITICAL_95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+]
+
+def t_critical_95(df):
+    """Two-sided 95% t critical value; Cornish-Fisher approximation past 30 df"""
+    if df < 1:
+        return math.inf
+    if df <= len(T_CRITICAL_95):
+        return T_CRITICAL_95[df - 1]
+    z = 1.959964
+    return z + (z ** 3 + z) / (4 * df)
+
+def median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+def mad_zscore(x, values):
+    """Modified z-score of x against values (Iglewicz & Hoaglin), None if undefined"""
+    if len(values) < 3:
+        return None
+    center = median(values)
+    mad = median([abs(v - center) for v in values])
+    if mad == 0:
+        return None
+    return 0.6745 * (x - center) / mad
+
+def bootstrap_ratio_ci(numerator, denominator, resamples=2000, confidence=0.95, seed=0):
+    """Percentile bootstrap interval for mean(numerator) / mean(denominator)
+
+    The two sample sets are resampled independently. Returns
+    (ratio, low, high), or None if either set is empty.
+    """
+    if len(numerator) == 0 or len(denominator) == 0:
+        return None
+    import numpy as np  # only needed here; keeps importing this module cheap
+    rng = np.random.default_rng(seed)
+    num = np.asarray(numerator, dtype=float)
+    den = np.asarray(denominator, dtype=float)
+    num_means = rng.choice(num, size=(resamples, len(num))).mean(axis=1)
+    den_means = rng.choice(den, size=(resamples, len(den))).mean(axis=1)
+    ratios = num_means / den_means
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(ratios, [tail, 100 - tail])
+    return float(num.mean() / den.mean()), float(low), float(high)
+
+def mann_whitney_u(a, b):
+    """Two-sided Mann-Whitney U test of a against b
+
+    Uses the normal approximation with tie and continuity corrections,
+    which is adequate from about five samples per side. Returns (U of a,
+    p-value), or None if either side is empty.
+    """
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return None
+    # Midranks of the pooled samples
+    pooled = sorted((value, side) for side, values in enumerate([a, b]) for value in values)
+    ranks_a = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j < len(pooled) and pooled[j][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j + 1) / 2
+        ranks_a += rank * sum(1 for k in range(i, j) if pooled[k][1] == 0)
+        tie_term += (j - i) ** 3 - (j - i)
+        i = j
+    u = ranks_a - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+class RunningStats:
+    """Welford's online mean and variance, plus min and max"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    @property
+    def variance(self):
+        """Sample variance, matching statistics.variance; 0 below two samples"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+class P2Quantile:
+    """Streaming estimate of one quantile with the P² algorithm
+
+    Jain & Chlamtac (1985): five markers whose heights are adjusted with
+    piecewise-parabolic interpolation as samples arrive. The first
+    EXACT_SAMPLES samples are kept and the quantile is computed exactly;
+    the markers are then seeded from them, which avoids P²'s poor tail
+    estimates when started from only five samples.
+    """
+
+    EXACT_SAMPLES = 100
+
+    def __init__(self, p):
+        self.p = p
+        self.initial = []
+        self.heights = None
+        self.positions = None
+        self.desired = None
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x):
+        if self.heights is None:
+            self.initial.append(x)
+            if len(self.initial) == self.EXACT_SAMPLES:
+                self._seed_markers()
+            return
+
+        q, n = self.heights, self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = self._linear(i, d)
+                q[i] = height
+                n[i] += d
+
+    def _seed_markers(self):
+        """Place the five markers at their target ranks in the exact samples"""
+        ordered = sorted(self.initial)
+        count = len(ordered)
+        positions = [1 + round(inc * (count - 1)) for inc in self.increments]
+        # Markers need distinct ranks: squeeze from the top, then the bottom
+        for i in range(3, -1, -1):
+            positions[i] = min(positions[i], positions[i + 1] - 1)
+        for i in range(1, 5):
+            positions[i] = max(positions[i], positions[i - 1] + 1)
+        self.positions = positions
+        self.heights = [ordered[n - 1] for n in positions]
+        self.desired = [1 + inc * (count - 1) for inc in self.increments]
+        self.initial = []
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def _linear(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    @property
+    def value(self):
+        if self.heights is not None:
+            return self.heights[2]
+        if not self.initial:
+            return None
+        # Exact, linearly interpolated quantile of the samples so far
+        ordered = sorted(self.initial)
+        position = self.p * (len(ordered) - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+class Reservoir:
+    """Uniform random sample of at most capacity items from a stream (Algorithm R)"""
+
+    def __init__(self, capacity=1000, seed=0):
+        self.capacity = capacity
+        self.items = []
+        self.seen = 0
+        self.rng = random.Random(seed)
+
+    def add(self, x):
+        self.seen += 1
+        if len(self.items) < self.capacity:
+            self.items.append(x)
+        else:
+            slot = self.rng.randrange(self.seen)
+            if slot < self.capacity:
+                self.items[slot] = x
+
+class SampleStats:
+    """Constant-memory summary of one sample stream (mean, spread, quantiles)
+
+    Samples rejected as outliers are counted but not accumulated.
+    """
+
+    QUANTILES = (0.25, 0.5, 0.75, 0.95, 0.99)
+    MAD_THRESHOLD = 3.5
+    MIN_SAMPLES_FOR_OUTLIERS = 5
+
+    def __init__(self):
+        self.running = RunningStats()
+        self.quantiles = {p: P2Quantile(p) for p in self.QUANTILES}
+        self.reservoir = Reservoir()
+        self.rejected = 0
+
+    def add(self, x):
+        self.running.add(x)
+        for sketch in self.quantiles.values():
+            sketch.add(x)
+        self.reservoir.add(x)
+
+    def reject(self):
+        self.rejected += 1
+
+    def is_outlier(self, x):
+        """Whether x is an outlier against the samples so far
+
+        Uses the MAD modified z-score on the reservoir, falling back to
+        Tukey's 1.5 * IQR fences when the MAD is zero.
+        """
+        if self.count < self.MIN_SAMPLES_FOR_OUTLIERS:
+            return False
+        z = mad_zscore(x, self.reservoir.items)
+        if z is not None:
+            return abs(z) > self.MAD_THRESHOLD
+        q1, q3 = self.quantiles[0.25].value, self.quantiles[0.75].value
+        iqr = q3 - q1
+        return iqr > 0 and not (q1 - 1.5 * iqr <= x <= q3 + 1.5 * iqr)
+
+    @property
+    def count(self):
+        return self.running.count
+
+    @property
+    def samples(self):
+        """Retained samples (all of them, up to the reservoir capacity)"""
+        return self.reservoir.items
+
+    def confidence_interval(self):
+        """95% t interval on the mean, or (mean, mean) below two samples"""
+        running = self.running
+        if running.count < 2:
+            return running.mean, running.mean
+        half = t_critical_95(running.count - 1) * running.stdev / math.sqrt(running.count)
+        return running.mean - half, running.mean + half
+
+    def relative_ci_width(self):
+        """Half-width of the 95% CI as a fraction of the mean"""
+        low, high = self.confidence_interval()
+        if self.count < 2 or self.running.mean == 0:
+            return math.inf
+        return (high - low) / 2 / abs(self.running.mean)
+
+    def summary(self):
+        """Summarise in the shape of IOBenchmark.calculate_stats()"""
+        running = self.running
+        ci_low, ci_high = self.confidence_interval()
+        return {
+            'count': running.count,
+            'outliers_rejected': self.rejected,
+            'mean': running.mean,
+            'median': self.quantiles[0.5].value,
+            'min': running.min,
+            'max': running.max,
+            'std': running.stdev,
+            'ci95_low': ci_low,
+            'ci95_high': ci_high,
+            'q1': self.quantiles[0.25].value,
+            'q3': self.quantiles[0.75].value,
+            'p50': self.quantiles[0.5].value,
+            'p95': self.quantiles[0.95].value,
+            'p99': self.quantiles[0.99].value
+        }
@@ -0,0 +1,21 @@
+package main
+
+import (
+	"fmt"
+	"os"
+)
+
+// syncFunc returns the function that applies a durability level to an open
+// output file. os.File is unbuffered, so "flush" has nothing to do.
+func syncFunc(durability string) (func(*os.File) error, error) {
+	switch durability {
+	case "", "none", "flush":
+		return func(*os.File) error { return nil }, nil
+	case "fsync":
+		return (*os.File).Sync, nil
+	case "fdatasync":
+		return fdatasync, nil
+	default:
+		return nil, fmt.Errorf("unknown durability level %q", durability)
+	}
+}
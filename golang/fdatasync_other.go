@@ -0,0 +1,10 @@
+//go:build !linux
+
+package main
+
+import "os"
+
+// fdatasync falls back to a full fsync where fdatasync(2) is unavailable.
+func fdatasync(f *os.File) error {
+	return f.Sync()
+}
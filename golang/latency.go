@@ -0,0 +1,101 @@
+package main
+
+import (
+	"math"
+	"math/bits"
+	"time"
+)
+
+const (
+	subBucketBits = 7
+	subBuckets    = 1 << subBucketBits
+	maxExponent   = 40 // up to ~2^48 ns (3 days); larger values are clamped
+)
+
+// latencyHistogram is a log-linear histogram of nanosecond latencies in the
+// style of HdrHistogram: every power of two is split into subBuckets linear
+// buckets, so a value is reported to within 1/subBuckets (under 1%). The
+// counts are a fixed array, so recording never allocates.
+type latencyHistogram struct {
+	counts [(maxExponent + 2) * subBuckets]uint64
+	total  uint64
+	sum    uint64
+	max    uint64
+}
+
+// LatencySummary holds the tail percentiles reported for one operation.
+type LatencySummary struct {
+	Count  uint64  `json:"count"`
+	MeanUS float64 `json:"mean_us"`
+	P50US  float64 `json:"p50_us"`
+	P99US  float64 `json:"p99_us"`
+	P999US float64 `json:"p999_us"`
+	MaxUS  float64 `json:"max_us"`
+}
+
+func bucketIndex(value uint64) int {
+	exponent := bits.Len64(value) - subBucketBits - 1
+	if exponent <= 0 {
+		return int(value)
+	}
+	if exponent > maxExponent {
+		return (maxExponent+2)*subBuckets - 1
+	}
+	return exponent*subBuckets + int(value>>uint(exponent))
+}
+
+// highestEquivalent returns the largest value that lands in bucket index.
+func highestEquivalent(index int) uint64 {
+	if index < 2*subBuckets {
+		return uint64(index)
+	}
+	exponent := index/subBuckets - 1
+	mantissa := uint64(index - exponent*subBuckets)
+	return (mantissa+1)<<uint(exponent) - 1
+}
+
+func (h *latencyHistogram) record(d time.Duration) {
+	value := uint64(d.Nanoseconds())
+	h.counts[bucketIndex(value)]++
+	h.total++
+	h.sum += value
+	if value > h.max {
+		h.max = value
+	}
+}
+
+// percentile returns the value at percentile p (0-100) in nanoseconds.
+func (h *latencyHistogram) percentile(p float64) uint64 {
+	if h.total == 0 {
+		return 0
+	}
+	target := uint64(math.Ceil(p / 100 * float64(h.total)))
+	if target < 1 {
+		target = 1
+	}
+	var seen uint64
+	for index, count := range h.counts {
+		seen += count
+		if seen >= target {
+			if value := highestEquivalent(index); value < h.max {
+				return value
+			}
+			return h.max
+		}
+	}
+	return h.max
+}
+
+func (h *latencyHistogram) summary() LatencySummary {
+	summary := LatencySummary{
+		Count:  h.total,
+		P50US:  float64(h.percentile(50)) / 1000,
+		P99US:  float64(h.percentile(99)) / 1000,
+		P999US: float64(h.percentile(99.9)) / 1000,
+		MaxUS:  float64(h.max) / 1000,
+	}
+	if h.total > 0 {
+		summary.MeanUS = float64(h.sum) / float64(h.total) / 1000
+	}
+	return summary
+}
@@ -1,34 +1,121 @@
 package main
 
 import (
+	"bufio"
+	"bytes"
 	"encoding/json"
+	"flag"
 	"fmt"
 	"io"
 	"os"
+	"path/filepath"
 	"strconv"
 	"time"
 )
 
+const (
+	defaultBlockSize = 8192
+	defaultDataDir   = "../data" // holds test_<N>mb.txt; outputs are written next to it
+	mb               = 1024 * 1024
+)
+
 type BenchmarkResult struct {
-	Language           string  `json:"language"`
-	FileSizeMB         int     `json:"file_size_mb"`
-	ReadTime           float64 `json:"read_time"`
-	WriteTime          float64 `json:"write_time"`
-	ReadThroughputMBS  float64 `json:"read_throughput_mbs"`
-	WriteThroughputMBS float64 `json:"write_throughput_mbs"`
+	Language             string                        `json:"language"`
+	FileSizeMB           int                           `json:"file_size_mb"`
+	BlockSize            int                           `json:"block_size"`
+	ReadTime             float64                       `json:"read_time"`
+	WriteTime            float64                       `json:"write_time"`
+	ReadThroughputMBS    float64                       `json:"read_throughput_mbs"`
+	WriteThroughputMBS   float64                       `json:"write_throughput_mbs"`
+	Durability           string                        `json:"durability"`
+	SyncEveryMB          int                           `json:"sync_every_mb"`
+	DurableTime          *float64                      `json:"durable_time"`
+	DurableThroughputMBS *float64                      `json:"durable_throughput_mbs"`
+	Latency              map[string]LatencySummary     `json:"latency"`
+	Windows              map[string][]ThroughputWindow `json:"windows"`
+}
+
+// BenchmarkJob describes one benchmark run, from the command line or as a
+// request in worker mode.
+type BenchmarkJob struct {
+	FileSizeMB  int    `json:"file_size_mb"`
+	BlockSize   int    `json:"block_size"`
+	Durability  string `json:"durability"`
+	SyncEveryMB int    `json:"sync_every_mb"`
+	Latency     bool   `json:"latency"`
+	WindowMS    int    `json:"window_ms"`
+	DataDir     string `json:"data_dir"`
+	Pattern     string `json:"pattern"`
+	QueueDepth  int    `json:"queue_depth"`
+	Ops         int    `json:"ops"`
+	Seed        int64  `json:"seed"`
+	Metadata    bool   `json:"metadata"`
+	Files       int    `json:"files"`
+	FilesPerDir int    `json:"files_per_dir"`
+	Threads     int    `json:"threads"`
+}
+
+func defaultJob() BenchmarkJob {
+	return BenchmarkJob{Durability: "none", DataDir: defaultDataDir, QueueDepth: 1,
+		Files: metadataFiles, FilesPerDir: filesPerDir, Threads: 1}
+}
+
+// runJob runs a copy benchmark, a metadata one if job.Metadata is set, or a
+// random-access one if job.Pattern is set; a zero block size means the
+// default for the kind of benchmark.
+func runJob(job BenchmarkJob) (interface{}, error) {
+	if job.Metadata {
+		return benchmarkMetadata(job)
+	}
+	if job.Pattern != "" {
+		if job.BlockSize == 0 {
+			job.BlockSize = randomBlockSize
+		}
+		return benchmarkRandom(job)
+	}
+	if job.BlockSize == 0 {
+		job.BlockSize = defaultBlockSize
+	}
+	return benchmarkIO(job)
 }
 
-func benchmarkIO(fileSizeMB int) (*BenchmarkResult, error) {
-	inputPath := fmt.Sprintf("../data/test_%dmb.txt", fileSizeMB)
-	outputPath := fmt.Sprintf("../data/test_%dmb.go.out", fileSizeMB)
+type workerError struct {
+	Error string `json:"error"`
+}
+
+func benchmarkIO(job BenchmarkJob) (*BenchmarkResult, error) {
+	fileSizeMB, blockSize := job.FileSizeMB, job.BlockSize
+	inputPath := filepath.Join(job.DataDir, fmt.Sprintf("test_%dmb.txt", fileSizeMB))
+	outputPath := filepath.Join(job.DataDir, fmt.Sprintf("test_%dmb.go.out", fileSizeMB))
 
 	// Check if input file exists
 	if _, err := os.Stat(inputPath); os.IsNotExist(err) {
 		return nil, fmt.Errorf("test file %s not found", inputPath)
 	}
+	if blockSize <= 0 {
+		return nil, fmt.Errorf("block size must be positive, got %d", blockSize)
+	}
+	if job.WindowMS < 0 {
+		return nil, fmt.Errorf("window must not be negative, got %dms", job.WindowMS)
+	}
+	sync, err := syncFunc(job.Durability)
+	if err != nil {
+		return nil, err
+	}
+	// With job.Latency every Write of the copy and Read of the read test is timed
+	var readLatency, writeLatency *latencyHistogram
+	if job.Latency {
+		readLatency, writeLatency = new(latencyHistogram), new(latencyHistogram)
+	}
+
+	// With job.WindowMS, throughput is also recorded per window
+	var readWindows, writeWindows *throughputWindows
 
 	// Write test (copy file)
 	startTime := time.Now()
+	if job.WindowMS > 0 {
+		writeWindows = newThroughputWindows(job.WindowMS)
+	}
 	fin, err := os.Open(inputPath)
 	if err != nil {
 		return nil, err
@@ -41,7 +128,8 @@ func benchmarkIO(fileSizeMB int) (*BenchmarkResult, error) {
 	}
 	defer fout.Close()
 
-	buf := make([]byte, 8192)
+	buf := make([]byte, blockSize)
+	pending := 0
 	for {
 		n, err := fin.Read(buf)
 		if err != nil && err != io.EOF {
@@ -50,14 +138,40 @@ func benchmarkIO(fileSizeMB int) (*BenchmarkResult, error) {
 		if n == 0 {
 			break
 		}
+		writeStart := time.Now()
 		if _, err := fout.Write(buf[:n]); err != nil {
 			return nil, err
 		}
+		if writeLatency != nil {
+			writeLatency.record(time.Since(writeStart))
+		}
+		if writeWindows != nil {
+			writeWindows.add(n)
+		}
+		pending += n
+		if job.SyncEveryMB > 0 && pending >= job.SyncEveryMB*mb {
+			pending = 0
+			if err := sync(fout); err != nil {
+				return nil, err
+			}
+		}
 	}
 	writeTime := time.Since(startTime).Seconds()
+	if err := sync(fout); err != nil {
+		return nil, err
+	}
+	var durableTime, durableThroughput *float64
+	if job.Durability != "none" {
+		elapsed := time.Since(startTime).Seconds()
+		throughput := float64(fileSizeMB) / elapsed
+		durableTime, durableThroughput = &elapsed, &throughput
+	}
 
 	// Read test
 	startTime = time.Now()
+	if job.WindowMS > 0 {
+		readWindows = newThroughputWindows(job.WindowMS)
+	}
 	f, err := os.Open(outputPath)
 	if err != nil {
 		return nil, err
@@ -65,42 +179,126 @@ func benchmarkIO(fileSizeMB int) (*BenchmarkResult, error) {
 	defer f.Close()
 
 	for {
+		readStart := time.Now()
 		n, err := f.Read(buf)
+		if readLatency != nil {
+			readLatency.record(time.Since(readStart))
+		}
 		if err != nil && err != io.EOF {
 			return nil, err
 		}
 		if n == 0 {
 			break
 		}
+		if readWindows != nil {
+			readWindows.add(n)
+		}
 	}
 	readTime := time.Since(startTime).Seconds()
 
 	// Clean up output file
 	os.Remove(outputPath)
 
+	var latency map[string]LatencySummary
+	if job.Latency {
+		latency = map[string]LatencySummary{
+			"read":  readLatency.summary(),
+			"write": writeLatency.summary(),
+		}
+	}
+
+	var windows map[string][]ThroughputWindow
+	if job.WindowMS > 0 {
+		windows = map[string][]ThroughputWindow{
+			"read":  readWindows.finish(),
+			"write": writeWindows.finish(),
+		}
+	}
+
 	return &BenchmarkResult{
-		Language:           "golang",
-		FileSizeMB:         fileSizeMB,
-		ReadTime:           readTime,
-		WriteTime:          writeTime,
-		ReadThroughputMBS:  float64(fileSizeMB) / readTime,
-		WriteThroughputMBS: float64(fileSizeMB) / writeTime,
+		Language:             "golang",
+		FileSizeMB:           fileSizeMB,
+		BlockSize:            blockSize,
+		ReadTime:             readTime,
+		WriteTime:            writeTime,
+		ReadThroughputMBS:    float64(fileSizeMB) / readTime,
+		WriteThroughputMBS:   float64(fileSizeMB) / writeTime,
+		Durability:           job.Durability,
+		SyncEveryMB:          job.SyncEveryMB,
+		DurableTime:          durableTime,
+		DurableThroughputMBS: durableThroughput,
+		Latency:              latency,
+		Windows:              windows,
 	}, nil
 }
 
+// serveWorker runs benchmark jobs read as JSON lines until EOF, answering
+// each with one JSON line holding the result or an error.
+func serveWorker(in io.Reader, out io.Writer) error {
+	scanner := bufio.NewScanner(in)
+	encoder := json.NewEncoder(out)
+	for scanner.Scan() {
+		line := bytes.TrimSpace(scanner.Bytes())
+		if len(line) == 0 {
+			continue
+		}
+
+		var response interface{}
+		job := defaultJob()
+		if err := json.Unmarshal(line, &job); err != nil {
+			response = workerError{Error: err.Error()}
+		} else if result, err := runJob(job); err != nil {
+			response = workerError{Error: err.Error()}
+		} else {
+			response = result
+		}
+		if err := encoder.Encode(response); err != nil {
+			return err
+		}
+	}
+	return scanner.Err()
+}
+
 func main() {
-	if len(os.Args) != 2 {
-		fmt.Fprintf(os.Stderr, "Usage: %s <file_size_mb>\n", os.Args[0])
+	job := defaultJob()
+	flag.IntVar(&job.BlockSize, "block-size", 0, "chunk size in bytes for reads and writes (default 8192, or 4096 with --pattern)")
+	flag.StringVar(&job.Durability, "durability", "none", "none, flush, fsync or fdatasync")
+	flag.IntVar(&job.SyncEveryMB, "sync-every-mb", 0, "also apply --durability every N MB during the copy")
+	flag.IntVar(&job.WindowMS, "window-ms", 0, "also report throughput per window of N ms during the copy and read")
+	flag.StringVar(&job.DataDir, "data-dir", defaultDataDir, "directory holding test_<N>mb.txt")
+	flag.BoolVar(&job.Latency, "latency", false, "time every Read/Write call and report p50/p99/p99.9/max")
+	flag.StringVar(&job.Pattern, "pattern", "", "random-access reads and writes at uniform, zipf or strided offsets")
+	flag.IntVar(&job.QueueDepth, "queue-depth", 1, "operations kept in flight (with --pattern)")
+	flag.IntVar(&job.Ops, "ops", 0, "operations per test (with --pattern; default one per block)")
+	flag.Int64Var(&job.Seed, "seed", 0, "seed for the random offsets (with --pattern)")
+	flag.BoolVar(&job.Metadata, "metadata", false, "create/stat/open/unlink many files, traverse them and copy tree_<N>mb/, in operations per second")
+	flag.IntVar(&job.Files, "files", metadataFiles, "files to create (with --metadata)")
+	flag.IntVar(&job.FilesPerDir, "files-per-dir", filesPerDir, "files per directory (with --metadata)")
+	flag.IntVar(&job.Threads, "threads", 1, "goroutines sharing each operation (with --metadata)")
+	worker := flag.Bool("worker", false, "serve JSON-lines jobs on stdin instead of running once")
+	flag.Parse()
+
+	if *worker {
+		if err := serveWorker(os.Stdin, os.Stdout); err != nil {
+			fmt.Fprintf(os.Stderr, "Worker failed: %v\n", err)
+			os.Exit(1)
+		}
+		return
+	}
+
+	if flag.NArg() != 1 {
+		fmt.Fprintf(os.Stderr, "Usage: %s [flags] <file_size_mb> | --worker\n", os.Args[0])
 		os.Exit(1)
 	}
 
-	fileSizeMB, err := strconv.Atoi(os.Args[1])
+	fileSizeMB, err := strconv.Atoi(flag.Arg(0))
 	if err != nil {
 		fmt.Fprintf(os.Stderr, "Invalid file size: %v\n", err)
 		os.Exit(1)
 	}
+	job.FileSizeMB = fileSizeMB
 
-	result, err := benchmarkIO(fileSizeMB)
+	result, err := runJob(job)
 	if err != nil {
 		fmt.Fprintf(os.Stderr, "Benchmark failed: %v\n", err)
 		os.Exit(1)
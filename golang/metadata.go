@@ -0,0 +1,302 @@
+package main
+
+import (
+	"fmt"
+	"io"
+	"io/fs"
+	"os"
+	"path/filepath"
+	"sort"
+	"sync"
+	"time"
+)
+
+const (
+	metadataFiles = 10000
+	filesPerDir   = 1000
+)
+
+type MetadataOp struct {
+	Count     int     `json:"count"`
+	Time      float64 `json:"time"`
+	OpsPerSec float64 `json:"ops_per_sec"`
+}
+
+type MetadataResult struct {
+	Language              string                `json:"language"`
+	FileSizeMB            int                   `json:"file_size_mb"`
+	Files                 int                   `json:"files"`
+	FilesPerDir           int                   `json:"files_per_dir"`
+	Threads               int                   `json:"threads"`
+	TreeFiles             int                   `json:"tree_files"`
+	Operations            map[string]MetadataOp `json:"operations"`
+	CopyTreeThroughputMBS float64               `json:"copy_tree_throughput_mbs"`
+}
+
+// runSplit calls op for every index below n from threads goroutines, each
+// taking an interleaved share, and returns the sum of what op returned.
+func runSplit(threads, n int, op func(i int) (int, error)) (int, error) {
+	var wg sync.WaitGroup
+	totals := make([]int, threads)
+	errs := make([]error, threads)
+	for worker := 0; worker < threads; worker++ {
+		wg.Add(1)
+		go func(worker int) {
+			defer wg.Done()
+			for i := worker; i < n; i += threads {
+				count, err := op(i)
+				if err != nil {
+					errs[worker] = err
+					return
+				}
+				totals[worker] += count
+			}
+		}(worker)
+	}
+	wg.Wait()
+	total := 0
+	for worker, err := range errs {
+		if err != nil {
+			return 0, err
+		}
+		total += totals[worker]
+	}
+	return total, nil
+}
+
+// countReadDir counts regular files using the types readdir returns, without a stat.
+func countReadDir(dir string) (int, error) {
+	entries, err := os.ReadDir(dir)
+	if err != nil {
+		return 0, err
+	}
+	files := 0
+	for _, entry := range entries {
+		if entry.Type().IsRegular() {
+			files++
+		}
+	}
+	return files, nil
+}
+
+// countReaddirnamesLstat counts regular files with one Lstat per name.
+func countReaddirnamesLstat(dir string) (int, error) {
+	f, err := os.Open(dir)
+	if err != nil {
+		return 0, err
+	}
+	names, err := f.Readdirnames(-1)
+	f.Close()
+	if err != nil {
+		return 0, err
+	}
+	files := 0
+	for _, name := range names {
+		info, err := os.Lstat(filepath.Join(dir, name))
+		if err != nil {
+			return 0, err
+		}
+		if info.Mode().IsRegular() {
+			files++
+		}
+	}
+	return files, nil
+}
+
+// listTree returns the directories (parents first) and files of a tree,
+// relative to root, and the total size of the files.
+func listTree(root string) ([]string, []string, int64, error) {
+	var dirs, files []string
+	var size int64
+	err := filepath.WalkDir(root, func(path string, entry fs.DirEntry, err error) error {
+		if err != nil || path == root {
+			return err
+		}
+		relative, err := filepath.Rel(root, path)
+		if err != nil {
+			return err
+		}
+		if entry.IsDir() {
+			dirs = append(dirs, relative)
+			return nil
+		}
+		info, err := entry.Info()
+		if err != nil {
+			return err
+		}
+		files = append(files, relative)
+		size += info.Size()
+		return nil
+	})
+	sort.Strings(files)
+	return dirs, files, size, err
+}
+
+func copyTreeFile(src, dst string) error {
+	in, err := os.Open(src)
+	if err != nil {
+		return err
+	}
+	defer in.Close()
+	out, err := os.Create(dst)
+	if err != nil {
+		return err
+	}
+	if _, err := io.Copy(out, in); err != nil {
+		out.Close()
+		return err
+	}
+	return out.Close()
+}
+
+// benchmarkMetadata times file-system metadata operations: Files empty
+// files spread over directories of FilesPerDir entries are created,
+// stat()ed, opened and closed, traversed with ReadDir and with
+// Readdirnames plus Lstat, and removed; then tree_<N>mb/ from the
+// small_files workload is copied file by file and the copy deleted. With
+// Threads > 1 each operation's files (or directories, for traversals) are
+// split over that many goroutines.
+func benchmarkMetadata(job BenchmarkJob) (*MetadataResult, error) {
+	tree := filepath.Join(job.DataDir, fmt.Sprintf("tree_%dmb", job.FileSizeMB))
+	scratch := filepath.Join(job.DataDir, fmt.Sprintf("metadata_%dmb.go.out", job.FileSizeMB))
+
+	if info, err := os.Stat(tree); err != nil || !info.IsDir() {
+		return nil, fmt.Errorf("test tree %s not found (generate the small_files workload)", tree)
+	}
+	if job.Files < 1 || job.FilesPerDir < 1 {
+		return nil, fmt.Errorf("files and files_per_dir must be at least 1, got %d and %d", job.Files, job.FilesPerDir)
+	}
+	if job.Threads < 1 {
+		return nil, fmt.Errorf("threads must be at least 1, got %d", job.Threads)
+	}
+	treeDirs, treeFiles, treeBytes, err := listTree(tree)
+	if err != nil {
+		return nil, err
+	}
+	dirs := make([]string, (job.Files+job.FilesPerDir-1)/job.FilesPerDir)
+	for i := range dirs {
+		dirs[i] = filepath.Join(scratch, fmt.Sprintf("d%04d", i))
+	}
+	paths := make([]string, job.Files)
+	for i := range paths {
+		paths[i] = filepath.Join(dirs[i/job.FilesPerDir], fmt.Sprintf("f%06d", i))
+	}
+	operations := map[string]MetadataOp{}
+	record := func(name string, count int, elapsed time.Duration) {
+		seconds := elapsed.Seconds()
+		operations[name] = MetadataOp{Count: count, Time: seconds, OpsPerSec: float64(count) / seconds}
+	}
+	timed := func(name string, count, n int, op func(i int) (int, error)) (int, error) {
+		startTime := time.Now()
+		total, err := runSplit(job.Threads, n, op)
+		record(name, count, time.Since(startTime))
+		return total, err
+	}
+
+	os.RemoveAll(scratch)
+	defer os.RemoveAll(scratch)
+	for _, dir := range append([]string{scratch}, dirs...) {
+		if err := os.Mkdir(dir, 0o755); err != nil {
+			return nil, err
+		}
+	}
+
+	steps := []struct {
+		name string
+		op   func(path string) error
+	}{
+		{"create", func(path string) error {
+			f, err := os.OpenFile(path, os.O_WRONLY|os.O_CREATE|os.O_EXCL, 0o644)
+			if err != nil {
+				return err
+			}
+			return f.Close()
+		}},
+		{"stat", func(path string) error {
+			_, err := os.Stat(path)
+			return err
+		}},
+		{"open", func(path string) error {
+			f, err := os.Open(path)
+			if err != nil {
+				return err
+			}
+			return f.Close()
+		}},
+	}
+	for _, step := range steps {
+		op := step.op
+		if _, err := timed(step.name, job.Files, len(paths), func(i int) (int, error) {
+			return 0, op(paths[i])
+		}); err != nil {
+			return nil, err
+		}
+	}
+	for _, traversal := range []struct {
+		name  string
+		count func(dir string) (int, error)
+	}{
+		{"scandir", countReadDir},
+		{"listdir_stat", countReaddirnamesLstat},
+	} {
+		count := traversal.count
+		found, err := timed(traversal.name, job.Files, len(dirs), func(i int) (int, error) {
+			return count(dirs[i])
+		})
+		if err != nil {
+			return nil, err
+		}
+		if found != job.Files {
+			return nil, fmt.Errorf("%s found %d files, expected %d", traversal.name, found, job.Files)
+		}
+	}
+	if _, err := timed("unlink", job.Files, len(paths), func(i int) (int, error) {
+		return 0, os.Remove(paths[i])
+	}); err != nil {
+		return nil, err
+	}
+
+	// Tree copy: directories first, then the files
+	copyRoot := filepath.Join(scratch, "tree")
+	startTime := time.Now()
+	for _, dir := range append([]string{"."}, treeDirs...) {
+		if err := os.Mkdir(filepath.Join(copyRoot, dir), 0o755); err != nil {
+			return nil, err
+		}
+	}
+	if _, err := runSplit(job.Threads, len(treeFiles), func(i int) (int, error) {
+		return 0, copyTreeFile(filepath.Join(tree, treeFiles[i]), filepath.Join(copyRoot, treeFiles[i]))
+	}); err != nil {
+		return nil, err
+	}
+	copyTime := time.Since(startTime)
+	record("copy_tree", len(treeFiles), copyTime)
+
+	// Tree delete: the files, then the directories, deepest first
+	startTime = time.Now()
+	if _, err := runSplit(job.Threads, len(treeFiles), func(i int) (int, error) {
+		return 0, os.Remove(filepath.Join(copyRoot, treeFiles[i]))
+	}); err != nil {
+		return nil, err
+	}
+	for i := len(treeDirs) - 1; i >= 0; i-- {
+		if err := os.Remove(filepath.Join(copyRoot, treeDirs[i])); err != nil {
+			return nil, err
+		}
+	}
+	if err := os.Remove(copyRoot); err != nil {
+		return nil, err
+	}
+	record("delete_tree", len(treeFiles), time.Since(startTime))
+
+	return &MetadataResult{
+		Language:              "golang",
+		FileSizeMB:            job.FileSizeMB,
+		Files:                 job.Files,
+		FilesPerDir:           job.FilesPerDir,
+		Threads:               job.Threads,
+		TreeFiles:             len(treeFiles),
+		Operations:            operations,
+		CopyTreeThroughputMBS: float64(treeBytes) / mb / copyTime.Seconds(),
+	}, nil
+}
@@ -0,0 +1,185 @@
+package main
+
+import (
+	"fmt"
+	"io"
+	"math/rand"
+	"os"
+	"path/filepath"
+	"sync"
+	"time"
+)
+
+const (
+	randomBlockSize = 4096 // the usual database page size
+	zipfExponent    = 1.2
+	strideBlocks    = 16
+	scatterPrime    = 2654435761 // spreads Zipf-hot blocks over the file
+)
+
+type RandomResult struct {
+	Language           string  `json:"language"`
+	Pattern            string  `json:"pattern"`
+	FileSizeMB         int     `json:"file_size_mb"`
+	BlockSize          int     `json:"block_size"`
+	QueueDepth         int     `json:"queue_depth"`
+	Ops                int     `json:"ops"`
+	ReadTime           float64 `json:"read_time"`
+	WriteTime          float64 `json:"write_time"`
+	ReadIOPS           float64 `json:"read_iops"`
+	WriteIOPS          float64 `json:"write_iops"`
+	ReadThroughputMBS  float64 `json:"read_throughput_mbs"`
+	WriteThroughputMBS float64 `json:"write_throughput_mbs"`
+}
+
+// randomOffsets returns block-aligned offsets for count operations over a
+// file of blocks blocks: "uniform" picks blocks uniformly, "zipf" by rank
+// with P(k) ~ 1/k^1.2 (hot ranks scattered across the file), and "strided"
+// visits every strideBlocks-th block, shifting by one block on each pass.
+func randomOffsets(pattern string, blocks, count, blockSize int, seed int64) ([]int64, error) {
+	rng := rand.New(rand.NewSource(seed))
+	offsets := make([]int64, count)
+	switch pattern {
+	case "uniform":
+		for i := range offsets {
+			offsets[i] = int64(rng.Intn(blocks)) * int64(blockSize)
+		}
+	case "zipf":
+		zipf := rand.NewZipf(rng, zipfExponent, 1, uint64(blocks-1))
+		for i := range offsets {
+			offsets[i] = int64(zipf.Uint64()*scatterPrime%uint64(blocks)) * int64(blockSize)
+		}
+	case "strided":
+		for i := range offsets {
+			offsets[i] = int64((i*strideBlocks+i*strideBlocks/blocks)%blocks) * int64(blockSize)
+		}
+	default:
+		return nil, fmt.Errorf("unknown access pattern %q", pattern)
+	}
+	return offsets, nil
+}
+
+// runQueue issues every offset from queueDepth goroutines at once.
+func runQueue(queueDepth int, offsets []int64, op func(offset int64, buf []byte) error, blockSize int) error {
+	var wg sync.WaitGroup
+	errs := make([]error, queueDepth)
+	for worker := 0; worker < queueDepth; worker++ {
+		wg.Add(1)
+		go func(worker int) {
+			defer wg.Done()
+			buf := make([]byte, blockSize)
+			for i := worker; i < len(offsets); i += queueDepth {
+				if err := op(offsets[i], buf); err != nil {
+					errs[worker] = err
+					return
+				}
+			}
+		}(worker)
+	}
+	wg.Wait()
+	for _, err := range errs {
+		if err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+func copyFile(src, dst string) error {
+	in, err := os.Open(src)
+	if err != nil {
+		return err
+	}
+	defer in.Close()
+	out, err := os.Create(dst)
+	if err != nil {
+		return err
+	}
+	if _, err := io.Copy(out, in); err != nil {
+		out.Close()
+		return err
+	}
+	return out.Close()
+}
+
+// benchmarkRandom times random-access ReadAt calls on the test file and
+// WriteAt calls on a copy of it. Offsets are drawn before timing starts;
+// the copy that receives the writes is made outside the timing.
+func benchmarkRandom(job BenchmarkJob) (*RandomResult, error) {
+	fileSizeMB, blockSize := job.FileSizeMB, job.BlockSize
+	inputPath := filepath.Join(job.DataDir, fmt.Sprintf("test_%dmb.txt", fileSizeMB))
+	outputPath := filepath.Join(job.DataDir, fmt.Sprintf("test_%dmb.go.out", fileSizeMB))
+
+	if _, err := os.Stat(inputPath); os.IsNotExist(err) {
+		return nil, fmt.Errorf("test file %s not found", inputPath)
+	}
+	if blockSize <= 0 || blockSize > fileSizeMB*mb {
+		return nil, fmt.Errorf("block size must be between 1 and the file size, got %d", blockSize)
+	}
+	if job.QueueDepth < 1 {
+		return nil, fmt.Errorf("queue depth must be at least 1, got %d", job.QueueDepth)
+	}
+	blocks := fileSizeMB * mb / blockSize
+	ops := job.Ops
+	if ops <= 0 {
+		ops = blocks
+	}
+	offsets, err := randomOffsets(job.Pattern, blocks, ops, blockSize, job.Seed)
+	if err != nil {
+		return nil, err
+	}
+
+	// Read test
+	fin, err := os.Open(inputPath)
+	if err != nil {
+		return nil, err
+	}
+	defer fin.Close()
+	startTime := time.Now()
+	err = runQueue(job.QueueDepth, offsets, func(offset int64, buf []byte) error {
+		_, err := fin.ReadAt(buf, offset)
+		return err
+	}, blockSize)
+	readTime := time.Since(startTime).Seconds()
+	if err != nil {
+		return nil, err
+	}
+
+	// Write test, into a copy so the input stays intact
+	if err := copyFile(inputPath, outputPath); err != nil {
+		return nil, err
+	}
+	defer os.Remove(outputPath)
+	fout, err := os.OpenFile(outputPath, os.O_WRONLY, 0)
+	if err != nil {
+		return nil, err
+	}
+	defer fout.Close()
+	block := make([]byte, blockSize)
+	rand.New(rand.NewSource(job.Seed)).Read(block)
+	startTime = time.Now()
+	err = runQueue(job.QueueDepth, offsets, func(offset int64, _ []byte) error {
+		_, err := fout.WriteAt(block, offset)
+		return err
+	}, blockSize)
+	writeTime := time.Since(startTime).Seconds()
+	if err != nil {
+		return nil, err
+	}
+
+	totalMB := float64(ops) * float64(blockSize) / mb
+	return &RandomResult{
+		Language:           "golang",
+		Pattern:            job.Pattern,
+		FileSizeMB:         fileSizeMB,
+		BlockSize:          blockSize,
+		QueueDepth:         job.QueueDepth,
+		Ops:                ops,
+		ReadTime:           readTime,
+		WriteTime:          writeTime,
+		ReadIOPS:           float64(ops) / readTime,
+		WriteIOPS:          float64(ops) / writeTime,
+		ReadThroughputMBS:  totalMB / readTime,
+		WriteThroughputMBS: totalMB / writeTime,
+	}, nil
+}
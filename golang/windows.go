@@ -0,0 +1,52 @@
+package main
+
+import "time"
+
+// ThroughputWindow is the data moved in one window of a copy or read.
+type ThroughputWindow struct {
+	EndS          float64 `json:"end_s"`
+	MB            float64 `json:"mb"`
+	ThroughputMBS float64 `json:"throughput_mbs"`
+}
+
+// throughputWindows records MB moved per time window while a copy or read
+// runs, so throughput cliffs (dirty pages or page cache running out) show
+// up instead of being averaged away. A window closes on the first add
+// after the window length has passed.
+type throughputWindows struct {
+	window      time.Duration
+	start       time.Time
+	windowStart time.Time
+	bytes       int
+	windows     []ThroughputWindow
+}
+
+func newThroughputWindows(windowMS int) *throughputWindows {
+	now := time.Now()
+	return &throughputWindows{window: time.Duration(windowMS) * time.Millisecond, start: now, windowStart: now}
+}
+
+func (w *throughputWindows) add(n int) {
+	w.bytes += n
+	if now := time.Now(); now.Sub(w.windowStart) >= w.window {
+		w.close(now)
+	}
+}
+
+func (w *throughputWindows) close(now time.Time) {
+	w.windows = append(w.windows, ThroughputWindow{
+		EndS:          now.Sub(w.start).Seconds(),
+		MB:            float64(w.bytes) / mb,
+		ThroughputMBS: float64(w.bytes) / mb / now.Sub(w.windowStart).Seconds(),
+	})
+	w.windowStart = now
+	w.bytes = 0
+}
+
+// finish closes the last, partial window and returns every window.
+func (w *throughputWindows) finish() []ThroughputWindow {
+	if w.bytes > 0 {
+		w.close(time.Now())
+	}
+	return w.windows
+}
@@ -46,6 +46,26 @@ application {
     mainClass = "org.example.AppKt"
 }
 
+tasks.named<JavaExec>("run") {
+    // Forward stdin so the benchmark can run as a persistent worker
+    standardInput = System.`in`
+}
+
+// Self-contained jar so the benchmark runner can use `java -jar` without Gradle
+tasks.register<Jar>("fatJar") {
+    archiveClassifier = "all"
+    manifest {
+        attributes["Main-Class"] = "org.example.AppKt"
+    }
+    duplicatesStrategy = DuplicatesStrategy.EXCLUDE
+    from(sourceSets.main.get().output)
+    dependsOn(configurations.runtimeClasspath)
+    from({
+        configurations.runtimeClasspath.get().filter { it.name.endsWith("jar") }.map { zipTree(it) }
+    })
+    exclude("META-INF/*.SF", "META-INF/*.DSA", "META-INF/*.RSA")
+}
+
 tasks.named<Test>("test") {
     // Use JUnit Platform for unit tests.
     useJUnitPlatform()
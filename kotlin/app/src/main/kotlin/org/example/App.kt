@@ -1,10 +1,19 @@
 package org.example
 
 import com.google.gson.Gson
+import com.google.gson.GsonBuilder
+import java.io.BufferedReader
 import java.io.File
 import java.io.FileInputStream
 import java.io.FileOutputStream
-import kotlin.system.measureTimeMillis
+import java.io.PrintStream
+
+const val DEFAULT_BLOCK_SIZE = 8192
+const val MB = 1024L * 1024L
+const val DEFAULT_DATA_DIR = "../../data" // holds test_<N>mb.txt; outputs are written next to it
+
+// Results keep the same schema as Python and Go, including null fields
+private val gson: Gson = GsonBuilder().serializeNulls().create()
 
 data class BenchmarkResult(
     val language: String,
@@ -12,38 +21,208 @@ data class BenchmarkResult(
     val read_time: Double,
     val write_time: Double,
     val read_throughput_mbs: Double,
-    val write_throughput_mbs: Double
+    val write_throughput_mbs: Double,
+    val block_size: Int = DEFAULT_BLOCK_SIZE,
+    val durability: String = "none",
+    val sync_every_mb: Int = 0,
+    val durable_time: Double? = null,
+    val durable_throughput_mbs: Double? = null,
+    val latency: Map<String, LatencySummary>? = null,
+    val windows: Map<String, List<ThroughputWindow>>? = null
+)
+
+data class BenchmarkOptions(
+    val fileSizeMB: Int,
+    val blockSize: Int = DEFAULT_BLOCK_SIZE,
+    val durability: String = "none",
+    val syncEveryMB: Int = 0,
+    val latency: Boolean = false,
+    val windowMs: Int = 0,
+    val dataDir: String = DEFAULT_DATA_DIR,
+    val pattern: String? = null,
+    val queueDepth: Int = 1,
+    val ops: Int = 0,
+    val seed: Long = 0,
+    val metadata: Boolean = false,
+    val files: Int = METADATA_FILES,
+    val filesPerDir: Int = FILES_PER_DIR,
+    val threads: Int = 1
 )
 
-fun benchmarkIO(fileSizeMB: Int): BenchmarkResult {
-    val inputPath = "../../data/test_${fileSizeMB}mb.txt"
-    val outputPath = "../../data/test_${fileSizeMB}mb.kt.out"
+data class BenchmarkJob(
+    val file_size_mb: Int = 0,
+    val block_size: Int = 0,
+    val durability: String = "none",
+    val sync_every_mb: Int = 0,
+    val latency: Boolean = false,
+    val window_ms: Int = 0,
+    val data_dir: String? = null,
+    val pattern: String? = null,
+    val queue_depth: Int = 1,
+    val ops: Int = 0,
+    val seed: Long = 0,
+    val metadata: Boolean = false,
+    val files: Int = METADATA_FILES,
+    val files_per_dir: Int = FILES_PER_DIR,
+    val threads: Int = 1
+) {
+    fun toOptions() = BenchmarkOptions(
+        fileSizeMB = file_size_mb,
+        blockSize = when {
+            block_size > 0 -> block_size
+            pattern != null -> RANDOM_BLOCK_SIZE
+            else -> DEFAULT_BLOCK_SIZE
+        },
+        durability = durability,
+        syncEveryMB = sync_every_mb,
+        latency = latency,
+        windowMs = window_ms,
+        dataDir = data_dir ?: DEFAULT_DATA_DIR,
+        pattern = pattern,
+        queueDepth = queue_depth,
+        ops = ops,
+        seed = seed,
+        metadata = metadata,
+        files = files,
+        filesPerDir = files_per_dir,
+        threads = threads
+    )
+}
+
+fun parseArgs(args: Array<String>): BenchmarkOptions {
+    var fileSizeMB: Int? = null
+    var blockSize: Int? = null
+    var options = BenchmarkOptions(fileSizeMB = 0)
+    var i = 0
+    while (i < args.size) {
+        val arg = args[i]
+        fun value() = args.getOrNull(++i) ?: throw IllegalArgumentException("$arg requires a value")
+        when (arg) {
+            "--block-size" -> blockSize = value().toInt()
+            "--durability" -> options = options.copy(durability = value())
+            "--sync-every-mb" -> options = options.copy(syncEveryMB = value().toInt())
+            "--latency" -> options = options.copy(latency = true)
+            "--window-ms" -> options = options.copy(windowMs = value().toInt())
+            "--data-dir" -> options = options.copy(dataDir = value())
+            "--pattern" -> options = options.copy(pattern = value())
+            "--queue-depth" -> options = options.copy(queueDepth = value().toInt())
+            "--ops" -> options = options.copy(ops = value().toInt())
+            "--seed" -> options = options.copy(seed = value().toLong())
+            "--metadata" -> options = options.copy(metadata = true)
+            "--files" -> options = options.copy(files = value().toInt())
+            "--files-per-dir" -> options = options.copy(filesPerDir = value().toInt())
+            "--threads" -> options = options.copy(threads = value().toInt())
+            else -> fileSizeMB = arg.toInt()
+        }
+        i++
+    }
+    return options.copy(
+        fileSizeMB = fileSizeMB ?: throw IllegalArgumentException("Missing <file_size_mb>"),
+        blockSize = blockSize ?: if (options.pattern != null) RANDOM_BLOCK_SIZE else DEFAULT_BLOCK_SIZE
+    )
+}
+
+/**
+ * Applies a durability level to an open output stream. FileOutputStream is
+ * unbuffered, so "flush" only hands over what the JVM holds; "fdatasync"
+ * maps to FileChannel.force(false), which skips metadata.
+ */
+fun syncStream(fout: FileOutputStream, durability: String) {
+    when (durability) {
+        "none" -> {}
+        "flush" -> fout.flush()
+        "fsync" -> {
+            fout.flush()
+            fout.fd.sync()
+        }
+        "fdatasync" -> {
+            fout.flush()
+            fout.channel.force(false)
+        }
+        else -> throw IllegalArgumentException("Unknown durability level $durability")
+    }
+}
+
+fun runBenchmark(options: BenchmarkOptions): BenchmarkResult = benchmarkIO(
+    options.fileSizeMB, options.blockSize, options.durability, options.syncEveryMB,
+    options.latency, options.dataDir, options.windowMs
+)
+
+/** Runs a copy benchmark, a metadata one if asked, or a random-access one if a pattern is given */
+fun runJob(options: BenchmarkOptions): Any = when {
+    options.metadata -> benchmarkMetadata(options)
+    options.pattern != null -> benchmarkRandom(options)
+    else -> runBenchmark(options)
+}
+
+fun benchmarkIO(
+    fileSizeMB: Int,
+    blockSize: Int = DEFAULT_BLOCK_SIZE,
+    durability: String = "none",
+    syncEveryMB: Int = 0,
+    latency: Boolean = false,
+    dataDir: String = DEFAULT_DATA_DIR,
+    windowMs: Int = 0
+): BenchmarkResult {
+    val inputPath = File(dataDir, "test_${fileSizeMB}mb.txt").path
+    val outputPath = File(dataDir, "test_${fileSizeMB}mb.kt.out").path
     
     // Check if input file exists
     if (!File(inputPath).exists()) {
         throw IllegalArgumentException("Test file $inputPath not found")
     }
+    require(blockSize > 0) { "Block size must be positive, got $blockSize" }
+    require(windowMs >= 0) { "Window must not be negative, got ${windowMs}ms" }
+
+    // With latency, every write() of the copy and read() of the read test is timed
+    val histograms = if (latency) mapOf("read" to LatencyHistogram(), "write" to LatencyHistogram()) else null
+    val writeLatency = histograms?.get("write")
+    val readLatency = histograms?.get("read")
 
-    // Write test (copy file)
-    val writeTime = measureTimeMillis {
-        FileInputStream(inputPath).use { fin ->
-            FileOutputStream(outputPath).use { fout ->
-                val buffer = ByteArray(8192)
-                var length: Int
-                while (fin.read(buffer).also { length = it } > 0) {
-                    fout.write(buffer, 0, length)
+    // Write test (copy file); the final sync counts towards durable time only
+    var syncNanos = 0L
+    // With windowMs, throughput is also recorded per window of each test
+    val writeWindows = if (windowMs > 0) ThroughputWindows(windowMs) else null
+    val writeStart = System.nanoTime()
+    FileInputStream(inputPath).use { fin ->
+        FileOutputStream(outputPath).use { fout ->
+            val buffer = ByteArray(blockSize)
+            var length: Int
+            var pending = 0L
+            while (fin.read(buffer).also { length = it } > 0) {
+                val start = System.nanoTime()
+                fout.write(buffer, 0, length)
+                writeLatency?.record(System.nanoTime() - start)
+                writeWindows?.add(length)
+                pending += length
+                if (syncEveryMB > 0 && pending >= syncEveryMB * MB) {
+                    pending = 0
+                    syncStream(fout, durability)
                 }
             }
+            val syncStart = System.nanoTime()
+            syncStream(fout, durability)
+            syncNanos = System.nanoTime() - syncStart
         }
-    } / 1000.0
+    }
+    val totalWriteNanos = System.nanoTime() - writeStart
+    val writeTime = (totalWriteNanos - syncNanos) / 1e9
+    val durableTime = if (durability != "none") totalWriteNanos / 1e9 else null
 
     // Read test
-    val readTime = measureTimeMillis {
-        FileInputStream(outputPath).use { fin ->
-            val buffer = ByteArray(8192)
-            while (fin.read(buffer) != -1) {}
+    val readWindows = if (windowMs > 0) ThroughputWindows(windowMs) else null
+    val readStart = System.nanoTime()
+    FileInputStream(outputPath).use { fin ->
+        val buffer = ByteArray(blockSize)
+        while (true) {
+            val start = System.nanoTime()
+            val length = fin.read(buffer)
+            readLatency?.record(System.nanoTime() - start)
+            if (length == -1) break
+            readWindows?.add(length)
         }
-    } / 1000.0
+    }
+    val readTime = (System.nanoTime() - readStart) / 1e9
 
     // Clean up output file
     File(outputPath).delete()
@@ -54,20 +233,47 @@ fun benchmarkIO(fileSizeMB: Int): BenchmarkResult {
         read_time = readTime,
         write_time = writeTime,
         read_throughput_mbs = if (readTime > 0) fileSizeMB / readTime else 0.0,
-        write_throughput_mbs = if (writeTime > 0) fileSizeMB / writeTime else 0.0
+        write_throughput_mbs = if (writeTime > 0) fileSizeMB / writeTime else 0.0,
+        block_size = blockSize,
+        durability = durability,
+        sync_every_mb = syncEveryMB,
+        durable_time = durableTime,
+        durable_throughput_mbs = durableTime?.let { if (it > 0) fileSizeMB / it else 0.0 },
+        latency = histograms?.mapValues { it.value.summary() },
+        windows = if (readWindows != null && writeWindows != null)
+            mapOf("read" to readWindows.finish(), "write" to writeWindows.finish()) else null
     )
 }
 
+/**
+ * Runs benchmark jobs read as JSON lines until EOF, answering each with one
+ * JSON line holding the result or an error, so the JVM is started and
+ * warmed up once for a whole run.
+ */
+fun serveWorker(input: BufferedReader, output: PrintStream) {
+    input.lineSequence().filter { it.isNotBlank() }.forEach { line ->
+        val response: Any = try {
+            runJob(gson.fromJson(line, BenchmarkJob::class.java).toOptions())
+        } catch (e: Exception) {
+            mapOf("error" to (e.message ?: e.toString()))
+        }
+        output.println(gson.toJson(response))
+        output.flush()
+    }
+}
+
 fun main(args: Array<String>) {
+    if (args.contains("--worker")) {
+        serveWorker(System.`in`.bufferedReader(), System.out)
+        return
+    }
     if (args.isEmpty()) {
-        System.err.println("Usage: kotlin App <file_size_mb>")
+        System.err.println("Usage: kotlin App [--block-size N] [--durability LEVEL] [--sync-every-mb N] [--latency] [--window-ms N] [--data-dir DIR] [--pattern P --queue-depth N --ops N --seed N] [--metadata --files N --files-per-dir N --threads N] <file_size_mb> | --worker")
         System.exit(1)
     }
 
     try {
-        val fileSizeMB = args[0].toInt()
-        val result = benchmarkIO(fileSizeMB)
-        val gson = Gson()
+        val result = runJob(parseArgs(args))
         println(gson.toJson(result))
     } catch (e: Exception) {
         System.err.println("Benchmark failed: ${e.message}")
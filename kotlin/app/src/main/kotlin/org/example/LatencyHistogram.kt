@@ -0,0 +1,79 @@
+package org.example
+
+import kotlin.math.ceil
+
+data class LatencySummary(
+    val count: Long,
+    val mean_us: Double,
+    val p50_us: Double,
+    val p99_us: Double,
+    val p999_us: Double,
+    val max_us: Double
+)
+
+/**
+ * Log-linear histogram of nanosecond latencies in the style of HdrHistogram.
+ * Every power of two is split into SUB_BUCKETS linear buckets, so a value is
+ * reported to within 1/SUB_BUCKETS (under 1%). Counts live in a
+ * preallocated array, so recording never allocates.
+ */
+class LatencyHistogram {
+    companion object {
+        const val SUB_BUCKET_BITS = 7
+        const val SUB_BUCKETS = 1 shl SUB_BUCKET_BITS
+        const val MAX_EXPONENT = 40 // up to ~2^48 ns (3 days); larger values are clamped
+    }
+
+    private val counts = LongArray((MAX_EXPONENT + 2) * SUB_BUCKETS)
+    var total = 0L
+        private set
+    private var sum = 0L
+    var max = 0L
+        private set
+
+    private fun index(value: Long): Int {
+        val exponent = (64 - java.lang.Long.numberOfLeadingZeros(value)) - SUB_BUCKET_BITS - 1
+        return when {
+            exponent <= 0 -> value.toInt()
+            exponent > MAX_EXPONENT -> counts.size - 1
+            else -> exponent * SUB_BUCKETS + (value shr exponent).toInt()
+        }
+    }
+
+    /** Largest value that lands in bucket [index] */
+    private fun highestEquivalent(index: Int): Long {
+        if (index < 2 * SUB_BUCKETS) return index.toLong()
+        val exponent = index / SUB_BUCKETS - 1
+        val mantissa = (index - exponent * SUB_BUCKETS).toLong()
+        return ((mantissa + 1) shl exponent) - 1
+    }
+
+    fun record(nanos: Long) {
+        val value = nanos.coerceAtLeast(0)
+        counts[index(value)]++
+        total++
+        sum += value
+        if (value > max) max = value
+    }
+
+    /** Value at percentile [p] (0-100), in nanoseconds */
+    fun percentile(p: Double): Long {
+        if (total == 0L) return 0
+        val target = ceil(p / 100 * total).toLong().coerceAtLeast(1)
+        var seen = 0L
+        for (index in counts.indices) {
+            seen += counts[index]
+            if (seen >= target) return minOf(highestEquivalent(index), max)
+        }
+        return max
+    }
+
+    fun summary() = LatencySummary(
+        count = total,
+        mean_us = if (total > 0) sum.toDouble() / total / 1000 else 0.0,
+        p50_us = percentile(50.0) / 1000.0,
+        p99_us = percentile(99.0) / 1000.0,
+        p999_us = percentile(99.9) / 1000.0,
+        max_us = max / 1000.0
+    )
+}
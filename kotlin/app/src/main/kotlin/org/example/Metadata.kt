@@ -0,0 +1,157 @@
+package org.example
+
+import java.io.File
+import java.nio.file.FileVisitResult
+import java.nio.file.Files
+import java.nio.file.LinkOption
+import java.nio.file.Path
+import java.nio.file.SimpleFileVisitor
+import java.nio.file.attribute.BasicFileAttributes
+import java.util.concurrent.Callable
+import java.util.concurrent.Executors
+
+const val METADATA_FILES = 10000
+const val FILES_PER_DIR = 1000
+
+data class MetadataOp(
+    val count: Int,
+    val time: Double,
+    val ops_per_sec: Double
+)
+
+data class MetadataResult(
+    val language: String,
+    val file_size_mb: Int,
+    val files: Int,
+    val files_per_dir: Int,
+    val threads: Int,
+    val tree_files: Int,
+    val operations: Map<String, MetadataOp>,
+    val copy_tree_throughput_mbs: Double
+)
+
+/** Calls [op] for every index below [n] from [threads] threads, each taking an interleaved share; returns the sum */
+fun runSplit(threads: Int, n: Int, op: (Int) -> Int): Int {
+    fun share(worker: Int): Int {
+        var total = 0
+        for (i in worker until n step threads) total += op(i)
+        return total
+    }
+    if (threads == 1) return share(0)
+    val pool = Executors.newFixedThreadPool(threads)
+    try {
+        return (0 until threads).map { worker -> pool.submit(Callable { share(worker) }) }.sumOf { it.get() }
+    } finally {
+        pool.shutdown()
+    }
+}
+
+/**
+ * Counts regular files with the attributes the directory walk reads along
+ * with the listing; the JVM has no access to readdir's file types, so this
+ * is its closest match to os.scandir.
+ */
+fun countWalked(dir: Path): Int {
+    var files = 0
+    Files.walkFileTree(dir, emptySet(), 1, object : SimpleFileVisitor<Path>() {
+        override fun visitFile(file: Path, attrs: BasicFileAttributes): FileVisitResult {
+            if (attrs.isRegularFile) files++
+            return FileVisitResult.CONTINUE
+        }
+    })
+    return files
+}
+
+/** Counts regular files the listdir way: the names, then one lstat per name */
+fun countListedLstat(dir: Path): Int {
+    val names = dir.toFile().list() ?: throw IllegalStateException("Cannot list $dir")
+    return names.count { name ->
+        Files.readAttributes(dir.resolve(name), BasicFileAttributes::class.java, LinkOption.NOFOLLOW_LINKS).isRegularFile
+    }
+}
+
+/**
+ * Times file-system metadata operations: [BenchmarkOptions.files] empty
+ * files spread over directories of [BenchmarkOptions.filesPerDir] entries
+ * are created, stat()ed, opened and closed, traversed two ways and
+ * deleted; then tree_<N>mb/ from the small_files workload is copied file
+ * by file and the copy deleted. With more than one thread each operation's
+ * files (or directories, for traversals) are split over a thread pool.
+ */
+fun benchmarkMetadata(options: BenchmarkOptions): MetadataResult {
+    val files = options.files
+    val filesPerDir = options.filesPerDir
+    val threads = options.threads
+    val tree = File(options.dataDir, "tree_${options.fileSizeMB}mb").toPath()
+    val scratch = File(options.dataDir, "metadata_${options.fileSizeMB}mb.kt.out").toPath()
+
+    if (!Files.isDirectory(tree)) {
+        throw IllegalArgumentException("Test tree $tree not found (generate the small_files workload)")
+    }
+    require(files >= 1 && filesPerDir >= 1) {
+        "files and files_per_dir must be at least 1, got $files and $filesPerDir"
+    }
+    require(threads >= 1) { "Threads must be at least 1, got $threads" }
+    val treeEntries = Files.walk(tree).use { stream -> stream.skip(1).map { tree.relativize(it) }.toList() }.sorted()
+    val treeDirs = treeEntries.filter { Files.isDirectory(tree.resolve(it)) }
+    val treeFiles = treeEntries.filter { Files.isRegularFile(tree.resolve(it)) }
+    val treeBytes = treeFiles.sumOf { Files.size(tree.resolve(it)) }
+    val dirs = List((files + filesPerDir - 1) / filesPerDir) { scratch.resolve("d%04d".format(it)) }
+    val paths = List(files) { dirs[it / filesPerDir].resolve("f%06d".format(it)) }
+    val operations = linkedMapOf<String, MetadataOp>()
+
+    fun record(name: String, count: Int, nanos: Long) {
+        val seconds = nanos / 1e9
+        operations[name] = MetadataOp(count, seconds, if (seconds > 0) count / seconds else 0.0)
+    }
+    fun timed(name: String, count: Int, n: Int, op: (Int) -> Int): Int {
+        val start = System.nanoTime()
+        val total = runSplit(threads, n, op)
+        record(name, count, System.nanoTime() - start)
+        return total
+    }
+
+    scratch.toFile().deleteRecursively()
+    try {
+        Files.createDirectory(scratch)
+        dirs.forEach { Files.createDirectory(it) }
+        timed("create", files, files) { Files.createFile(paths[it]); 0 }
+        timed("stat", files, files) { Files.readAttributes(paths[it], BasicFileAttributes::class.java); 0 }
+        timed("open", files, files) { Files.newByteChannel(paths[it]).close(); 0 }
+        for ((name, count) in listOf("scandir" to ::countWalked, "listdir_stat" to ::countListedLstat)) {
+            val found = timed(name, files, dirs.size) { count(dirs[it]) }
+            check(found == files) { "$name found $found files, expected $files" }
+        }
+        timed("unlink", files, files) { Files.delete(paths[it]); 0 }
+
+        // Tree copy: directories first, then the files
+        val copy = scratch.resolve("tree")
+        var start = System.nanoTime()
+        Files.createDirectory(copy)
+        treeDirs.forEach { Files.createDirectory(copy.resolve(it)) }
+        runSplit(threads, treeFiles.size) { Files.copy(tree.resolve(treeFiles[it]), copy.resolve(treeFiles[it])); 0 }
+        val copyNanos = System.nanoTime() - start
+        record("copy_tree", treeFiles.size, copyNanos)
+
+        // Tree delete: the files, then the directories, deepest first
+        start = System.nanoTime()
+        runSplit(threads, treeFiles.size) { Files.delete(copy.resolve(treeFiles[it])); 0 }
+        treeDirs.asReversed().forEach { Files.delete(copy.resolve(it)) }
+        Files.delete(copy)
+        record("delete_tree", treeFiles.size, System.nanoTime() - start)
+
+        val copySeconds = copyNanos / 1e9
+        return MetadataResult(
+            language = "kotlin",
+            file_size_mb = options.fileSizeMB,
+            files = files,
+            files_per_dir = filesPerDir,
+            threads = threads,
+            tree_files = treeFiles.size,
+            operations = operations,
+            copy_tree_throughput_mbs = if (copySeconds > 0) treeBytes.toDouble() / MB / copySeconds else 0.0
+        )
+    } finally {
+        scratch.toFile().deleteRecursively()
+    }
+}
@@ -0,0 +1,148 @@
+package org.example
+
+import java.io.File
+import java.nio.ByteBuffer
+import java.nio.channels.FileChannel
+import java.nio.file.StandardOpenOption
+import java.util.Arrays
+import java.util.concurrent.Executors
+import kotlin.math.pow
+import kotlin.random.Random
+
+const val RANDOM_BLOCK_SIZE = 4096 // the usual database page size
+const val ZIPF_EXPONENT = 1.2
+const val STRIDE_BLOCKS = 16
+const val SCATTER_PRIME = 2654435761L // spreads Zipf-hot blocks over the file
+
+data class RandomResult(
+    val language: String,
+    val pattern: String,
+    val file_size_mb: Int,
+    val block_size: Int,
+    val queue_depth: Int,
+    val ops: Int,
+    val read_time: Double,
+    val write_time: Double,
+    val read_iops: Double,
+    val write_iops: Double,
+    val read_throughput_mbs: Double,
+    val write_throughput_mbs: Double
+)
+
+/**
+ * Block-aligned offsets for [count] operations over a file of [blocks]
+ * blocks: "uniform" picks blocks uniformly, "zipf" by rank with
+ * P(k) ~ 1/k^1.2 (hot ranks scattered across the file), and "strided" visits
+ * every STRIDE_BLOCKS-th block, shifting by one block on each pass.
+ */
+fun randomOffsets(pattern: String, blocks: Int, count: Int, blockSize: Int, seed: Long): LongArray {
+    val rng = Random(seed)
+    val indexes = when (pattern) {
+        "uniform" -> LongArray(count) { rng.nextInt(blocks).toLong() }
+        "zipf" -> {
+            val cumulative = DoubleArray(blocks)
+            var total = 0.0
+            for (rank in 1..blocks) {
+                total += rank.toDouble().pow(-ZIPF_EXPONENT)
+                cumulative[rank - 1] = total
+            }
+            LongArray(count) {
+                val found = Arrays.binarySearch(cumulative, rng.nextDouble() * total)
+                val rank = if (found < 0) -found - 1 else found
+                rank * SCATTER_PRIME % blocks
+            }
+        }
+        "strided" -> LongArray(count) { i ->
+            val step = i.toLong() * STRIDE_BLOCKS
+            (step + step / blocks) % blocks
+        }
+        else -> throw IllegalArgumentException("Unknown access pattern $pattern")
+    }
+    return LongArray(count) { indexes[it] * blockSize }
+}
+
+/** Issues every offset from [queueDepth] threads at once, each with its own buffer */
+private fun runQueue(
+    queueDepth: Int,
+    offsets: LongArray,
+    newBuffer: () -> ByteBuffer,
+    op: (Long, ByteBuffer) -> Unit
+) {
+    fun share(worker: Int) {
+        val buffer = newBuffer()
+        for (i in worker until offsets.size step queueDepth) op(offsets[i], buffer)
+    }
+    if (queueDepth == 1) return share(0)
+    val pool = Executors.newFixedThreadPool(queueDepth)
+    try {
+        (0 until queueDepth).map { worker -> pool.submit(Runnable { share(worker) }) }.forEach { it.get() }
+    } finally {
+        pool.shutdown()
+    }
+}
+
+/**
+ * Times random-access positional reads of the test file and writes into a
+ * copy of it. Offsets are drawn before timing starts; the copy that
+ * receives the writes is made outside the timing.
+ */
+fun benchmarkRandom(options: BenchmarkOptions): RandomResult {
+    val fileSizeMB = options.fileSizeMB
+    val blockSize = options.blockSize
+    val pattern = options.pattern ?: "uniform"
+    val input = File(options.dataDir, "test_${fileSizeMB}mb.txt")
+    val output = File(options.dataDir, "test_${fileSizeMB}mb.kt.out")
+
+    if (!input.exists()) {
+        throw IllegalArgumentException("Test file ${input.path} not found")
+    }
+    require(blockSize > 0 && blockSize <= fileSizeMB * MB) {
+        "Block size must be between 1 and the file size, got $blockSize"
+    }
+    require(options.queueDepth >= 1) { "Queue depth must be at least 1, got ${options.queueDepth}" }
+    val blocks = (fileSizeMB * MB / blockSize).toInt()
+    val ops = if (options.ops > 0) options.ops else blocks
+    val offsets = randomOffsets(pattern, blocks, ops, blockSize, options.seed)
+
+    // Read test
+    val readTime = FileChannel.open(input.toPath(), StandardOpenOption.READ).use { channel ->
+        val readStart = System.nanoTime()
+        runQueue(options.queueDepth, offsets, { ByteBuffer.allocateDirect(blockSize) }) { offset, buffer ->
+            buffer.clear()
+            while (buffer.hasRemaining() && channel.read(buffer, offset + buffer.position()) > 0) {}
+        }
+        (System.nanoTime() - readStart) / 1e9
+    }
+
+    // Write test, into a copy so the input stays intact
+    input.copyTo(output, overwrite = true)
+    val block = Random(options.seed).nextBytes(blockSize)
+    val writeTime = try {
+        FileChannel.open(output.toPath(), StandardOpenOption.WRITE).use { channel ->
+            val writeStart = System.nanoTime()
+            runQueue(options.queueDepth, offsets, { ByteBuffer.allocateDirect(blockSize).put(block) }) { offset, buffer ->
+                buffer.rewind()
+                while (buffer.hasRemaining()) channel.write(buffer, offset + buffer.position())
+            }
+            (System.nanoTime() - writeStart) / 1e9
+        }
+    } finally {
+        output.delete()
+    }
+
+    val totalMB = ops.toDouble() * blockSize / MB
+    return RandomResult(
+        language = "kotlin",
+        pattern = pattern,
+        file_size_mb = fileSizeMB,
+        block_size = blockSize,
+        queue_depth = options.queueDepth,
+        ops = ops,
+        read_time = readTime,
+        write_time = writeTime,
+        read_iops = ops / readTime,
+        write_iops = ops / writeTime,
+        read_throughput_mbs = totalMB / readTime,
+        write_throughput_mbs = totalMB / writeTime
+    )
+}
@@ -0,0 +1,41 @@
+package org.example
+
+data class ThroughputWindow(
+    val end_s: Double,
+    val mb: Double,
+    val throughput_mbs: Double
+)
+
+/**
+ * Records MB moved per time window while a copy or read runs, so throughput
+ * cliffs (dirty pages or page cache running out) show up instead of being
+ * averaged away. A window closes on the first [add] after [windowMs] has
+ * passed.
+ */
+class ThroughputWindows(windowMs: Int) {
+    private val windowNanos = windowMs * 1_000_000L
+    private val start = System.nanoTime()
+    private var windowStart = start
+    private var bytes = 0L
+    private val windows = mutableListOf<ThroughputWindow>()
+
+    fun add(n: Int) {
+        bytes += n
+        val now = System.nanoTime()
+        if (now - windowStart >= windowNanos) close(now)
+    }
+
+    private fun close(now: Long) {
+        val seconds = (now - windowStart) / 1e9
+        windows.add(ThroughputWindow((now - start) / 1e9, bytes.toDouble() / MB,
+            if (seconds > 0) bytes.toDouble() / MB / seconds else 0.0))
+        windowStart = now
+        bytes = 0
+    }
+
+    /** Closes the last, partial window and returns every window */
+    fun finish(): List<ThroughputWindow> {
+        if (bytes > 0) close(System.nanoTime())
+        return windows
+    }
+}
@@ -38,4 +38,76 @@ class AppTest {
         assertEquals(10.0, result.read_throughput_mbs)
         assertEquals(5.0, result.write_throughput_mbs)
     }
+    
+    @Test fun parseArgsReadsBlockSize() {
+        val options = parseArgs(arrayOf("--block-size", "65536", "10"))
+        
+        assertEquals(10, options.fileSizeMB)
+        assertEquals(65536, options.blockSize)
+        assertEquals(DEFAULT_BLOCK_SIZE, parseArgs(arrayOf("10")).blockSize)
+    }
+    
+    @Test fun parseArgsReadsDurability() {
+        val options = parseArgs(arrayOf("--durability", "fsync", "--sync-every-mb", "4", "10"))
+        
+        assertEquals("fsync", options.durability)
+        assertEquals(4, options.syncEveryMB)
+        assertEquals("none", parseArgs(arrayOf("10")).durability)
+    }
+    
+    @Test fun latencyHistogramReportsPercentiles() {
+        val histogram = LatencyHistogram()
+        for (nanos in 1L..1000L) histogram.record(nanos * 1000)
+        
+        assertEquals(1000L, histogram.total)
+        assertEquals(1_000_000L, histogram.max)
+        // Buckets are accurate to within 1/128
+        assertTrue(Math.abs(histogram.percentile(50.0) - 500_000L) <= 500_000L / 128)
+        assertTrue(Math.abs(histogram.percentile(99.0) - 990_000L) <= 990_000L / 128)
+        assertEquals(1000.0, histogram.summary().max_us)
+        assertTrue(parseArgs(arrayOf("--latency", "10")).latency)
+    }
+    
+    @Test fun randomOffsetsStayBlockAlignedInsideFile() {
+        for (pattern in listOf("uniform", "zipf", "strided")) {
+            val offsets = randomOffsets(pattern, blocks = 100, count = 1000, blockSize = 4096, seed = 1)
+            
+            assertEquals(1000, offsets.size)
+            assertTrue(offsets.all { it % 4096 == 0L && it in 0L until 100L * 4096 })
+        }
+        assertEquals(RANDOM_BLOCK_SIZE, parseArgs(arrayOf("--pattern", "zipf", "10")).blockSize)
+    }
+    
+    @Test fun runSplitCoversEveryIndexOnce() {
+        val seen = java.util.concurrent.ConcurrentHashMap.newKeySet<Int>()
+        val total = runSplit(threads = 3, n = 100) { seen.add(it); it }
+        
+        assertEquals(100, seen.size)
+        assertEquals((0 until 100).sum(), total)
+    }
+    
+    @Test fun parseArgsReadsMetadataOptions() {
+        val options = parseArgs(arrayOf("--metadata", "--files", "500", "--threads", "4", "1"))
+        
+        assertTrue(options.metadata)
+        assertEquals(500, options.files)
+        assertEquals(4, options.threads)
+        assertEquals(FILES_PER_DIR, options.filesPerDir)
+        assertEquals(100000, parseArgs(arrayOf("--metadata", "--files-per-dir", "100000", "1")).filesPerDir)
+    }
+    
+    @Test fun throughputWindowsCoverEveryByte() {
+        val windows = ThroughputWindows(windowMs = 0)
+        repeat(4) { windows.add(MB.toInt()) }
+        windows.add((MB / 2).toInt())
+        val recorded = windows.finish()
+        
+        assertEquals(4.5, recorded.sumOf { it.mb }, 1e-9)
+        assertTrue(recorded.zipWithNext().all { (a, b) -> a.end_s <= b.end_s })
+    }
+    
+    @Test fun parseArgsReadsWindowMs() {
+        assertEquals(500, parseArgs(arrayOf("--window-ms", "500", "10")).windowMs)
+        assertEquals(0, parseArgs(arrayOf("10")).windowMs)
+    }
 }
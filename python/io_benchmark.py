@@ -1,62 +1,209 @@
 #!/usr/bin/env python3
 """
 Python I/O Benchmark
-Measures file read and write performance
+Command-line and JSON-lines worker front end for the iobench package, which
+measures file read and write performance
 """
 
-import time
+import argparse
 import json
 import sys
-import os
-
-def benchmark_io(file_size_mb):
-    """Benchmark I/O operations for given file size"""
-    input_file = f'data/test_{file_size_mb}mb.txt'
-    output_file = f'data/test_{file_size_mb}mb.py.out'
-    
-    # Ensure input file exists
-    if not os.path.exists(input_file):
-        raise FileNotFoundError(f"Test file {input_file} not found")
-    
-    # Write test (copy file)
-    start_time = time.time()
-    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
-        while True:
-            chunk = f_in.read(8192)
-            if not chunk:
-                break
-            f_out.write(chunk)
-    write_time = time.time() - start_time
-    
-    # Read test
-    start_time = time.time()
-    with open(output_file, 'rb') as f:
-        while True:
-            chunk = f.read(8192)
-            if not chunk:
-                break
-    read_time = time.time() - start_time
-    
-    # Clean up output file
-    os.remove(output_file)
-    
-    return {
-        'language': 'python',
-        'file_size_mb': file_size_mb,
-        'read_time': read_time,
-        'write_time': write_time,
-        'read_throughput_mbs': file_size_mb / read_time,
-        'write_throughput_mbs': file_size_mb / write_time
-    }
+
+from iobench import (CACHE_STATES, CHUNK_SIZE, CODEC_LEVELS, COPY_STRATEGIES, DATA_DIR,
+                     DEFAULT_LEVEL, DURABILITY_LEVELS, EXECUTORS, RANDOM_BLOCK_SIZE,
+                     RANDOM_PATTERNS, READ_MODES, benchmark_compress, benchmark_concurrent,
+                     benchmark_io, benchmark_random)
+
+def _or_default(value, default):
+    """value, or default if the option was not given (0 is passed on, to be rejected)"""
+    return default if value is None else value
+
+def run_job(job):
+    """Run one worker-protocol job, dispatching on its keys"""
+    if 'codec' in job:
+        return benchmark_compress(job['file_size_mb'], job['codec'],
+                                  job.get('level', DEFAULT_LEVEL),
+                                  job.get('block_size', CHUNK_SIZE),
+                                  job.get('threads'),
+                                  job.get('data_dir', DATA_DIR))
+    if 'parser' in job:
+        from iobench.parsing import benchmark_parse
+        return benchmark_parse(job['file_size_mb'], job['parser'],
+                               job.get('block_size', CHUNK_SIZE),
+                               job.get('data_dir', DATA_DIR))
+    if 'pipeline' in job:
+        from iobench.pipeline import benchmark_pipeline
+        return benchmark_pipeline(job['file_size_mb'], job['pipeline'],
+                                  job.get('queue_depth', 2),
+                                  job.get('block_size', CHUNK_SIZE),
+                                  job.get('cache', 'hot'),
+                                  job.get('data_dir', DATA_DIR))
+    if job.get('metadata'):
+        from iobench.metadata import FILES_PER_DIR, METADATA_FILES, benchmark_metadata
+        return benchmark_metadata(job['file_size_mb'],
+                                  job.get('files', METADATA_FILES),
+                                  job.get('files_per_dir', FILES_PER_DIR),
+                                  job.get('threads', 1),
+                                  job.get('data_dir', DATA_DIR))
+    if 'pattern' in job:
+        return benchmark_random(job['file_size_mb'], job['pattern'],
+                                job.get('block_size', RANDOM_BLOCK_SIZE),
+                                job.get('queue_depth', 1),
+                                job.get('ops'),
+                                job.get('seed', 0),
+                                job.get('data_dir', DATA_DIR))
+    if 'concurrency' in job:
+        return benchmark_concurrent(job['file_size_mb'], job['concurrency'],
+                                    job.get('executor', 'thread'),
+                                    job.get('strategy', 'read'),
+                                    job.get('block_size', CHUNK_SIZE),
+                                    job.get('data_dir', DATA_DIR))
+    return benchmark_io(job['file_size_mb'],
+                        job.get('strategy', 'read'),
+                        job.get('block_size', CHUNK_SIZE),
+                        job.get('read_mode', 'stream'),
+                        job.get('cache', 'hot'),
+                        job.get('durability', 'none'),
+                        job.get('sync_every_mb', 0),
+                        job.get('latency', False),
+                        job.get('window_ms', 0),
+                        job.get('data_dir', DATA_DIR))
+
+def serve_worker(stdin=sys.stdin, stdout=sys.stdout):
+    """Run benchmark jobs read as JSON lines from stdin until EOF
+
+    Each job is an object with 'file_size_mb' and optional 'strategy',
+    'block_size', 'read_mode', 'cache', 'durability', 'sync_every_mb',
+    'latency', 'window_ms', 'data_dir', 'concurrency' and 'executor' (or
+    'pattern', 'queue_depth', 'ops' and 'seed' for random access, 'codec',
+    'level' and 'threads' for compression, 'parser', 'pipeline' and
+    'queue_depth', or 'metadata', 'files', 'files_per_dir' and 'threads');
+    each reply is one JSON line holding either the result or an 'error'
+    message, so a failed job does not take the worker down.
+    """
+    for line in iter(stdin.readline, ''):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            result = run_job(json.loads(line))
+        except Exception as e:
+            result = {'error': f"{type(e).__name__}: {e}"}
+        stdout.write(json.dumps(result) + '\n')
+        stdout.flush()
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 io_benchmark.py <file_size_mb>")
-        sys.exit(1)
-    
-    file_size_mb = int(sys.argv[1])
-    result = benchmark_io(file_size_mb)
-    print(json.dumps(result))
+    parser = argparse.ArgumentParser(description="Python I/O benchmark")
+    parser.add_argument('file_size_mb', type=int, nargs='?')
+    parser.add_argument('--worker', action='store_true',
+                        help="serve JSON-lines jobs on stdin instead of running once")
+    parser.add_argument('--strategy', default='read',
+                        choices=[*COPY_STRATEGIES, 'all'],
+                        help="copy strategy for the write test; 'all' runs "
+                             "every strategy and prints one JSON line each")
+    parser.add_argument('--block-size', type=int,
+                        help="chunk size in bytes for reads and writes "
+                             "(default: 8192, or 4096 with --pattern)")
+    parser.add_argument('--read-mode', default='stream', choices=list(READ_MODES),
+                        help="how the read test reads the copied file")
+    parser.add_argument('--cache', default='hot', choices=CACHE_STATES,
+                        help="'cold' evicts the copied file from the page cache before reading "
+                             "(with --pipeline, the input before copying too)")
+    parser.add_argument('--durability', default='none', choices=DURABILITY_LEVELS,
+                        help="how far the copy is pushed to disk before durable_time stops")
+    parser.add_argument('--sync-every-mb', type=int, default=0,
+                        help="also apply --durability every N MB during the copy")
+    parser.add_argument('--latency', action='store_true',
+                        help="time every read()/write() syscall and report p50/p99/p99.9/max")
+    parser.add_argument('--window-ms', type=int, default=0,
+                        help="also report throughput per window of N ms during the copy and read")
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help="directory holding test_<N>mb.txt (default: data)")
+    parser.add_argument('--concurrency', type=int,
+                        help="copy and read N files at once instead of one")
+    parser.add_argument('--executor', default='thread', choices=EXECUTORS,
+                        help="how concurrent streams are run (with --concurrency)")
+    parser.add_argument('--codec', choices=list(CODEC_LEVELS),
+                        help="compress on write and decompress on read with this codec")
+    parser.add_argument('--level', type=int, default=DEFAULT_LEVEL,
+                        help="compression level (with --codec; default: 6)")
+    parser.add_argument('--threads', type=int,
+                        help="compression threads for gzip_threaded (default: CPU count), "
+                             "or metadata threads (default: 1)")
+    parser.add_argument('--parser',
+                        help="read and parse records instead of copying: lines, csv, "
+                             "jsonl, numpy_frombuffer or numpy_fromfile")
+    parser.add_argument('--pattern', choices=RANDOM_PATTERNS,
+                        help="random-access pread/pwrite at offsets with this distribution")
+    parser.add_argument('--pipeline',
+                        help="copy and read with pread/pwrite through an engine: sync "
+                             "or asyncio (K operations in flight, see --queue-depth)")
+    parser.add_argument('--queue-depth', type=int,
+                        help="operations kept in flight (with --pattern, default: 1; "
+                             "with --pipeline, default: 2)")
+    parser.add_argument('--metadata', action='store_true',
+                        help="create/stat/open/unlink many files, traverse them and copy "
+                             "tree_<N>mb/ from the small_files workload, in operations per second")
+    parser.add_argument('--files', type=int,
+                        help="files to create (with --metadata; default: 10000)")
+    parser.add_argument('--files-per-dir', type=int,
+                        help="files per directory (with --metadata; default: 1000)")
+    parser.add_argument('--ops', type=int,
+                        help="operations per test (with --pattern; default: one per block)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="seed for the random offsets (with --pattern)")
+    args = parser.parse_args()
+
+    if args.worker:
+        serve_worker()
+        return
+    if args.file_size_mb is None:
+        parser.error("file_size_mb is required unless --worker is given")
+
+    if args.codec:
+        print(json.dumps(benchmark_compress(args.file_size_mb, args.codec, args.level,
+                                            _or_default(args.block_size, CHUNK_SIZE), args.threads,
+                                            args.data_dir)))
+        return
+    if args.parser:
+        from iobench.parsing import benchmark_parse
+        print(json.dumps(benchmark_parse(args.file_size_mb, args.parser,
+                                         _or_default(args.block_size, CHUNK_SIZE), args.data_dir)))
+        return
+    if args.pipeline:
+        from iobench.pipeline import benchmark_pipeline
+        print(json.dumps(benchmark_pipeline(args.file_size_mb, args.pipeline,
+                                            _or_default(args.queue_depth, 2),
+                                            _or_default(args.block_size, CHUNK_SIZE), args.cache,
+                                            args.data_dir)))
+        return
+    if args.metadata:
+        from iobench.metadata import FILES_PER_DIR, METADATA_FILES, benchmark_metadata
+        print(json.dumps(benchmark_metadata(args.file_size_mb,
+                                            _or_default(args.files, METADATA_FILES),
+                                            _or_default(args.files_per_dir, FILES_PER_DIR),
+                                            _or_default(args.threads, 1), args.data_dir)))
+        return
+    if args.pattern:
+        print(json.dumps(benchmark_random(args.file_size_mb, args.pattern,
+                                          _or_default(args.block_size, RANDOM_BLOCK_SIZE),
+                                          _or_default(args.queue_depth, 1), args.ops, args.seed,
+                                          args.data_dir)))
+        return
+
+    block_size = _or_default(args.block_size, CHUNK_SIZE)
+    strategies = list(COPY_STRATEGIES) if args.strategy == 'all' else [args.strategy]
+    for strategy in strategies:
+        if args.concurrency is not None:
+            result = benchmark_concurrent(args.file_size_mb, args.concurrency,
+                                          args.executor, strategy, block_size,
+                                          args.data_dir)
+        else:
+            result = benchmark_io(args.file_size_mb, strategy, block_size,
+                                  args.read_mode, args.cache, args.durability,
+                                  args.sync_every_mb, args.latency, args.window_ms,
+                                  args.data_dir)
+        print(json.dumps(result))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
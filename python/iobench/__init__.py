@@ -0,0 +1,29 @@
+"""
+Python I/O benchmark library
+
+Time copies and reads in-process with the same harness the CLI uses:
+
+    from iobench import BenchmarkSpec, run_benchmark
+
+    result = run_benchmark(BenchmarkSpec('/data/in.bin', '/scratch/out.bin',
+                                         strategy=my_copy, block_size=1 << 20))
+    print(result.write_throughput_mbs, result.read_throughput_mbs)
+
+The parsing and pipelined tiers live in iobench.parsing and iobench.pipeline
+(imported on demand; parsing pulls in numpy when it is installed).
+"""
+
+from .core import (CACHE_STATES, CHUNK_SIZE, CODEC_LEVELS, COPY_STRATEGIES, DATA_DIR,
+                   DEFAULT_LEVEL, DURABILITY_LEVELS, EXECUTORS, MB, RANDOM_BLOCK_SIZE,
+                   RANDOM_PATTERNS, READ_MODES, Durability, LatencyHistogram, ThroughputWindows,
+                   benchmark_compress, benchmark_concurrent, benchmark_random, drop_page_cache)
+from .harness import BenchmarkResult, BenchmarkSpec, benchmark_io, run_benchmark
+
+__all__ = [
+    'BenchmarkResult', 'BenchmarkSpec', 'run_benchmark', 'benchmark_io',
+    'benchmark_concurrent', 'benchmark_random', 'benchmark_compress',
+    'Durability', 'LatencyHistogram', 'ThroughputWindows', 'drop_page_cache',
+    'COPY_STRATEGIES', 'READ_MODES', 'CACHE_STATES', 'DURABILITY_LEVELS', 'EXECUTORS',
+    'RANDOM_PATTERNS', 'RANDOM_BLOCK_SIZE', 'CODEC_LEVELS', 'DEFAULT_LEVEL',
+    'CHUNK_SIZE', 'DATA_DIR', 'MB'
+]
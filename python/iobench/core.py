@@ -0,0 +1,770 @@
+"""
+Benchmark building blocks: copy strategies, read modes, durability levels,
+latency histograms, and the concurrent, random-access and compression tiers
+"""
+
+import asyncio
+import bz2
+import gzip
+import itertools
+import lzma
+import math
+import mmap
+import random
+import shutil
+import time
+import sys
+import os
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+CHUNK_SIZE = 8192
+MB = 1024 * 1024
+DATA_DIR = 'data'  # holds test_<N>mb.txt; outputs are written next to it
+
+DURABILITY_LEVELS = ['none', 'flush', 'fsync', 'fdatasync']
+
+class Durability:
+    """How far written data is pushed towards the disk, and how often
+
+    'flush' hands Python's buffers to the kernel, 'fsync'/'fdatasync' wait
+    for the device. With sync_every_mb the level is applied every N MB
+    during the copy as well as once at the end.
+    """
+
+    def __init__(self, level='none', sync_every_mb=0):
+        if level not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level {level!r}")
+        if level == 'fdatasync' and not hasattr(os, 'fdatasync'):
+            raise OSError("fdatasync is not available on this platform")
+        self.level = level
+        self.sync_every_mb = sync_every_mb
+        self.pending = 0
+
+    def sync(self, f):
+        """Apply the durability level to an open output file"""
+        if self.level == 'none':
+            return
+        f.flush()
+        if self.level == 'fsync':
+            os.fsync(f.fileno())
+        elif self.level == 'fdatasync':
+            os.fdatasync(f.fileno())
+
+    def wrote(self, f, nbytes):
+        """Account for nbytes written to f, syncing every sync_every_mb"""
+        if not self.sync_every_mb:
+            return
+        self.pending += nbytes
+        if self.pending >= self.sync_every_mb * MB:
+            self.pending = 0
+            self.sync(f)
+
+    def finish(self, path):
+        """Make a closed output file durable (closing already flushed it)"""
+        if self.level in ('fsync', 'fdatasync'):
+            fd = os.open(path, os.O_WRONLY)
+            try:
+                if self.level == 'fsync':
+                    os.fsync(fd)
+                else:
+                    os.fdatasync(fd)
+            finally:
+                os.close(fd)
+
+NO_DURABILITY = Durability()
+
+class _DurableWriter:
+    """File proxy that reports each write() to a Durability"""
+
+    def __init__(self, f, durability):
+        self.f = f
+        self.durability = durability
+
+    def write(self, data):
+        n = self.f.write(data)
+        self.durability.wrote(self.f, n)
+        return n
+
+def copy_read(input_file, output_file, chunk_size, durability=NO_DURABILITY):
+    """Copy with read()/write(), allocating a fresh bytes object per chunk"""
+    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+        while True:
+            chunk = f_in.read(chunk_size)
+            if not chunk:
+                break
+            f_out.write(chunk)
+            durability.wrote(f_out, len(chunk))
+
+def copy_readinto(input_file, output_file, chunk_size, durability=NO_DURABILITY):
+    """Copy through a single reused buffer with readinto()"""
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(input_file, 'rb', buffering=0) as f_in, \
+            open(output_file, 'wb', buffering=0) as f_out:
+        while True:
+            n = f_in.readinto(buf)
+            if not n:
+                break
+            written = 0
+            while written < n:
+                written += f_out.write(view[written:n])
+            durability.wrote(f_out, n)
+
+def copy_copyfileobj(input_file, output_file, chunk_size, durability=NO_DURABILITY):
+    """Copy with shutil.copyfileobj()"""
+    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+        shutil.copyfileobj(f_in, _DurableWriter(f_out, durability), chunk_size)
+
+def copy_sendfile(input_file, output_file, chunk_size, durability=NO_DURABILITY):
+    """Copy in the kernel with os.sendfile()"""
+    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+        remaining = os.fstat(f_in.fileno()).st_size
+        offset = 0
+        while remaining > 0:
+            sent = os.sendfile(f_out.fileno(), f_in.fileno(), offset,
+                               min(chunk_size, remaining))
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+            durability.wrote(f_out, sent)
+
+def copy_file_range(input_file, output_file, chunk_size, durability=NO_DURABILITY):
+    """Copy in the kernel with os.copy_file_range()"""
+    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+        remaining = os.fstat(f_in.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(f_in.fileno(), f_out.fileno(),
+                                        min(chunk_size, remaining))
+            if copied == 0:
+                break
+            remaining -= copied
+            durability.wrote(f_out, copied)
+
+def copy_mmap(input_file, output_file, chunk_size, durability=NO_DURABILITY):
+    """Copy by writing memoryview slices of a read-only mmap"""
+    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+        size = os.fstat(f_in.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                for offset in range(0, size, chunk_size):
+                    durability.wrote(f_out, f_out.write(view[offset:offset + chunk_size]))
+
+# Copy strategies selectable with --strategy. Kernel-side copies are only
+# registered where the platform supports file-to-file transfers.
+COPY_STRATEGIES = {
+    'read': copy_read,
+    'readinto': copy_readinto,
+    'copyfileobj': copy_copyfileobj,
+    'mmap': copy_mmap,
+}
+if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+    COPY_STRATEGIES['sendfile'] = copy_sendfile
+if hasattr(os, 'copy_file_range'):
+    COPY_STRATEGIES['copy_file_range'] = copy_file_range
+
+def read_stream(path, block_size):
+    """Read with a plain read() loop"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(block_size)
+            if not chunk:
+                break
+
+def read_mmap(path, block_size):
+    """Read by mapping the file and touching every page through a memoryview"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                checksum = 0
+                for offset in range(0, size, mmap.PAGESIZE):
+                    checksum ^= view[offset]
+
+def read_direct(path, block_size):
+    """Read with O_DIRECT into a page-aligned buffer, bypassing the page cache"""
+    # O_DIRECT needs aligned buffers and lengths; anonymous mmaps are page aligned
+    aligned_size = -(-block_size // mmap.PAGESIZE) * mmap.PAGESIZE
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECT)
+    try:
+        with mmap.mmap(-1, aligned_size) as buf:
+            while os.readv(fd, [buf]):
+                pass
+    finally:
+        os.close(fd)
+
+# Read paths selectable with --read-mode
+READ_MODES = {
+    'stream': read_stream,
+    'mmap': read_mmap,
+}
+if hasattr(os, 'O_DIRECT'):
+    READ_MODES['direct'] = read_direct
+
+CACHE_STATES = ['hot', 'cold']
+
+def drop_page_cache(path):
+    """Flush path to disk and ask the kernel to evict it from the page cache"""
+    if not hasattr(os, 'posix_fadvise'):
+        raise OSError("Cold-cache runs need os.posix_fadvise, which this platform lacks")
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond latencies, in the style of HdrHistogram
+
+    Every power of two is split into SUB_BUCKETS linear buckets, so a value
+    is reported to within 1/SUB_BUCKETS (under 1%). Counts live in a
+    preallocated array; recording never allocates.
+    """
+
+    SUB_BUCKET_BITS = 7
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    MAX_EXPONENT = 40  # up to ~2^48 ns (3 days); larger values are clamped
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * (self.MAX_EXPONENT + 2) * self.SUB_BUCKETS))
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def _index(self, value):
+        exponent = value.bit_length() - self.SUB_BUCKET_BITS - 1
+        if exponent <= 0:
+            return value
+        if exponent > self.MAX_EXPONENT:
+            return len(self.counts) - 1
+        return exponent * self.SUB_BUCKETS + (value >> exponent)
+
+    def _highest_equivalent(self, index):
+        """Largest value that lands in bucket index"""
+        if index < 2 * self.SUB_BUCKETS:
+            return index
+        exponent = index // self.SUB_BUCKETS - 1
+        mantissa = index - exponent * self.SUB_BUCKETS
+        return ((mantissa + 1) << exponent) - 1
+
+    def record(self, value):
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        """Value at percentile p (0-100), in nanoseconds"""
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(p / 100 * self.total))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def summary(self):
+        """Count, mean and tail percentiles in microseconds"""
+        return {
+            'count': self.total,
+            'mean_us': self.sum / self.total / 1000 if self.total else 0.0,
+            'p50_us': self.percentile(50) / 1000,
+            'p99_us': self.percentile(99) / 1000,
+            'p999_us': self.percentile(99.9) / 1000,
+            'max_us': self.max / 1000
+        }
+
+class ThroughputWindows:
+    """MB moved per time window while a copy or read runs
+
+    Totals average over the whole file; windows show where throughput
+    falls off a cliff, e.g. once dirty pages or the page cache run out.
+    A window closes on the first add() after window_ms has passed, so
+    windows are at least window_ms long.
+    """
+
+    def __init__(self, window_ms):
+        self.window_ns = int(window_ms * 1e6)
+        self.start = self.window_start = time.perf_counter_ns()
+        self.bytes = 0
+        self.windows = []
+
+    def add(self, nbytes):
+        self.bytes += nbytes
+        now = time.perf_counter_ns()
+        if now - self.window_start >= self.window_ns:
+            self._close(now)
+
+    def _close(self, now):
+        self.windows.append({
+            'end_s': (now - self.start) / 1e9,
+            'mb': self.bytes / MB,
+            'throughput_mbs': self.bytes / MB / ((now - self.window_start) / 1e9)
+        })
+        self.window_start = now
+        self.bytes = 0
+
+    def finish(self):
+        """Close the last, partial window and return every window"""
+        if self.bytes:
+            self._close(time.perf_counter_ns())
+        return self.windows
+
+def copy_windowed(input_file, output_file, chunk_size, durability, windows):
+    """copy_read, reporting every chunk written to a ThroughputWindows"""
+    with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+        while True:
+            chunk = f_in.read(chunk_size)
+            if not chunk:
+                break
+            f_out.write(chunk)
+            durability.wrote(f_out, len(chunk))
+            windows.add(len(chunk))
+
+def read_windowed(path, block_size, windows):
+    """read_stream, reporting every chunk read to a ThroughputWindows"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(block_size)
+            if not chunk:
+                break
+            windows.add(len(chunk))
+
+def copy_instrumented(input_file, output_file, chunk_size, durability, histogram):
+    """copy_read on unbuffered files, timing every write() syscall into histogram"""
+    clock = time.perf_counter_ns
+    record = histogram.record
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(input_file, 'rb', buffering=0) as fin, open(output_file, 'wb', buffering=0) as fout:
+        while True:
+            n = fin.readinto(buffer)
+            if not n:
+                break
+            written = 0
+            while written < n:
+                start = clock()
+                written += fout.write(view[written:n])
+                record(clock() - start)
+            durability.wrote(fout, n)
+
+def read_instrumented(path, block_size, histogram):
+    """read_stream on an unbuffered file, timing every read() syscall into histogram"""
+    clock = time.perf_counter_ns
+    record = histogram.record
+    buffer = bytearray(block_size)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            start = clock()
+            n = f.readinto(buffer)
+            record(clock() - start)
+            if not n:
+                break
+
+def _timed_copy(strategy, input_file, output_file, block_size):
+    """Copy one stream and return its elapsed time (module level so it pickles)"""
+    start_time = time.perf_counter()
+    COPY_STRATEGIES[strategy](input_file, output_file, block_size)
+    return time.perf_counter() - start_time
+
+def _timed_read(path, block_size):
+    """Read one stream to EOF and return its elapsed time"""
+    start_time = time.perf_counter()
+    with open(path, 'rb') as f:
+        while f.read(block_size):
+            pass
+    return time.perf_counter() - start_time
+
+async def _async_copy(loop, executor, input_file, output_file, block_size):
+    """Copy one stream with every read and write offloaded to the executor"""
+    start_time = time.perf_counter()
+    f_in = await loop.run_in_executor(executor, open, input_file, 'rb')
+    f_out = await loop.run_in_executor(executor, open, output_file, 'wb')
+    try:
+        while True:
+            chunk = await loop.run_in_executor(executor, f_in.read, block_size)
+            if not chunk:
+                break
+            await loop.run_in_executor(executor, f_out.write, chunk)
+    finally:
+        await loop.run_in_executor(executor, f_in.close)
+        await loop.run_in_executor(executor, f_out.close)
+    return time.perf_counter() - start_time
+
+async def _async_read(loop, executor, path, block_size):
+    """Read one stream with every read offloaded to the executor"""
+    start_time = time.perf_counter()
+    f = await loop.run_in_executor(executor, open, path, 'rb')
+    try:
+        while await loop.run_in_executor(executor, f.read, block_size):
+            pass
+    finally:
+        await loop.run_in_executor(executor, f.close)
+    return time.perf_counter() - start_time
+
+async def _async_streams(executor, make_stream, concurrency):
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(make_stream(loop, executor, i) for i in range(concurrency)))
+
+def _warm_up():
+    """Keep a pool worker busy for a moment, so warming a pool starts every worker"""
+    time.sleep(0.01)
+
+def start_pool(executor_kind, workers):
+    """A thread or process pool with all its workers started and idle
+
+    Pools start workers lazily, on submit; warming them first keeps the
+    cost of spawning threads or interpreters out of timed regions.
+    """
+    pool_class = ProcessPoolExecutor if executor_kind == 'process' else ThreadPoolExecutor
+    pool = pool_class(max_workers=workers)
+    for future in [pool.submit(_warm_up) for _ in range(workers)]:
+        future.result()
+    return pool
+
+def _run_streams(pool, func, args_per_stream):
+    """Run func once per stream concurrently on pool, returning per-stream times"""
+    futures = [pool.submit(func, *args) for args in args_per_stream]
+    return [future.result() for future in futures]
+
+def _latency_summary(times):
+    ordered = sorted(times)
+    return {
+        'mean': sum(ordered) / len(ordered),
+        'p50': ordered[len(ordered) // 2],
+        'min': ordered[0],
+        'max': ordered[-1]
+    }
+
+EXECUTORS = ['thread', 'process', 'asyncio']
+
+def benchmark_concurrent(file_size_mb, concurrency, executor='thread',
+                         strategy='read', block_size=CHUNK_SIZE, data_dir=DATA_DIR):
+    """Benchmark N concurrent copies, then N concurrent reads, of one file
+
+    Throughputs are aggregate (N * file size / wall time); per-stream
+    latencies are summarised separately. The asyncio executor ignores the
+    strategy and offloads each read()/write() call to a thread pool, so its
+    results report no strategy.
+
+    The pool (and, for asyncio, the event loop) is started and warmed up
+    before timing and shared by both phases, so only submitting the
+    streams and collecting their results is timed.
+    """
+    input_file = os.path.join(data_dir, f'test_{file_size_mb}mb.txt')
+    output_files = [os.path.join(data_dir, f'test_{file_size_mb}mb.py.{i}.out')
+                    for i in range(concurrency)]
+
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Test file {input_file} not found")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}")
+    if strategy not in COPY_STRATEGIES:
+        raise ValueError(f"Unknown copy strategy {strategy!r}")
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+    if block_size <= 0:
+        raise ValueError(f"Block size must be positive, got {block_size}")
+
+    pool = start_pool('thread' if executor == 'asyncio' else executor, concurrency)
+    loop = asyncio.new_event_loop() if executor == 'asyncio' else None
+    try:
+        if loop is not None:
+            loop.run_until_complete(asyncio.sleep(0))
+
+        # Write test (N concurrent copies)
+        start_time = time.perf_counter()
+        if executor == 'asyncio':
+            write_latencies = loop.run_until_complete(_async_streams(
+                pool, lambda loop, pool, i: _async_copy(loop, pool, input_file,
+                                                        output_files[i], block_size),
+                concurrency))
+        else:
+            write_latencies = _run_streams(
+                pool, _timed_copy,
+                [(strategy, input_file, out, block_size) for out in output_files])
+        write_time = time.perf_counter() - start_time
+
+        # Read test (N concurrent reads)
+        start_time = time.perf_counter()
+        if executor == 'asyncio':
+            read_latencies = loop.run_until_complete(_async_streams(
+                pool, lambda loop, pool, i: _async_read(loop, pool, output_files[i], block_size),
+                concurrency))
+        else:
+            read_latencies = _run_streams(
+                pool, _timed_read,
+                [(out, block_size) for out in output_files])
+        read_time = time.perf_counter() - start_time
+    finally:
+        if loop is not None:
+            loop.close()
+        pool.shutdown()
+        # Clean up output files
+        for out in output_files:
+            if os.path.exists(out):
+                os.remove(out)
+
+    total_mb = file_size_mb * concurrency
+    return {
+        'language': 'python',
+        'strategy': None if executor == 'asyncio' else strategy,
+        'executor': executor,
+        'concurrency': concurrency,
+        'file_size_mb': file_size_mb,
+        'block_size': block_size,
+        'read_time': read_time,
+        'write_time': write_time,
+        'read_throughput_mbs': total_mb / read_time,
+        'write_throughput_mbs': total_mb / write_time,
+        'read_latency': _latency_summary(read_latencies),
+        'write_latency': _latency_summary(write_latencies)
+    }
+
+RANDOM_PATTERNS = ['uniform', 'zipf', 'strided']
+RANDOM_BLOCK_SIZE = 4096  # the usual database page size
+ZIPF_EXPONENT = 1.2
+STRIDE_BLOCKS = 16
+SCATTER_PRIME = 2654435761  # spreads Zipf-hot blocks over the file
+
+def random_offsets(pattern, blocks, count, block_size, seed=0):
+    """Block-aligned offsets for count operations over a file of blocks blocks
+
+    'uniform' picks blocks uniformly, 'zipf' by rank with P(k) ~ 1/k^1.2
+    (hot ranks scattered across the file), and 'strided' visits every
+    STRIDE_BLOCKS-th block, shifting by one block on each pass.
+    """
+    rng = random.Random(seed)
+    if pattern == 'uniform':
+        indexes = [rng.randrange(blocks) for _ in range(count)]
+    elif pattern == 'zipf':
+        cum_weights = list(itertools.accumulate(rank ** -ZIPF_EXPONENT for rank in range(1, blocks + 1)))
+        ranks = rng.choices(range(blocks), cum_weights=cum_weights, k=count)
+        indexes = [rank * SCATTER_PRIME % blocks for rank in ranks]
+    elif pattern == 'strided':
+        indexes = [(i * STRIDE_BLOCKS + i * STRIDE_BLOCKS // blocks) % blocks for i in range(count)]
+    else:
+        raise ValueError(f"Unknown access pattern {pattern!r}")
+    return [index * block_size for index in indexes]
+
+def _pread_all(fd, offsets, block_size):
+    for offset in offsets:
+        os.pread(fd, block_size, offset)
+
+def _pwrite_all(fd, offsets, block):
+    for offset in offsets:
+        os.pwrite(fd, block, offset)
+
+def _run_queue(queue_depth, func, fd, offsets, arg):
+    """Issue offsets from queue_depth threads at once (pread/pwrite release the GIL)"""
+    if queue_depth == 1:
+        func(fd, offsets, arg)
+        return
+    with ThreadPoolExecutor(max_workers=queue_depth) as pool:
+        futures = [pool.submit(func, fd, offsets[i::queue_depth], arg) for i in range(queue_depth)]
+        for future in futures:
+            future.result()
+
+def benchmark_random(file_size_mb, pattern='uniform', block_size=RANDOM_BLOCK_SIZE, queue_depth=1,
+                     ops=None, seed=0, data_dir=DATA_DIR):
+    """Benchmark random-access pread()s of the test file and pwrite()s into a copy
+
+    ops defaults to one operation per block of the file. Offsets are drawn
+    before timing starts; queue_depth threads keep that many operations in
+    flight. The copy that receives the writes is made outside the timing.
+    """
+    input_file = os.path.join(data_dir, f'test_{file_size_mb}mb.txt')
+    output_file = os.path.join(data_dir, f'test_{file_size_mb}mb.py.out')
+
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Test file {input_file} not found")
+    if block_size <= 0 or block_size > file_size_mb * MB:
+        raise ValueError(f"Block size must be between 1 and the file size, got {block_size}")
+    if queue_depth < 1:
+        raise ValueError(f"Queue depth must be at least 1, got {queue_depth}")
+    blocks = file_size_mb * MB // block_size
+    ops = ops or blocks
+    offsets = random_offsets(pattern, blocks, ops, block_size, seed)
+
+    # Read test
+    fd = os.open(input_file, os.O_RDONLY)
+    try:
+        start_time = time.perf_counter()
+        _run_queue(queue_depth, _pread_all, fd, offsets, block_size)
+        read_time = time.perf_counter() - start_time
+    finally:
+        os.close(fd)
+
+    # Write test, into a copy so the input stays intact
+    shutil.copyfile(input_file, output_file)
+    block = random.Random(seed).randbytes(block_size)
+    fd = os.open(output_file, os.O_WRONLY)
+    try:
+        start_time = time.perf_counter()
+        _run_queue(queue_depth, _pwrite_all, fd, offsets, block)
+        write_time = time.perf_counter() - start_time
+    finally:
+        os.close(fd)
+        os.remove(output_file)
+
+    total_mb = ops * block_size / MB
+    return {
+        'language': 'python',
+        'pattern': pattern,
+        'file_size_mb': file_size_mb,
+        'block_size': block_size,
+        'queue_depth': queue_depth,
+        'ops': ops,
+        'read_time': read_time,
+        'write_time': write_time,
+        'read_iops': ops / read_time,
+        'write_iops': ops / write_time,
+        'read_throughput_mbs': total_mb / read_time,
+        'write_throughput_mbs': total_mb / write_time
+    }
+
+# Streaming codecs and their valid compression levels
+CODEC_LEVELS = {
+    'gzip': range(0, 10),
+    'zlib': range(0, 10),
+    'lzma': range(0, 10),
+    'bz2': range(1, 10),
+    'gzip_threaded': range(0, 10),
+}
+DEFAULT_LEVEL = 6
+THREADED_CHUNK_SIZE = MB  # uncompressed bytes per independently compressed gzip member
+
+def _compressor(codec, level):
+    if codec == 'gzip':
+        return zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    if codec == 'zlib':
+        return zlib.compressobj(level)
+    if codec == 'lzma':
+        return lzma.LZMACompressor(preset=level)
+    return bz2.BZ2Compressor(level)
+
+def compress_stream(input_file, output_file, codec, level, block_size):
+    """Compress input_file into output_file one block at a time"""
+    compressor = _compressor(codec, level)
+    with open(input_file, 'rb') as fin, open(output_file, 'wb') as fout:
+        while True:
+            chunk = fin.read(block_size)
+            if not chunk:
+                break
+            fout.write(compressor.compress(chunk))
+        fout.write(compressor.flush())
+
+def _gzip_member(chunk, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(chunk) + compressor.flush()
+
+def compress_threaded(input_file, output_file, level, threads):
+    """Compress THREADED_CHUNK_SIZE chunks in parallel into a multi-member gzip file
+
+    zlib releases the GIL while compressing, so threads scale. At most
+    2 * threads chunks are in flight, and members are written in order.
+    """
+    with open(input_file, 'rb') as fin, open(output_file, 'wb') as fout, \
+            ThreadPoolExecutor(max_workers=threads) as pool:
+        pending = []
+        while True:
+            chunk = fin.read(THREADED_CHUNK_SIZE)
+            if chunk:
+                pending.append(pool.submit(_gzip_member, chunk, level))
+            if pending and (len(pending) >= 2 * threads or not chunk):
+                fout.write(pending.pop(0).result())
+            elif not chunk:
+                break
+
+def decompress_stream(path, codec, block_size):
+    """Decompress path to the end, discarding the output; returns logical bytes"""
+    if codec == 'zlib':
+        decompressor = zlib.decompressobj()
+        total = 0
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(block_size)
+                if not chunk:
+                    break
+                total += len(decompressor.decompress(chunk))
+        return total + len(decompressor.flush())
+    opener = {'gzip': gzip.open, 'gzip_threaded': gzip.open, 'lzma': lzma.open, 'bz2': bz2.open}[codec]
+    total = 0
+    with opener(path, 'rb') as f:
+        while True:
+            chunk = f.read(block_size)
+            if not chunk:
+                break
+            total += len(chunk)
+    return total
+
+def benchmark_compress(file_size_mb, codec='gzip', level=DEFAULT_LEVEL, block_size=CHUNK_SIZE,
+                       threads=None, data_dir=DATA_DIR):
+    """Benchmark compress-on-write and decompress-on-read of the test file
+
+    Throughputs are in logical (uncompressed) MB/s. CPU times are process
+    CPU time, summed over threads, so cpu_time / wall time shows how many
+    cores the codec kept busy and whether the disk or the CPU is the limit.
+    """
+    input_file = os.path.join(data_dir, f'test_{file_size_mb}mb.txt')
+    output_file = os.path.join(data_dir, f'test_{file_size_mb}mb.py.{codec}')
+
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Test file {input_file} not found")
+    if codec not in CODEC_LEVELS:
+        raise ValueError(f"Unknown codec {codec!r}")
+    if level not in CODEC_LEVELS[codec]:
+        raise ValueError(f"Level {level} is out of range for {codec}")
+    if block_size <= 0:
+        raise ValueError(f"Block size must be positive, got {block_size}")
+    threads = threads or os.cpu_count() or 1
+
+    try:
+        # Write test (compress while copying)
+        start_time, start_cpu = time.perf_counter(), time.process_time()
+        if codec == 'gzip_threaded':
+            compress_threaded(input_file, output_file, level, threads)
+        else:
+            compress_stream(input_file, output_file, codec, level, block_size)
+        write_time = time.perf_counter() - start_time
+        write_cpu_time = time.process_time() - start_cpu
+        compressed_bytes = os.path.getsize(output_file)
+
+        # Read test (decompress)
+        start_time, start_cpu = time.perf_counter(), time.process_time()
+        logical_bytes = decompress_stream(output_file, codec, block_size)
+        read_time = time.perf_counter() - start_time
+        read_cpu_time = time.process_time() - start_cpu
+    finally:
+        if os.path.exists(output_file):
+            os.remove(output_file)
+
+    if logical_bytes != file_size_mb * MB:
+        raise RuntimeError(f"{codec} round trip returned {logical_bytes} bytes, "
+                           f"expected {file_size_mb * MB}")
+    return {
+        'language': 'python',
+        'codec': codec,
+        'level': level,
+        'threads': threads if codec == 'gzip_threaded' else 1,
+        'file_size_mb': file_size_mb,
+        'block_size': block_size,
+        'compressed_mb': compressed_bytes / MB,
+        'compression_ratio': file_size_mb * MB / compressed_bytes,
+        'read_time': read_time,
+        'write_time': write_time,
+        'read_throughput_mbs': file_size_mb / read_time,
+        'write_throughput_mbs': file_size_mb / write_time,
+        'read_cpu_time': read_cpu_time,
+        'write_cpu_time': write_cpu_time
+    }
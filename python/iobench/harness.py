@@ -0,0 +1,216 @@
+"""
+In-process timing harness: describe a copy-then-read benchmark with a
+BenchmarkSpec, run it, and get a BenchmarkResult back
+"""
+
+import os
+import time
+
+from .core import (CACHE_STATES, CHUNK_SIZE, COPY_STRATEGIES, DATA_DIR, MB, READ_MODES,
+                   Durability, LatencyHistogram, ThroughputWindows, copy_instrumented,
+                   copy_windowed, drop_page_cache, read_instrumented, read_windowed)
+
+def _name(function_or_name):
+    return getattr(function_or_name, '__name__', function_or_name)
+
+class BenchmarkSpec:
+    """One benchmark: copy input_path to output_path, then read the copy back
+
+    Paths are used as given, so nothing depends on the working directory.
+    strategy and read_mode are names from COPY_STRATEGIES and READ_MODES,
+    or your own functions with the same signatures, which the harness then
+    times exactly like the built-in ones:
+
+        copy(input_path, output_path, block_size, durability)
+        read(path, block_size)
+
+    A copy function should call durability.wrote(f, nbytes) after each
+    write if sync_every_mb is to take effect; durability.finish() runs
+    after it returns either way.
+
+    file_size_mb labels the result and scales throughputs; by default it is
+    the size of input_path. The output is deleted after the read unless
+    keep_output is set. window_ms > 0 also records throughput per window
+    of that many milliseconds (see ThroughputWindows).
+    """
+
+    __slots__ = ('input_path', 'output_path', 'strategy', 'block_size', 'read_mode', 'cache',
+                 'durability', 'sync_every_mb', 'latency', 'window_ms', 'file_size_mb', 'keep_output')
+
+    def __init__(self, input_path, output_path, strategy='read', block_size=CHUNK_SIZE,
+                 read_mode='stream', cache='hot', durability='none', sync_every_mb=0,
+                 latency=False, window_ms=0, file_size_mb=None, keep_output=False):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.strategy = strategy
+        self.block_size = block_size
+        self.read_mode = read_mode
+        self.cache = cache
+        self.durability = durability
+        self.sync_every_mb = sync_every_mb
+        self.latency = latency
+        self.window_ms = window_ms
+        self.file_size_mb = file_size_mb
+        self.keep_output = keep_output
+
+    @classmethod
+    def for_size(cls, file_size_mb, data_dir=DATA_DIR, **options):
+        """The spec the CLI runs: data_dir/test_<N>mb.txt copied next to itself"""
+        return cls(os.path.join(data_dir, f'test_{file_size_mb}mb.txt'),
+                   os.path.join(data_dir, f'test_{file_size_mb}mb.py.out'),
+                   file_size_mb=file_size_mb, **options)
+
+    def copy_function(self):
+        return self.strategy if callable(self.strategy) else COPY_STRATEGIES[self.strategy]
+
+    def read_function(self):
+        return self.read_mode if callable(self.read_mode) else READ_MODES[self.read_mode]
+
+    def validate(self):
+        if not os.path.exists(self.input_path):
+            raise FileNotFoundError(f"Test file {self.input_path} not found")
+        if not callable(self.strategy) and self.strategy not in COPY_STRATEGIES:
+            raise ValueError(f"Unknown copy strategy {self.strategy!r}")
+        if self.block_size <= 0:
+            raise ValueError(f"Block size must be positive, got {self.block_size}")
+        if not callable(self.read_mode) and self.read_mode not in READ_MODES:
+            raise ValueError(f"Unknown read mode {self.read_mode!r}")
+        if self.cache not in CACHE_STATES:
+            raise ValueError(f"Unknown cache state {self.cache!r}")
+        if self.latency and (self.strategy != 'read' or self.read_mode != 'stream'):
+            raise ValueError("Latency instrumentation needs the read strategy and stream read mode")
+        if self.window_ms < 0:
+            raise ValueError(f"Window must not be negative, got {self.window_ms}ms")
+        if self.window_ms and (self.strategy != 'read' or self.read_mode != 'stream' or self.latency):
+            raise ValueError("Throughput windows need the read strategy and stream read mode, without latency")
+
+class BenchmarkResult:
+    """Timings of one BenchmarkSpec run; to_dict() is the CLI's JSON line"""
+
+    __slots__ = ('strategy', 'read_mode', 'cache', 'file_size_mb', 'block_size', 'read_time',
+                 'write_time', 'durability', 'sync_every_mb', 'durable_time', 'latency', 'windows')
+
+    def __init__(self, strategy, read_mode, cache, file_size_mb, block_size, read_time, write_time,
+                 durability='none', sync_every_mb=0, durable_time=None, latency=None, windows=None):
+        self.strategy = strategy
+        self.read_mode = read_mode
+        self.cache = cache
+        self.file_size_mb = file_size_mb
+        self.block_size = block_size
+        self.read_time = read_time
+        self.write_time = write_time
+        self.durability = durability
+        self.sync_every_mb = sync_every_mb
+        self.durable_time = durable_time
+        self.latency = latency
+        self.windows = windows
+
+    @property
+    def read_throughput_mbs(self):
+        return self.file_size_mb / self.read_time
+
+    @property
+    def write_throughput_mbs(self):
+        return self.file_size_mb / self.write_time
+
+    @property
+    def durable_throughput_mbs(self):
+        return self.file_size_mb / self.durable_time if self.durable_time else None
+
+    def to_dict(self):
+        return {
+            'language': 'python',
+            'strategy': self.strategy,
+            'read_mode': self.read_mode,
+            'cache': self.cache,
+            'file_size_mb': self.file_size_mb,
+            'block_size': self.block_size,
+            'read_time': self.read_time,
+            'write_time': self.write_time,
+            'read_throughput_mbs': self.read_throughput_mbs,
+            'write_throughput_mbs': self.write_throughput_mbs,
+            'durability': self.durability,
+            'sync_every_mb': self.sync_every_mb,
+            'durable_time': self.durable_time,
+            'durable_throughput_mbs': self.durable_throughput_mbs,
+            'latency': self.latency,
+            'windows': self.windows
+        }
+
+def run_benchmark(spec, on_result=None):
+    """Time spec's copy and read in this process and return a BenchmarkResult
+
+    With cache='cold' the copy is fsynced and evicted from the page cache
+    before the read test, so reads come from disk. O_DIRECT reads always
+    bypass the cache and are tagged cold.
+
+    write_time stops when the last write returns; durable_time runs on
+    until the requested durability level is reached, and is None when
+    durability is 'none'.
+
+    With latency=True every write() of the copy and every read() of the
+    read test is timed into a LatencyHistogram, and 'latency' holds their
+    percentiles. Instrumented runs use unbuffered files so each timed call
+    is one syscall. With window_ms, 'windows' holds the write and read
+    throughput of each window.
+
+    on_result, if given, is called with the result before it is returned,
+    e.g. to log or collect runs from a loop.
+    """
+    spec.validate()
+    cache = 'cold' if spec.read_mode == 'direct' else spec.cache
+    policy = Durability(spec.durability, spec.sync_every_mb)
+    histograms = {'read': LatencyHistogram(), 'write': LatencyHistogram()} if spec.latency else None
+    windows = {}
+    file_size_mb = spec.file_size_mb or os.path.getsize(spec.input_path) / MB
+
+    try:
+        # Write test (copy file)
+        start_time = time.perf_counter()
+        if spec.latency:
+            copy_instrumented(spec.input_path, spec.output_path, spec.block_size, policy,
+                              histograms['write'])
+        elif spec.window_ms:
+            windows['write'] = ThroughputWindows(spec.window_ms)
+            copy_windowed(spec.input_path, spec.output_path, spec.block_size, policy, windows['write'])
+        else:
+            spec.copy_function()(spec.input_path, spec.output_path, spec.block_size, policy)
+        write_time = time.perf_counter() - start_time
+        policy.finish(spec.output_path)
+        durable_time = time.perf_counter() - start_time if spec.durability != 'none' else None
+
+        if cache == 'cold':
+            drop_page_cache(spec.output_path)
+
+        # Read test
+        start_time = time.perf_counter()
+        if spec.latency:
+            read_instrumented(spec.output_path, spec.block_size, histograms['read'])
+        elif spec.window_ms:
+            windows['read'] = ThroughputWindows(spec.window_ms)
+            read_windowed(spec.output_path, spec.block_size, windows['read'])
+        else:
+            spec.read_function()(spec.output_path, spec.block_size)
+        read_time = time.perf_counter() - start_time
+    finally:
+        if not spec.keep_output and os.path.exists(spec.output_path):
+            os.remove(spec.output_path)
+
+    result = BenchmarkResult(
+        _name(spec.strategy), _name(spec.read_mode), cache, file_size_mb, spec.block_size,
+        read_time, write_time, spec.durability, spec.sync_every_mb, durable_time,
+        {operation: histogram.summary() for operation, histogram in histograms.items()}
+        if spec.latency else None,
+        {operation: tracker.finish() for operation, tracker in windows.items()} or None)
+    if on_result is not None:
+        on_result(result)
+    return result
+
+def benchmark_io(file_size_mb, strategy='read', block_size=CHUNK_SIZE,
+                 read_mode='stream', cache='hot', durability='none',
+                 sync_every_mb=0, latency=False, window_ms=0, data_dir=DATA_DIR):
+    """Benchmark I/O operations for given file size, as a JSON-ready dict"""
+    spec = BenchmarkSpec.for_size(file_size_mb, data_dir, strategy=strategy, block_size=block_size,
+                                  read_mode=read_mode, cache=cache, durability=durability,
+                                  sync_every_mb=sync_every_mb, latency=latency, window_ms=window_ms)
+    return run_benchmark(spec).to_dict()
@@ -0,0 +1,158 @@
+"""
+Metadata tier: creates, stats, opens and unlinks many empty files, traverses
+them with os.scandir and with os.listdir plus os.lstat, and copies and deletes
+the small_files workload tree
+Run through io_benchmark.py --metadata
+"""
+
+import os
+import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .core import DATA_DIR, MB
+
+METADATA_FILES = 10000
+FILES_PER_DIR = 1000
+METADATA_OPERATIONS = ['create', 'stat', 'open', 'scandir', 'listdir_stat', 'unlink',
+                       'copy_tree', 'delete_tree']
+
+def _create(paths):
+    for path in paths:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+
+def _stat(paths):
+    for path in paths:
+        os.stat(path)
+
+def _open_close(paths):
+    for path in paths:
+        os.close(os.open(path, os.O_RDONLY))
+
+def _unlink(paths):
+    for path in paths:
+        os.unlink(path)
+
+def _copy(pairs):
+    for source, target in pairs:
+        shutil.copyfile(source, target)
+
+def _scandir(directories):
+    """Count regular files using the types readdir() returns, without stat()"""
+    files = 0
+    for directory in directories:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    files += 1
+    return files
+
+def _listdir_stat(directories):
+    """Count regular files the os.listdir() way: one lstat() per entry"""
+    files = 0
+    for directory in directories:
+        for name in os.listdir(directory):
+            if stat.S_ISREG(os.lstat(os.path.join(directory, name)).st_mode):
+                files += 1
+    return files
+
+def _run_split(threads, func, items):
+    """Run func over items, split into threads interleaved slices run at once"""
+    if threads == 1:
+        return [func(items)]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(func, items[i::threads]) for i in range(threads)]
+        return [future.result() for future in futures]
+
+def _list_tree(root):
+    """Directories (parents first) and files of a tree, relative to root"""
+    directories, files = [], []
+    for parent, dirnames, filenames in os.walk(root):
+        relative = os.path.relpath(parent, root)
+        dirnames.sort()
+        directories += [os.path.normpath(os.path.join(relative, name)) for name in dirnames]
+        files += [os.path.normpath(os.path.join(relative, name)) for name in sorted(filenames)]
+    return directories, files
+
+def benchmark_metadata(file_size_mb, files=METADATA_FILES, files_per_dir=FILES_PER_DIR, threads=1,
+                       data_dir=DATA_DIR):
+    """Benchmark file-system metadata operations, in operations per second
+
+    files empty files are spread over directories of files_per_dir
+    entries, then created, stat()ed, opened and closed, traversed both
+    ways and unlinked. After that the small_files workload's tree_<N>mb/
+    is copied file by file and the copy deleted. With threads > 1 each
+    operation's files (or, for traversals, directories) are split over a
+    thread pool; the calls release the GIL.
+    """
+    tree = os.path.join(data_dir, f'tree_{file_size_mb}mb')
+    scratch = os.path.join(data_dir, f'metadata_{file_size_mb}mb.py.out')
+
+    if not os.path.isdir(tree):
+        raise FileNotFoundError(f"Test tree {tree} not found (generate the small_files workload)")
+    if files < 1 or files_per_dir < 1:
+        raise ValueError(f"files and files_per_dir must be at least 1, got {files} and {files_per_dir}")
+    if threads < 1:
+        raise ValueError(f"Threads must be at least 1, got {threads}")
+    tree_dirs, tree_files = _list_tree(tree)
+    tree_bytes = sum(os.path.getsize(os.path.join(tree, name)) for name in tree_files)
+    directories = [os.path.join(scratch, f'd{index:04d}') for index in range(-(-files // files_per_dir))]
+    paths = [os.path.join(directories[index // files_per_dir], f'f{index:06d}') for index in range(files)]
+    operations = {}
+
+    def timed(name, count, func, items):
+        start_time = time.perf_counter()
+        results = _run_split(threads, func, items)
+        elapsed = time.perf_counter() - start_time
+        operations[name] = {'count': count, 'time': elapsed, 'ops_per_sec': count / elapsed}
+        return results
+
+    shutil.rmtree(scratch, ignore_errors=True)
+    try:
+        os.makedirs(scratch)
+        for directory in directories:
+            os.mkdir(directory)
+        timed('create', files, _create, paths)
+        timed('stat', files, _stat, paths)
+        timed('open', files, _open_close, paths)
+        for name, func in [('scandir', _scandir), ('listdir_stat', _listdir_stat)]:
+            found = sum(timed(name, files, func, directories))
+            if found != files:
+                raise RuntimeError(f"{name} found {found} files, expected {files}")
+        timed('unlink', files, _unlink, paths)
+
+        # Tree copy: directories first, then the files
+        copy = os.path.join(scratch, 'tree')
+        start_time = time.perf_counter()
+        os.mkdir(copy)
+        for directory in tree_dirs:
+            os.mkdir(os.path.join(copy, directory))
+        _run_split(threads, _copy, [(os.path.join(tree, name), os.path.join(copy, name))
+                                    for name in tree_files])
+        copy_time = time.perf_counter() - start_time
+        operations['copy_tree'] = {'count': len(tree_files), 'time': copy_time,
+                                   'ops_per_sec': len(tree_files) / copy_time}
+
+        # Tree delete: the files, then the directories, deepest first
+        start_time = time.perf_counter()
+        _run_split(threads, _unlink, [os.path.join(copy, name) for name in tree_files])
+        for directory in reversed(tree_dirs):
+            os.rmdir(os.path.join(copy, directory))
+        os.rmdir(copy)
+        delete_time = time.perf_counter() - start_time
+        operations['delete_tree'] = {'count': len(tree_files), 'time': delete_time,
+                                     'ops_per_sec': len(tree_files) / delete_time}
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        'language': 'python',
+        'file_size_mb': file_size_mb,
+        'files': files,
+        'files_per_dir': files_per_dir,
+        'threads': threads,
+        'tree_files': len(tree_files),
+        'operations': operations,
+        'copy_tree_throughput_mbs': tree_bytes / MB / copy_time
+    }
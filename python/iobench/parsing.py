@@ -0,0 +1,111 @@
+"""
+Parsing tier: read-and-process throughput (records per second) on top of raw file I/O
+Run through io_benchmark.py --parser NAME
+"""
+
+import csv
+import json
+import os
+import time
+
+from .core import CHUNK_SIZE, DATA_DIR
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def parse_lines(path, block_size):
+    """Iterate over decoded text lines"""
+    records = 0
+    with open(path, 'r', encoding='utf-8', buffering=block_size) as f:
+        for _ in f:
+            records += 1
+    return records
+
+def parse_csv(path, block_size):
+    """Parse CSV rows with the csv module, skipping the header"""
+    with open(path, 'r', encoding='utf-8', newline='', buffering=block_size) as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return sum(1 for _ in reader)
+
+def parse_jsonl(path, block_size):
+    """Decode one JSON object per line"""
+    records = 0
+    loads = json.loads
+    with open(path, 'rb', buffering=block_size) as f:
+        for line in f:
+            loads(line)
+            records += 1
+    return records
+
+# Layout of the 'records' workload (workloads.RECORD): id, timestamp, amount, category
+RECORD_DTYPE = np.dtype([('id', '<u8'), ('timestamp', '<u8'), ('amount', '<f8'),
+                         ('category', '<u4'), ('pad', 'V4')]) if np else None
+
+def parse_numpy_frombuffer(path, block_size):
+    """Read the whole file, then view it as fixed-width records and reduce a column"""
+    with open(path, 'rb', buffering=block_size) as f:
+        data = f.read()
+    records = np.frombuffer(data, dtype=RECORD_DTYPE, count=len(data) // RECORD_DTYPE.itemsize)
+    records['amount'].sum()
+    return len(records)
+
+def parse_numpy_fromfile(path, block_size):
+    """Decode fixed-width records straight from the file and reduce a column"""
+    records = np.fromfile(path, dtype=RECORD_DTYPE)
+    records['amount'].sum()
+    return len(records)
+
+# Parsers selectable with --parser, and the workload each one expects
+PARSERS = {
+    'lines': parse_lines,
+    'csv': parse_csv,
+    'jsonl': parse_jsonl,
+}
+if np is not None:
+    PARSERS['numpy_frombuffer'] = parse_numpy_frombuffer
+    PARSERS['numpy_fromfile'] = parse_numpy_fromfile
+
+PARSER_WORKLOADS = {
+    'lines': 'text',
+    'csv': 'csv',
+    'jsonl': 'jsonl',
+    'numpy_frombuffer': 'records',
+    'numpy_fromfile': 'records'
+}
+
+def benchmark_parse(file_size_mb, parser='lines', block_size=CHUNK_SIZE, data_dir=DATA_DIR):
+    """Benchmark reading and parsing the test file with one parser
+
+    Uses the same test_<N>mb.txt convention as BenchmarkSpec.for_size(); the file
+    should come from the workload in PARSER_WORKLOADS. read_time covers
+    opening, reading and parsing.
+    """
+    input_file = os.path.join(data_dir, f'test_{file_size_mb}mb.txt')
+
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Test file {input_file} not found")
+    if parser in PARSER_WORKLOADS and parser not in PARSERS:
+        raise ImportError(f"The {parser} parser needs numpy")
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser {parser!r}")
+    if block_size <= 0:
+        raise ValueError(f"Block size must be positive, got {block_size}")
+
+    start_time = time.perf_counter()
+    records = PARSERS[parser](input_file, block_size)
+    read_time = time.perf_counter() - start_time
+
+    return {
+        'language': 'python',
+        'parser': parser,
+        'workload': PARSER_WORKLOADS[parser],
+        'file_size_mb': file_size_mb,
+        'block_size': block_size,
+        'records': records,
+        'read_time': read_time,
+        'read_throughput_mbs': file_size_mb / read_time,
+        'records_per_sec': records / read_time
+    }
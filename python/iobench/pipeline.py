@@ -0,0 +1,134 @@
+"""
+Pipelined I/O: copies and reads with K chunk operations in flight through an asyncio engine,
+against the same pread/pwrite loop run synchronously
+Run through io_benchmark.py --pipeline ENGINE --queue-depth K
+"""
+
+import asyncio
+import os
+import time
+
+from .core import CACHE_STATES, CHUNK_SIZE, DATA_DIR, MB, drop_page_cache, start_pool
+
+PIPELINE_ENGINES = ['sync', 'asyncio']
+
+def _pwrite_full(fd, data, offset):
+    """pwrite until all of data is written (pwrite may write less)"""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+def _sync_copy(fd_in, fd_out, size, block_size):
+    for offset in range(0, size, block_size):
+        _pwrite_full(fd_out, os.pread(fd_in, block_size, offset), offset)
+
+def _sync_read(fd, size, block_size):
+    for offset in range(0, size, block_size):
+        os.pread(fd, block_size, offset)
+
+async def _pipeline(pool, size, block_size, queue_depth, transfer):
+    """Run transfer(offset) over every block, queue_depth at a time
+
+    queue_depth coroutines pull the next offset from a shared iterator and
+    offload their blocking calls to pool, a pool of queue_depth threads, so
+    at most queue_depth blocks are buffered and in flight. In a copy, while
+    one coroutine writes block i another is already reading block i+1:
+    at queue_depth 2 this is a double-buffered pipeline.
+    """
+    loop = asyncio.get_running_loop()
+    offsets = iter(range(0, size, block_size))
+
+    async def lane():
+        for offset in offsets:
+            await transfer(loop, pool, offset)
+    await asyncio.gather(*(lane() for _ in range(queue_depth)))
+
+def _async_copy(loop, pool, fd_in, fd_out, size, block_size, queue_depth):
+    async def transfer(loop, pool, offset):
+        data = await loop.run_in_executor(pool, os.pread, fd_in, block_size, offset)
+        await loop.run_in_executor(pool, _pwrite_full, fd_out, data, offset)
+    loop.run_until_complete(_pipeline(pool, size, block_size, queue_depth, transfer))
+
+def _async_read(loop, pool, fd, size, block_size, queue_depth):
+    async def transfer(loop, pool, offset):
+        await loop.run_in_executor(pool, os.pread, fd, block_size, offset)
+    loop.run_until_complete(_pipeline(pool, size, block_size, queue_depth, transfer))
+
+def benchmark_pipeline(file_size_mb, engine='asyncio', queue_depth=2, block_size=CHUNK_SIZE,
+                       cache='hot', data_dir=DATA_DIR):
+    """Benchmark a pread/pwrite copy, then a pread pass over the copy
+
+    The 'sync' engine runs the plain blocking loop (queue_depth is ignored
+    and reported as 0); 'asyncio' keeps queue_depth operations in flight.
+    Both move the same blocks with the same syscalls, so the difference is
+    what overlapping I/O buys, net of the event loop and thread handoffs;
+    the loop and its thread pool are set up before timing, as the sync
+    engine has no setup. With a hot page cache there is little latency to
+    hide; cache='cold' evicts the input before the copy and the copy
+    before the read.
+    """
+    input_file = os.path.join(data_dir, f'test_{file_size_mb}mb.txt')
+    output_file = os.path.join(data_dir, f'test_{file_size_mb}mb.py.pipeline.out')
+
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Test file {input_file} not found")
+    if engine not in PIPELINE_ENGINES:
+        raise ValueError(f"Unknown pipeline engine {engine!r}")
+    if engine == 'asyncio' and queue_depth < 1:
+        raise ValueError(f"Queue depth must be at least 1, got {queue_depth}")
+    if block_size <= 0:
+        raise ValueError(f"Block size must be positive, got {block_size}")
+    if cache not in CACHE_STATES:
+        raise ValueError(f"Unknown cache state {cache!r}")
+    size = file_size_mb * MB
+    if cache == 'cold':
+        drop_page_cache(input_file)
+
+    pool = start_pool('thread', queue_depth) if engine == 'asyncio' else None
+    loop = asyncio.new_event_loop() if engine == 'asyncio' else None
+    fd_in = os.open(input_file, os.O_RDONLY)
+    fd_out = os.open(output_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if loop is not None:
+            loop.run_until_complete(asyncio.sleep(0))
+
+        # Write test (copy)
+        start_time = time.perf_counter()
+        if engine == 'sync':
+            _sync_copy(fd_in, fd_out, size, block_size)
+        else:
+            _async_copy(loop, pool, fd_in, fd_out, size, block_size, queue_depth)
+        write_time = time.perf_counter() - start_time
+
+        # Read test (over the copy)
+        if cache == 'cold':
+            os.fsync(fd_out)
+            os.posix_fadvise(fd_out, 0, 0, os.POSIX_FADV_DONTNEED)
+        start_time = time.perf_counter()
+        if engine == 'sync':
+            _sync_read(fd_out, size, block_size)
+        else:
+            _async_read(loop, pool, fd_out, size, block_size, queue_depth)
+        read_time = time.perf_counter() - start_time
+    finally:
+        if loop is not None:
+            loop.close()
+            pool.shutdown()
+        os.close(fd_in)
+        os.close(fd_out)
+        os.remove(output_file)
+
+    return {
+        'language': 'python',
+        'engine': engine,
+        'queue_depth': queue_depth if engine == 'asyncio' else 0,
+        'file_size_mb': file_size_mb,
+        'block_size': block_size,
+        'cache': cache,
+        'read_time': read_time,
+        'write_time': write_time,
+        'read_throughput_mbs': file_size_mb / read_time,
+        'write_throughput_mbs': file_size_mb / write_time
+    }
@@ -47,7 +47,7 @@ def main():
     test_implementation("Python", [python_cmd, 'python/io_benchmark.py', '1'])
     
     # Test Go
-    test_implementation("Go", ['go', 'run', 'golang/main.go', '1'])
+    test_implementation("Go", ['go', 'run', '.', '1'], cwd='golang')
     
     # Test Kotlin
     test_implementation("Kotlin", ['./gradlew', 'run', '--args=1', '--quiet'], cwd='kotlin')
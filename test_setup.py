@@ -25,8 +25,8 @@ def test_python():
 
 def test_golang():
     print("Testing Go implementation...")
-    result = subprocess.run(['go', 'run', 'golang/main.go', '1'], 
-                          capture_output=True, text=True)
+    result = subprocess.run(['go', 'run', '.', '1'], 
+                          cwd='golang', capture_output=True, text=True)
     if result.returncode == 0:
         print("✓ Go test passed")
         return True
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_history import compare_samples
+
+def test_three_run_slowdown_is_a_regression():
+    baseline = {(100, 'python', 'read'): [0.100, 0.102, 0.098]}
+    current = {(100, 'python', 'read'): [0.200, 0.204, 0.196]}
+    [row] = compare_samples(baseline, current)
+    assert row['regression']
+    assert row['p_value'] > 0.05  # Mann-Whitney alone could not have flagged it
+    assert row['ci_high'] < 1
+
+def test_noise_within_threshold_passes():
+    baseline = {(100, 'python', 'read'): [0.100, 0.102, 0.098]}
+    current = {(100, 'python', 'read'): [0.101, 0.099, 0.103]}
+    [row] = compare_samples(baseline, current)
+    assert not row['regression'] and not row['improvement']
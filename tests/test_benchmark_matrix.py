@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_log import ResultLog
+from benchmark_matrix import expand, filter_jobs, resolve
+from benchmark_runner import IOBenchmark
+from workloads import WorkloadGenerator, WorkloadSpec
+
+def test_only_python_crosses_strategies_and_concurrency():
+    matrix = resolve({'sizes_mb': [1, 10], 'iterations': 2, 'block_sizes': [4096, 65536],
+                      'strategies': ['read', 'mmap'], 'concurrency': [1, 4]})
+    jobs = expand(matrix)
+    python = [job for job in jobs if job.language == 'python']
+    others = [job for job in jobs if job.language != 'python']
+    assert len(python) == 2 * 2 * 2 * 2 * 2  # sizes, block sizes, strategies, streams, iterations
+    assert len(others) == 2 * 2 * 2 * 2      # languages, sizes, block sizes, iterations
+    assert all(job.strategy is None and job.concurrency is None for job in others)
+    assert len({job.key for job in jobs}) == len(jobs)
+
+def test_filter_matches_cases():
+    jobs = expand(resolve({'sizes_mb': [1, 10], 'iterations': 1, 'strategies': ['read', 'mmap']}))
+    assert [job.case for job in filter_jobs(jobs, ['python/10mb/*'])] == [
+        'python/10mb/strategy=read', 'python/10mb/strategy=mmap']
+    assert {job.language for job in filter_jobs(jobs, ['golang/*', 'kotlin/*'])} == {'golang', 'kotlin'}
+    assert filter_jobs(jobs, []) == jobs
+    assert filter_jobs(jobs, ['rust/*']) == []
+
+def test_key_changes_with_workload_seed_and_options():
+    def key(**overrides):
+        return expand(resolve({'languages': ['python'], 'sizes_mb': [1], 'iterations': 1}, **overrides))[0].key
+
+    assert key() == key()
+    assert key() != key(seed=1)
+    assert key() != key(workload='text')
+    assert key() != key(options={'durability': 'fsync'})
+    assert key() == key(options={'durability': None})
+
+def make_benchmark(tmp_path, seed=0):
+    benchmark = IOBenchmark()
+    benchmark.languages = ['python']
+    benchmark.test_file_sizes = [1]
+    benchmark.workload = WorkloadSpec('random', seed=seed)
+    benchmark.workload_generator = WorkloadGenerator(tmp_path / 'workloads', max_workers=1)
+    benchmark.matrix_log = ResultLog(str(tmp_path / 'matrix_log.jsonl'))
+    runs = []
+
+    def run_python_benchmark(file_size_mb, block_size=None, **options):
+        runs.append(options)
+        return {'read_throughput_mbs': 100.0, 'write_throughput_mbs': 50.0}
+
+    benchmark.run_python_benchmark = run_python_benchmark
+    return benchmark, runs
+
+def test_resume_skips_only_matching_jobs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    matrix = resolve({'languages': ['python'], 'sizes_mb': [1], 'iterations': 2,
+                      'strategies': ['read', 'mmap']})
+    jobs = expand(matrix)
+
+    benchmark, runs = make_benchmark(tmp_path)
+    benchmark.run_matrix(filter_jobs(jobs, ['*strategy=read']))
+    assert len(runs) == 2
+
+    benchmark, runs = make_benchmark(tmp_path)
+    results = benchmark.run_matrix(jobs, resume=True)
+    assert runs == [{'strategy': 'mmap'}, {'strategy': 'mmap'}]
+    assert {case: len(samples['read_throughput_mbs']) for case, samples in results.items()} == {
+        'python/1mb/strategy=read': 2, 'python/1mb/strategy=mmap': 2}
+
+    # The same cases with another seed are other runs, not resumable ones
+    benchmark, runs = make_benchmark(tmp_path, seed=1)
+    benchmark.run_matrix(expand(resolve(matrix, seed=1)), resume=True)
+    assert len(runs) == 4
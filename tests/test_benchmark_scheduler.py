@@ -0,0 +1,58 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import benchmark_scheduler
+from benchmark_scheduler import Job, Scheduler
+
+@pytest.fixture
+def eight_cpus(monkeypatch):
+    monkeypatch.setattr(benchmark_scheduler, 'available_cpus', lambda: list(range(8)))
+
+def test_cpu_sets_are_disjoint(eight_cpus):
+    assert Scheduler(cpus_per_job=2).cpu_sets() == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+def test_leftover_cpus_are_not_shared(eight_cpus):
+    assert Scheduler(cpus_per_job=3).cpu_sets() == [[0, 1, 2], [3, 4, 5]]
+
+def test_max_parallel_limits_sets(eight_cpus):
+    assert Scheduler(cpus_per_job=1, max_parallel=3).cpu_sets() == [[0], [1], [2]]
+
+def test_exclusive_uses_every_cpu(eight_cpus):
+    assert Scheduler(cpus_per_job=2, exclusive=True).cpu_sets() == [list(range(8))]
+    assert Scheduler(cpus_per_job=16).cpu_sets() == [list(range(8))]
+
+def test_cpus_per_job_must_be_positive():
+    with pytest.raises(ValueError):
+        Scheduler(cpus_per_job=0)
+
+def test_seeded_order_is_reproducible():
+    jobs = list(range(20))
+    assert Scheduler(seed=3).order(jobs) == Scheduler(seed=3).order(jobs)
+    assert sorted(Scheduler(seed=3).order(jobs)) == jobs
+
+def test_jobs_run_pinned_in_private_directories(tmp_path):
+    source = tmp_path / 'input.bin'
+    source.write_bytes(b'data')
+    seen = []
+
+    def run(directory):
+        seen.append(directory)
+        assert (Path(directory) / 'input.bin').read_bytes() == b'data'
+        if hasattr(os, 'sched_getaffinity'):
+            return sorted(os.sched_getaffinity(0))
+        return None
+
+    scheduler = Scheduler(scratch_root=tmp_path / 'jobs', seed=0)
+    jobs = [Job(key, run, [source]) for key in 'abcd']
+    results = list(scheduler.run(jobs))
+
+    assert sorted(job.key for job, _, _ in results) == list('abcd')
+    assert len(set(seen)) == len(jobs)
+    assert not any(Path(directory).exists() for directory in seen)
+    for _, cpus, pinned in results:
+        assert pinned is None or pinned == cpus
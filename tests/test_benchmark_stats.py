@@ -0,0 +1,49 @@
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_stats import P2Quantile, RunningStats
+
+def fixed_sample(n=5000):
+    rng = random.Random(42)
+    return [rng.lognormvariate(0, 0.5) for _ in range(n)]
+
+def test_running_stats_match_statistics():
+    sample = fixed_sample()
+    running = RunningStats()
+    for x in sample:
+        running.add(x)
+    assert running.count == len(sample)
+    assert abs(running.mean - statistics.mean(sample)) < 1e-12
+    assert abs(running.variance - statistics.variance(sample)) < 1e-12
+    assert abs(running.stdev - statistics.stdev(sample)) < 1e-12
+    assert running.min == min(sample) and running.max == max(sample)
+
+def test_running_stats_variance_is_zero_below_two_samples():
+    running = RunningStats()
+    assert running.variance == 0.0
+    running.add(3.0)
+    assert running.variance == 0.0 and running.mean == 3.0
+
+def test_p2_quantile_is_exact_while_buffering():
+    sample = fixed_sample(P2Quantile.EXACT_SAMPLES - 1)
+    sketch = P2Quantile(0.5)
+    for x in sample:
+        sketch.add(x)
+    assert sketch.value == statistics.median(sample)
+
+def test_p2_quantile_tracks_statistics_quantiles():
+    sample = fixed_sample()
+    cuts = statistics.quantiles(sample, n=100, method='inclusive')
+    for p in (0.25, 0.5, 0.75, 0.95, 0.99):
+        sketch = P2Quantile(p)
+        for x in sample:
+            sketch.add(x)
+        exact = cuts[round(p * 100) - 1]
+        assert abs(sketch.value - exact) / exact < 0.02, p
+
+def test_p2_quantile_is_none_when_empty():
+    assert P2Quantile(0.5).value is None
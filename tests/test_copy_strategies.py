@@ -0,0 +1,27 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'python'))
+
+from iobench.core import COPY_STRATEGIES
+
+@pytest.mark.parametrize('strategy', sorted(COPY_STRATEGIES))
+def test_copy_is_byte_identical(strategy, tmp_path):
+    source = tmp_path / 'in.bin'
+    # Not a multiple of the block size, so the last chunk is short
+    data = os.urandom(3 * 4096 + 123)
+    source.write_bytes(data)
+    target = tmp_path / 'out.bin'
+    COPY_STRATEGIES[strategy](str(source), str(target), 4096)
+    assert target.read_bytes() == data
+
+@pytest.mark.parametrize('strategy', sorted(COPY_STRATEGIES))
+def test_copy_of_empty_file_is_empty(strategy, tmp_path):
+    source = tmp_path / 'in.bin'
+    source.write_bytes(b'')
+    target = tmp_path / 'out.bin'
+    COPY_STRATEGIES[strategy](str(source), str(target), 4096)
+    assert target.read_bytes() == b''
@@ -0,0 +1,48 @@
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'python'))
+
+from iobench import BenchmarkSpec, run_benchmark
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'in.bin'
+    path.write_bytes(os.urandom(1024 * 1024))
+    return path
+
+def test_on_result_receives_the_returned_result(source, tmp_path):
+    collected = []
+    output = tmp_path / 'out.bin'
+    result = run_benchmark(BenchmarkSpec(str(source), str(output), block_size=65536),
+                           on_result=collected.append)
+    assert collected == [result]
+    assert result.strategy == 'read' and result.file_size_mb == 1
+    assert result.to_dict()['write_throughput_mbs'] == result.write_throughput_mbs > 0
+    assert not output.exists()
+
+def test_custom_strategy_is_timed_and_named(source, tmp_path):
+    def my_copy(input_path, output_path, block_size, durability):
+        shutil.copyfile(input_path, output_path)
+
+    output = tmp_path / 'out.bin'
+    result = run_benchmark(BenchmarkSpec(str(source), str(output), strategy=my_copy, keep_output=True))
+    assert result.strategy == 'my_copy'
+    assert output.read_bytes() == source.read_bytes()
+
+def test_latency_run_summarises_every_call(source, tmp_path):
+    spec = BenchmarkSpec(str(source), str(tmp_path / 'out.bin'), block_size=65536, latency=True)
+    result = run_benchmark(spec)
+    assert result.latency['write']['count'] == 16
+    assert result.latency['read']['count'] == 17  # plus the empty read at EOF
+
+def test_invalid_spec_is_rejected_before_running(source, tmp_path):
+    collected = []
+    with pytest.raises(ValueError):
+        run_benchmark(BenchmarkSpec(str(source), str(tmp_path / 'out.bin'), block_size=0),
+                      on_result=collected.append)
+    assert collected == []
@@ -0,0 +1,54 @@
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'python'))
+
+from iobench.core import LatencyHistogram
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in range(256):
+        histogram.record(value)
+    for value in range(256):
+        # value + 1 of the 256 samples are <= value
+        assert histogram.percentile((value + 1) / 256 * 100) == value
+
+def test_large_values_within_one_sub_bucket():
+    rng = random.Random(7)
+    for _ in range(1000):
+        value = rng.randrange(256, 1 << 40)
+        histogram = LatencyHistogram()
+        histogram.record(value)
+        histogram.record(1 << 45)  # keeps max above value so it is not the clamp
+        reported = histogram.percentile(50)
+        assert value <= reported <= value * (1 + 1 / LatencyHistogram.SUB_BUCKETS)
+
+def test_percentiles_of_uniform_sample():
+    histogram = LatencyHistogram()
+    values = list(range(1, 100001))
+    for value in values:
+        histogram.record(value * 1000)
+    for p in (50, 99, 99.9):
+        exact = values[int(p / 100 * len(values)) - 1] * 1000
+        assert exact <= histogram.percentile(p) <= exact * (1 + 1 / LatencyHistogram.SUB_BUCKETS)
+    assert histogram.percentile(100) == histogram.max == 100000 * 1000
+
+def test_huge_values_are_clamped_not_dropped():
+    histogram = LatencyHistogram()
+    histogram.record(1 << 60)
+    assert histogram.total == 1
+    assert histogram.percentile(50) == (1 << 48) - 1
+    assert histogram.summary()['max_us'] == (1 << 60) / 1000
+
+def test_summary_in_microseconds():
+    histogram = LatencyHistogram()
+    assert histogram.summary()['count'] == 0
+    assert histogram.summary()['mean_us'] == 0.0
+    for value in (1000, 2000, 3000):
+        histogram.record(value)
+    summary = histogram.summary()
+    assert summary['count'] == 3
+    assert summary['mean_us'] == 2.0
+    assert summary['max_us'] == 3.0
+    assert 2.0 <= summary['p50_us'] <= 2.0 * (1 + 1 / LatencyHistogram.SUB_BUCKETS)
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from workloads import WorkloadGenerator, WorkloadSpec
+
+def generate(root, spec, size_mb=1):
+    generator = WorkloadGenerator(root, max_workers=2)
+    generator.generate(spec, [size_mb])
+    return generator.path(spec, size_mb)
+
+def test_same_seed_same_bytes(tmp_path):
+    for kind in ('random', 'mixed', 'text', 'csv', 'jsonl', 'records'):
+        first = generate(tmp_path / 'a', WorkloadSpec(kind, seed=1))
+        second = generate(tmp_path / 'b', WorkloadSpec(kind, seed=1))
+        assert first.read_bytes() == second.read_bytes(), kind
+        assert first.stat().st_size == 1024 * 1024
+
+def test_different_seed_different_bytes(tmp_path):
+    first = generate(tmp_path, WorkloadSpec('random', seed=1))
+    second = generate(tmp_path, WorkloadSpec('random', seed=2))
+    assert first.parent != second.parent
+    assert first.read_bytes() != second.read_bytes()
+
+def test_spec_key_covers_kind_seed_and_params():
+    base = WorkloadSpec('mixed', seed=1)
+    assert base.key() == WorkloadSpec('mixed', seed=1, entropy=0.5).key()
+    assert base.key() != WorkloadSpec('mixed', seed=2).key()
+    assert base.key() != WorkloadSpec('mixed', seed=1, entropy=0.9).key()
+    assert base.key() != WorkloadSpec('random', seed=1).key()
+
+def test_cached_file_is_reused(tmp_path, capsys):
+    spec = WorkloadSpec('random', seed=1)
+    path = generate(tmp_path, spec)
+    before = path.stat()
+    assert 'Generating' in capsys.readouterr().out
+
+    assert generate(tmp_path, spec) == path
+    after = path.stat()
+    assert 'Generating' not in capsys.readouterr().out
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+def test_new_spec_misses_the_cache(tmp_path, capsys):
+    generate(tmp_path, WorkloadSpec('random', seed=1))
+    capsys.readouterr()
+    generate(tmp_path, WorkloadSpec('text', seed=1))
+    assert 'Generating text' in capsys.readouterr().out
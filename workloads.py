@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Workload Generator
+Creates realistic, reproducible test data: incompressible, mixed-entropy, text,
+CSV, JSON-lines and binary records, many-small-files trees and sparse files,
+cached by content spec and seed
+"""
+
+import argparse
+import errno
+import hashlib
+import json
+import os
+import random
+import shutil
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+MB = 1024 * 1024
+CHUNK_SIZE = 4 * MB  # unit of parallel generation; each chunk has its own seed
+
+# Bump when generated content changes, so stale caches are not reused
+GENERATOR_VERSION = 1
+
+WORDS = ("the of and to in is that for it as with was on be by at this from or "
+         "have an are not but had which their one all were when there can more "
+         "file disk read write buffer cache page block latency throughput kernel "
+         "system call sync flush queue stream record index offset extent inode").split()
+CATEGORIES = ['alpha', 'beta', 'gamma', 'delta', 'epsilon']
+CSV_HEADER = b"id,timestamp,name,amount,category\n"
+# Fixed-width binary record: id, timestamp, amount, category, 4 bytes padding
+RECORD = struct.Struct("<QQdI4x")
+
+class WorkloadSpec:
+    """What to generate: a workload kind, its parameters and a seed
+
+    Kinds:
+      repeated     the original all-'A' files (trivially compressible)
+      random       incompressible random bytes
+      mixed        64KB blocks of random, repetitive and text data, about
+                   `entropy` of them random
+      text         newline-terminated lines of words
+      csv          CSV records (id, timestamp, name, amount, category)
+      jsonl        the same records as JSON lines
+      records      the same records as fixed-width 32-byte binary (RECORD)
+      small_files  a tree of file_size_kb files adding up to the size
+      sparse       a file with a data_kb extent every MB and holes between
+    """
+
+    KINDS = ['repeated', 'random', 'mixed', 'text', 'csv', 'jsonl', 'records', 'small_files', 'sparse']
+    DEFAULTS = {
+        'mixed': {'entropy': 0.5},
+        'small_files': {'file_size_kb': 4, 'files_per_dir': 256},
+        'sparse': {'data_kb': 64}
+    }
+
+    def __init__(self, kind='random', seed=0, **params):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown workload kind {kind!r}")
+        self.kind = kind
+        self.seed = seed
+        self.params = {**self.DEFAULTS.get(kind, {}), **params}
+
+    def to_dict(self):
+        return {'kind': self.kind, 'seed': self.seed, 'params': self.params}
+
+    def key(self):
+        """Directory name: kind plus a hash of everything that shapes the content"""
+        content = json.dumps({**self.to_dict(), 'version': GENERATOR_VERSION}, sort_keys=True)
+        return f"{self.kind}-{hashlib.sha256(content.encode()).hexdigest()[:12]}"
+
+    @property
+    def is_tree(self):
+        return self.kind == 'small_files'
+
+def _chunk_rng(spec, size_mb, index):
+    """Independent, reproducible random stream for one chunk of one file"""
+    return random.Random(f"{spec.key()}:{size_mb}:{index}")
+
+def _lines_to_size(make_line, rng, length, first=b""):
+    """Whole lines adding up to exactly length bytes
+
+    make_line returns a line and the offset where it may be padded; the
+    shortfall is padded into the last line, so no record is cut in half.
+    """
+    lines = [first] if first else []
+    total = len(first)
+    pad_at = None
+    while True:
+        line, offset = make_line(rng)
+        if total + len(line) > length:
+            break
+        lines.append(line)
+        total += len(line)
+        pad_at = offset
+    remaining = length - total
+    if remaining and pad_at is None:
+        # Not even one line fits: fill with a single padding line
+        lines.append(b"x" * (remaining - 1) + b"\n")
+    elif remaining:
+        last = lines[-1]
+        lines[-1] = last[:pad_at] + b"x" * remaining + last[pad_at:]
+    return b"".join(lines)
+
+def _text_line(rng):
+    line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 16))).encode() + b"\n"
+    return line, len(line) - 1
+
+def _csv_line(rng):
+    name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 12)))
+    prefix = f"{rng.randrange(10 ** 9)},{1_700_000_000 + rng.randrange(10 ** 7)},{name}".encode()
+    suffix = f",{rng.uniform(0, 10000):.2f},{rng.choice(CATEGORIES)}\n".encode()
+    # Padding goes into the name field, which keeps the record valid
+    return prefix + suffix, len(prefix)
+
+def _jsonl_line(rng):
+    name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 12)))
+    prefix = (f'{{"id": {rng.randrange(10 ** 9)}, '
+              f'"timestamp": {1_700_000_000 + rng.randrange(10 ** 7)}, "name": "{name}').encode()
+    suffix = f'", "amount": {rng.uniform(0, 10000):.2f}, "category": "{rng.choice(CATEGORIES)}"}}\n'.encode()
+    # Padding goes into the name string, which keeps the line valid JSON
+    return prefix + suffix, len(prefix)
+
+def _record_bytes(rng, length):
+    """Whole RECORD structs; CHUNK_SIZE is a multiple of RECORD.size"""
+    data = bytearray(length - length % RECORD.size)
+    for offset in range(0, len(data), RECORD.size):
+        RECORD.pack_into(data, offset, rng.randrange(10 ** 9), 1_700_000_000 + rng.randrange(10 ** 7),
+                         rng.uniform(0, 10000), rng.randrange(len(CATEGORIES)))
+    return bytes(data) + bytes(length % RECORD.size)
+
+def _chunk_bytes(spec, size_mb, index, length):
+    """Generate one chunk of a single-file workload"""
+    rng = _chunk_rng(spec, size_mb, index)
+    if spec.kind == 'repeated':
+        return b"A" * length
+    if spec.kind == 'random':
+        return rng.randbytes(length)
+    if spec.kind == 'mixed':
+        block = 64 * 1024
+        parts = []
+        for offset in range(0, length, block):
+            n = min(block, length - offset)
+            choice = rng.random()
+            if choice < spec.params['entropy']:
+                parts.append(rng.randbytes(n))
+            elif choice < (1 + spec.params['entropy']) / 2:
+                parts.append(_lines_to_size(_text_line, rng, n))
+            else:
+                pattern = rng.randbytes(rng.randint(1, 64))
+                parts.append((pattern * (n // len(pattern) + 1))[:n])
+        return b"".join(parts)
+    if spec.kind == 'text':
+        return _lines_to_size(_text_line, rng, length)
+    if spec.kind == 'csv':
+        return _lines_to_size(_csv_line, rng, length, CSV_HEADER if index == 0 else b"")
+    if spec.kind == 'jsonl':
+        return _lines_to_size(_jsonl_line, rng, length)
+    if spec.kind == 'records':
+        return _record_bytes(rng, length)
+    raise ValueError(f"{spec.kind} is not generated in chunks")
+
+def _write_chunk(spec_dict, size_mb, index, path):
+    """Worker: generate chunk index and write it at its offset in path"""
+    spec = WorkloadSpec(spec_dict['kind'], spec_dict['seed'], **spec_dict['params'])
+    offset = index * CHUNK_SIZE
+    data = _chunk_bytes(spec, size_mb, index, min(CHUNK_SIZE, size_mb * MB - offset))
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        os.pwrite(fd, data, offset)
+    finally:
+        os.close(fd)
+
+def check_free_space(path, needed_bytes, reserve_bytes=0):
+    """Raise OSError(ENOSPC) unless path's file system has needed_bytes plus reserve_bytes free"""
+    free = shutil.disk_usage(path).free
+    if free < needed_bytes + reserve_bytes:
+        raise OSError(errno.ENOSPC, f"Need {(needed_bytes + reserve_bytes) / MB:,.0f}MB free in {path}, "
+                                    f"only {free / MB:,.0f}MB available")
+
+def _allocate(path, size):
+    """Create path at full size, with its blocks reserved where the platform allows
+
+    posix_fallocate fails up front if the disk is too small, instead of
+    halfway through a multi-GB write, and lets the file system lay the
+    file out in large extents.
+    """
+    with open(path, 'wb') as f:
+        if hasattr(os, 'posix_fallocate') and size:
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError as e:
+                if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL):
+                    raise
+        f.truncate(size)
+
+def _write_sparse(spec, size_mb, path):
+    """Truncate to full size, then write a data_kb extent at the start of every MB"""
+    rng = _chunk_rng(spec, size_mb, 0)
+    extent = spec.params['data_kb'] * 1024
+    with open(path, 'wb') as f:
+        f.truncate(size_mb * MB)
+        for mb_index in range(size_mb):
+            f.seek(mb_index * MB)
+            f.write(rng.randbytes(min(extent, MB)))
+
+def _write_tree_dir(spec_dict, size_mb, dir_index, root):
+    """Worker: fill one directory of a small-files tree"""
+    spec = WorkloadSpec(spec_dict['kind'], spec_dict['seed'], **spec_dict['params'])
+    file_size = spec.params['file_size_kb'] * 1024
+    per_dir = spec.params['files_per_dir']
+    total_files = size_mb * MB // file_size
+    rng = _chunk_rng(spec, size_mb, dir_index)
+    directory = Path(root) / f"d{dir_index:04d}"
+    directory.mkdir(parents=True, exist_ok=True)
+    for file_index in range(dir_index * per_dir, min((dir_index + 1) * per_dir, total_files)):
+        (directory / f"f{file_index:06d}.bin").write_bytes(rng.randbytes(file_size))
+
+class WorkloadGenerator:
+    """Generates workloads in parallel into a cache keyed by spec
+
+    Each spec gets its own directory, <root>/<kind>-<hash>/, holding
+    test_<N>mb.txt (or tree_<N>mb/ for small_files) per size. Files are
+    built under a temporary name and renamed into place when complete, so
+    an existing name is always a finished, reusable result.
+    """
+
+    def __init__(self, root="data/workloads", max_workers=None):
+        self.root = Path(root)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def directory(self, spec):
+        return self.root / spec.key()
+
+    def path(self, spec, size_mb):
+        name = f"tree_{size_mb}mb" if spec.is_tree else f"test_{size_mb}mb.txt"
+        return self.directory(spec) / name
+
+    def generate(self, spec, sizes_mb):
+        """Make sure every size exists for spec; return the spec's directory
+
+        Raises OSError(ENOSPC) before writing anything if the missing sizes
+        do not fit on the disk.
+        """
+        directory = self.directory(spec)
+        directory.mkdir(parents=True, exist_ok=True)
+        missing = [size_mb for size_mb in sizes_mb if not self.path(spec, size_mb).exists()]
+        if spec.kind != 'sparse':
+            check_free_space(directory, sum(missing) * MB)
+        with open(directory / "spec.json", 'w') as f:
+            json.dump({**spec.to_dict(), 'version': GENERATOR_VERSION}, f, indent=2)
+
+        for size_mb in sizes_mb:
+            final = self.path(spec, size_mb)
+            if final.exists():
+                continue
+            print(f"Generating {spec.kind} workload, {size_mb}MB...")
+            partial = final.with_name(final.name + ".partial")
+            if spec.is_tree:
+                shutil.rmtree(partial, ignore_errors=True)
+                self._generate_tree(spec, size_mb, partial)
+            else:
+                self._generate_file(spec, size_mb, partial)
+            os.replace(partial, final)
+        return directory
+
+    def _generate_file(self, spec, size_mb, path):
+        """Allocate the file, then stream chunks into it front to back
+
+        At most 2 chunks per worker are in flight, so even 64GB files are
+        written roughly sequentially with a bounded number of pending jobs.
+        """
+        if spec.kind == 'sparse':
+            _write_sparse(spec, size_mb, path)
+            return
+        _allocate(path, size_mb * MB)
+        chunks = -(-size_mb * MB // CHUNK_SIZE)
+        window = 2 * self.max_workers
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = deque()
+            for index in range(chunks):
+                pending.append(pool.submit(_write_chunk, spec.to_dict(), size_mb, index, str(path)))
+                if len(pending) >= window:
+                    pending.popleft().result()
+            for future in pending:
+                future.result()
+
+    def _generate_tree(self, spec, size_mb, root):
+        total_files = size_mb * MB // (spec.params['file_size_kb'] * 1024)
+        dirs = -(-total_files // spec.params['files_per_dir'])
+        root.mkdir(parents=True)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(_write_tree_dir, spec.to_dict(), size_mb, index, str(root))
+                       for index in range(dirs)]
+            for future in futures:
+                future.result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate cached benchmark workloads")
+    parser.add_argument("kind", choices=WorkloadSpec.KINDS)
+    parser.add_argument("sizes_mb", type=int, nargs='+')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--root", default="data/workloads",
+                        help="cache directory (default: data/workloads)")
+    args = parser.parse_args()
+
+    directory = WorkloadGenerator(args.root).generate(WorkloadSpec(args.kind, args.seed), args.sizes_mb)
+    print(directory)
+
+if __name__ == "__main__":
+    main()